@@ -27,12 +27,19 @@ import sys
 import DV_Types  # pylint: disable=import-error
 from ctypes import (
     cdll, c_void_p, c_ubyte, c_double, c_uint,
-    c_longlong, c_bool, c_int, c_long, c_char
+    c_longlong, c_bool, c_int, c_long, c_char, c_char_p, c_size_t, sizeof,
+    create_string_buffer, string_at, addressof, byref, POINTER, CFUNCTYPE
 )
 
 if sys.version_info > (3,):
     long = int
 
+# NumPy is optional - only AsArray needs it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # load the *getset.so in this folder
 script_path = os.path.dirname(os.path.realpath(__file__))
 soFileNames = [
@@ -76,6 +83,26 @@ class AsnCoderError(Exception):
     pass
 
 
+# The ctypes equivalents of the C types of the getters and setters
+g_cTypes = {
+    'asn1SccSint': c_longlong,
+    'byte': c_ubyte,
+    'double': c_double,
+    'flag': c_bool,
+    'int': c_int,
+    'long': c_long,
+    'char': c_ubyte  # char
+}
+
+# The getters and setters of _getset.so, resolved once per process:
+# (type, accessor path, "Get"/"Set" + postfix) => ctypes function,
+# with its argtypes and restype already set.
+g_bridgeFunctions = {}
+
+# The cleaned-up field names met in the access paths
+g_cleanNames = {}
+
+
 def CleanNameAsPythonWants(name):
     """ASN.1 ids have minuses... turn non-ID chars to '_'"""
     return re.sub(r'[^a-zA-Z0-9_]', '_', name)
@@ -88,6 +115,93 @@ def myassert(b):
         raise AsnCoderError("Assertion failed...")
 
 
+def ResolveBridgeFunction(key, numberOfIndexes):
+    """Returns the getter/setter of the key (see g_bridgeFunctions), after
+looking it up in _getset.so and configuring it."""
+    nodeTypeName, accessor, operation = key
+    bridgeFuncName = Clean(nodeTypeName) + "_" + accessor + "_" + operation
+    # The setters take a value of the type that their getters return
+    getterName = Clean(nodeTypeName) + "_" + accessor + "_Get" + operation[3:]
+    if getterName not in DV_Types.funcTypeLookup:
+        raise AsnCoderError("Function %s not found in lookup - contact support." % getterName)
+    resType = DV_Types.funcTypeLookup[getterName]
+    if resType.endswith('*'):
+        cTypesResultType = c_void_p
+    else:
+        cTypesResultType = g_cTypes.get(resType, None)
+        if cTypesResultType is None:
+            raise AsnCoderError("Result type of %s not yet supported in the Python mapper - contact support." % resType)
+    # (a private copy of the function, so that the settings of the
+    # shared one - i.e. of getattr(JMP, name) - are not affected)
+    bridgeFunc = JMP[bridgeFuncName]
+    argTypes = [c_void_p] + [c_int] * numberOfIndexes
+    if operation.startswith("Get"):
+        bridgeFunc.restype = cTypesResultType
+    else:
+        argTypes.append(cTypesResultType)
+        bridgeFunc.restype = None
+    bridgeFunc.argtypes = argTypes
+    g_bridgeFunctions[key] = bridgeFunc
+    return bridgeFunc
+
+
+def ResolveBytesFunction(key, numberOfIndexes):
+    """Like ResolveBridgeFunction, for the GetBytes/SetBytes functions of
+OCTET STRINGs and IA5Strings (that copy 'length' bytes from/to a buffer)."""
+    nodeTypeName, accessor, operation = key
+    bridgeFunc = JMP[Clean(nodeTypeName) + "_" + accessor + "_" + operation]
+    bridgeFunc.argtypes = [c_void_p] + [c_int] * numberOfIndexes + [c_char_p, c_long]
+    bridgeFunc.restype = c_int
+    g_bridgeFunctions[key] = bridgeFunc
+    return bridgeFunc
+
+
+# The _GetArray functions of the SEQUENCE OFs of numbers, configured once
+# per process: (type, accessor path) => (ctypes function, element ctype)
+g_arrayFunctions = {}
+
+
+def ResolveArrayFunction(key, numberOfIndexes):
+    """Returns the _GetArray function of the key (see g_arrayFunctions) and
+the ctypes type of the elements (that of their getter)."""
+    nodeTypeName, accessor = key
+    prefix = Clean(nodeTypeName) + "_" + accessor
+    elementType = g_cTypes.get(DV_Types.funcTypeLookup.get(prefix + "_iDx_Get"))
+    if elementType is None:
+        raise AsnCoderError("%s is not a SEQUENCE OF numbers" % prefix)
+    bridgeFunc = JMP[prefix + "_GetArray"]
+    bridgeFunc.argtypes = [c_void_p] + [c_int] * numberOfIndexes + [POINTER(c_size_t), POINTER(c_long)]
+    bridgeFunc.restype = c_void_p
+    g_arrayFunctions[key] = bridgeFunc, elementType
+    return bridgeFunc, elementType
+
+
+# The batched encoders/decoders of _getset.so, configured once per process:
+# (type, "SizeOf"/"RequiredBytesFor"/"EncodeMany"/"DecodeMany") => ctypes function
+g_batchFunctions = {}
+
+# The callbacks of the DecodeMany_... functions: int callback(int index)
+DecodeCallback = CFUNCTYPE(c_int, c_int)
+
+
+def ResolveBatchFunction(typeName, operation):
+    """Returns the (configured) batch function of the type - see
+EncodeMany and DecodeMany in COMMON."""
+    key = (typeName, operation)
+    batchFunc = g_batchFunctions.get(key)
+    if batchFunc is None:
+        batchFunc = JMP[operation + "_" + typeName]
+        batchFunc.argtypes, batchFunc.restype = {
+            "SizeOf": ([], c_size_t),
+            "RequiredBytesFor": ([c_bool], c_long),
+            "EncodeMany": ([c_void_p, c_int, c_void_p, c_long, POINTER(c_long), c_bool, POINTER(c_int)], c_int),
+            "DecodeMany": ([c_char_p, c_long, POINTER(c_long), c_void_p, c_int, c_bool, POINTER(c_int),
+                            DecodeCallback], c_int),
+        }[operation]
+        g_batchFunctions[key] = batchFunc
+    return batchFunc
+
+
 class DataStream(object):
     """ASN1SCC BitStream equivalent"""
     def __init__(self, bufferSize):
@@ -104,42 +218,41 @@ class DataStream(object):
         """Rewinds the currentByte and currentBit to the start"""
         ResetStream(self._bs)
 
-    def GetPyString(self):
-        # print "Reading",
+    def GetBuffer(self, length=None):
+        """A writable memoryview of the buffer of the stream - of the encoded
+data (i.e. of GetStreamCurrentLength bytes), or of the given length.
+It refers to the buffer itself (no copy), so it is only valid until
+the next Encode/Decode in the stream."""
+        if length is None:
+            length = GetStreamCurrentLength(self._bs)
+        myassert(0 <= length <= self._bufferSize)
+        data = (c_ubyte * length).from_address(GetBitstreamBuffer(self._bs))
+        # (the view keeps the stream - and therefore the buffer - alive)
+        data.stream = self
+        view = memoryview(data)
         if sys.version_info > (3,):
-            msg = b""
-            pData = c_void_p(GetBitstreamBuffer(self._bs))
-            for i in range(0, GetStreamCurrentLength(self._bs)):
-                b = GetBufferByte(pData, i)
-                msg += bytes([b])
-                # print b, ",",
-        else:
-            msg = ""
-            pData = c_void_p(GetBitstreamBuffer(self._bs))
-            for i in range(0, GetStreamCurrentLength(self._bs)):
-                b = GetBufferByte(pData, i)
-                msg += chr(b)
-                # print b, ",",
-        # print "EOF"
-        return msg
+            view = view.cast('B')
+        return view
+
+    def ReadInto(self, buffer):
+        """Copies the encoded data into the (writable, bytes-like) buffer,
+and returns their length - so that e.g. a receive buffer can be reused."""
+        data = self.GetBuffer()
+        length = len(data)
+        if len(buffer) < length:
+            raise AsnCoderError("The buffer is too small (%d bytes) for the %d bytes of the stream" % (
+                len(buffer), length))
+        memoryview(buffer)[:length] = data
+        return length
+
+    def GetPyString(self):
+        return self.GetBuffer().tobytes()
 
     def SetFromPyString(self, data):
         strLength = len(data)
         assert self._bufferSize >= strLength
         self._bs.count = strLength
-        pData = c_void_p(GetBitstreamBuffer(self._bs))
-        # print "Writing",
-        if sys.version_info > (3,):
-            for i in range(0, strLength):
-                b = data[i]
-                # print b, ",",
-                SetBufferByte(pData, i, b)
-        else:
-            for i in range(0, strLength):
-                b = ord(data[i])
-                # print b, ",",
-                SetBufferByte(pData, i, b)
-        # print "EOF"
+        self.GetBuffer(strLength)[:] = data
 
 
 class COMMON(object):
@@ -197,29 +310,37 @@ An example for SetLength:
 """
 
     allowed = ["_nodeTypeName", "_ptr", "_pErr", "_Caccessor", "_accessPath",
-               "_params", "_new_ptr"]
+               "_params", "_new_ptr", "_buffer"]
 # , "Get", "GetLength", "Set", "SetLength", "Reset", "Encode", "Decode", "SetFromPyString", "GetPyString", "allowed"]
 
     def __init__(self, nodeTypeName, ptr=None):
         myassert(isinstance(nodeTypeName, str))
-        self._nodeTypeName = nodeTypeName
-        self._new_ptr = ptr is None
-        constructor = getattr(JMP, "CreateInstanceOf_" + Clean(nodeTypeName))
-        constructor.restype = c_void_p
-        self._ptr = ptr or constructor()
-        self._ptr = c_void_p(self._ptr)
-        self._pErr = c_void_p(CreateInstanceOf_int())
-        self._Caccessor = ""
-        self._params = []
-        self._accessPath = ""
+        # (via __dict__, to skip the checks of __setattr__ - DecodeMany
+        # creates an instance per decoded value)
+        d = self.__dict__
+        d['_nodeTypeName'] = nodeTypeName
+        d['_new_ptr'] = ptr is None
+        if not ptr:
+            constructor = getattr(JMP, "CreateInstanceOf_" + Clean(nodeTypeName))
+            constructor.restype = c_void_p
+            ptr = constructor()
+        d['_ptr'] = c_void_p(ptr)
+        d['_pErr'] = c_void_p(CreateInstanceOf_int())
+        d['_Caccessor'] = ""
+        d['_params'] = []
+        d['_accessPath'] = ""
+        # The memory that ptr points into, when it must be kept alive (DecodeMany)
+        d['_buffer'] = None
 
     def Reset(self, state=None):
         if state is None:
-            self._Caccessor = ""
-            self._params = []
-            self._accessPath = ""
+            # (via __dict__, to skip the checks of __setattr__)
+            d = self.__dict__
+            d['_Caccessor'] = ""
+            d['_params'] = []
+            d['_accessPath'] = ""
         else:
-            self._Caccessor, self._params, self._accessPath = state[0][:], copy.deepcopy(state[1]), state[2][:]
+            self._Caccessor, self._params, self._accessPath = state[0][:], copy.deepcopy(state[1]), state[2][:]  # pylint: disable=attribute-defined-outside-init
 
     def GetState(self):
         return self._Caccessor[:], copy.deepcopy(self._params), self._accessPath[:]
@@ -239,8 +360,12 @@ An example for SetLength:
         return "Choose the information you want - whole-structure or sequence dump not supported."
 
     def __getattr__(self, x):
-        self._Caccessor += "_" + Clean(x)
-        self._accessPath += "." + x
+        cleanName = g_cleanNames.get(x)
+        if cleanName is None:
+            cleanName = g_cleanNames[x] = "_" + Clean(x)
+        d = self.__dict__
+        d['_Caccessor'] += cleanName
+        d['_accessPath'] += "." + x
         return self
 
     def __setattr__(self, name, value):
@@ -250,33 +375,18 @@ An example for SetLength:
         object.__setattr__(self, name, value)
 
     def __getitem__(self, idx):
-        self._Caccessor += "_iDx"
-        self._params.append(idx)
-        self._accessPath += "[" + str(idx) + "]"
+        d = self.__dict__
+        d['_Caccessor'] += "_iDx"
+        d['_params'].append(idx)
+        d['_accessPath'] += "[" + str(idx) + "]"
         return self
 
     def Get(self, **args):  # postfix="", reset=True
         try:
-            bridgeFuncName = Clean(self._nodeTypeName) + "_" + self._Caccessor + "_Get" + args.get("postfix", "")
-            if bridgeFuncName not in DV_Types.funcTypeLookup:
-                raise AsnCoderError("Function %s not found in lookup - contact support." % bridgeFuncName)
-            resType = DV_Types.funcTypeLookup[bridgeFuncName]
-            if resType.endswith('*'):
-                cTypesResultType = c_void_p
-            else:
-                cTypesResultType = {
-                    'asn1SccSint': c_longlong,
-                    'byte': c_ubyte,
-                    'double': c_double,
-                    'flag': c_bool,
-                    'int': c_int,
-                    'long': c_long,
-                    'char': c_ubyte # char
-                }.get(resType, None)
-                if cTypesResultType is None:
-                    raise AsnCoderError("Result type of %s not yet supported in the Python mapper - contact support." % resType)
-            bridgeFunc = getattr(JMP, bridgeFuncName)
-            bridgeFunc.restype = cTypesResultType
+            key = (self._nodeTypeName, self._Caccessor, "Get" + args.get("postfix", ""))
+            bridgeFunc = g_bridgeFunctions.get(key)
+            if bridgeFunc is None:
+                bridgeFunc = ResolveBridgeFunction(key, len(self._params))
             retVal = bridgeFunc(self._ptr, *self._params)
         except Exception as e:
             oldAP = self._accessPath
@@ -289,17 +399,11 @@ An example for SetLength:
 
     def Set(self, value, **args):  # postfix="", reset=True
         try:
-            # print Clean(self._nodeTypeName) + "_" + self._Caccessor + "_Set"+postfix
-            bridgeFunc = getattr(JMP, Clean(self._nodeTypeName) + "_" + self._Caccessor + "_Set" + args.get("postfix", ""))
-            if isinstance(value, float):
-                ctypesValue = c_double(value)
-            elif isinstance(value, (int, long)):
-                ctypesValue = c_longlong(value)
-            else:
-                ctypesValue = value
-            self._params.append(ctypesValue)
-            bridgeFunc(self._ptr, *self._params)
-            self._params.pop()
+            key = (self._nodeTypeName, self._Caccessor, "Set" + args.get("postfix", ""))
+            bridgeFunc = g_bridgeFunctions.get(key)
+            if bridgeFunc is None:
+                bridgeFunc = ResolveBridgeFunction(key, len(self._params))
+            bridgeFunc(self._ptr, *(self._params + [value]))
         except Exception as e:
             oldAP = self._accessPath
             if args.get("reset", True):
@@ -354,6 +458,78 @@ grep for the errorcode value inside ASN1SCC generated headers."""
     def DecodeACN(self, bitstream):
         self.Decode(bitstream, True)
 
+    @classmethod
+    def EncodeMany(cls, values, bACN=False):
+        """Encodes the values (instances of this type) back to back, with a
+single call to _getset.so. Returns the encoded data and their offsets:
+the i-th encoding is data[offsets[i]:offsets[i+1]]."""
+        typeName = cls.__name__
+        count = len(values)
+        for value in values:
+            myassert(isinstance(value, cls))
+        pointers = (c_void_p * count)(*[value._ptr.value for value in values])
+        requiredBytes = ResolveBatchFunction(typeName, "RequiredBytesFor")(bACN)
+        buf = create_string_buffer(max(1, count * requiredBytes))
+        offsets = (c_long * (count + 1))()
+        errCode = c_int(0)
+        encodeMany = ResolveBatchFunction(typeName, "EncodeMany")
+        encoded = encodeMany(pointers, count, buf, len(buf), offsets, bACN, byref(errCode))
+        if encoded != count:
+            raise AsnCoderError("Error in EncodeMany_%s (value %d), code: %d" % (typeName, encoded, errCode.value))
+        return string_at(buf, offsets[count]), list(offsets)
+
+    @classmethod
+    def DecodeMany(cls, data, callback=None, bACN=False):
+        """Decodes the back-to-back encodings in data (e.g. the ones returned
+by EncodeMany), with as few calls to _getset.so as possible.
+
+Returns the list of the decoded values - or, with a callback, decodes
+them all into one (reused) instance, calls callback(instance) after each
+one (stopping if it returns False), and returns their number."""
+        typeName = cls.__name__
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        decodeMany = ResolveBatchFunction(typeName, "DecodeMany")
+        offset = c_long(0)
+        errCode = c_int(0)
+        if callback is not None:
+            instance = cls()  # pylint: disable=no-value-for-parameter
+            errors = []
+
+            def OnDecoded(unused_index):
+                try:
+                    return 0 if callback(instance) is False else 1
+                except Exception as e:  # pylint: disable=broad-except
+                    errors.append(e)
+                    return 0
+            count = decodeMany(data, len(data), byref(offset), instance._ptr, 0, bACN, byref(errCode),
+                               DecodeCallback(OnDecoded))
+            if errors:
+                raise errors[0]
+        else:
+            # The values are decoded in arrays of growing size, which they
+            # then point into (and keep alive)
+            size = ResolveBatchFunction(typeName, "SizeOf")()
+            values = []
+            chunk = 16
+            while offset.value < len(data):
+                buf = create_string_buffer(chunk * size)
+                # (DecodeCallback() is a NULL callback)
+                decoded = decodeMany(data, len(data), byref(offset), buf, chunk, bACN, byref(errCode), DecodeCallback())
+                address = addressof(buf)
+                for i in range(decoded):
+                    value = cls(address + i * size)
+                    value._buffer = buf  # pylint: disable=attribute-defined-outside-init
+                    values.append(value)
+                if decoded < chunk:
+                    break
+                chunk = min(2 * chunk, 1024)
+            count = len(values)
+        if errCode.value:
+            raise AsnCoderError("Error in DecodeMany_%s (message %d, at byte %d), code: %d" % (
+                typeName, count, offset.value, errCode.value))
+        return count if callback is not None else values
+
     def IsConstraintValid(self):
         # Allocate temp space to store error code (avoid race condition that _pErr would cause)
         pErr = c_void_p(CreateInstanceOf_int())
@@ -367,47 +543,196 @@ grep for the errorcode value inside ASN1SCC generated headers."""
 
 # OCTET STRING
 
+    def CopyBytes(self, operation, data, reset=True):
+        """Calls the GetBytes/SetBytes function of the current path, which
+copies all the bytes from/to data (a ctypes buffer for GetBytes)."""
+        try:
+            key = (self._nodeTypeName, self._Caccessor, operation)
+            bridgeFunc = g_bridgeFunctions.get(key)
+            if bridgeFunc is None:
+                bridgeFunc = ResolveBytesFunction(key, len(self._params))
+            success = bridgeFunc(self._ptr, *(self._params + [data, len(data)]))
+        except Exception as e:
+            oldAP = self._accessPath
+            self.Reset()
+            raise AsnCoderError("The access path you used (%s) is not valid. (%s)" % (oldAP, str(e)))
+        if not success:
+            oldAP = self._accessPath
+            self.Reset()
+            raise AsnCoderError("The length (%d) is out of the bounds of %s" % (len(data), oldAP))
+        if reset:
+            self.Reset()
+
     def SetFromPyString(self, src):
-        strLength = len(src)
-        self.SetLength(strLength, False)
-        self._Caccessor += "_iDx"
-        accessPath = self._accessPath
+        if sys.version_info > (3,) and not isinstance(src, bytes):
+            # (one byte per character, as in ord)
+            src = src.encode("latin-1")
+        # (the bytes first, since SetBytes checks the bounds)
+        self.CopyBytes("SetBytes", src, False)
+        self.SetLength(len(src))
+
+    def GetPyString(self):
+        strLength = self.GetLength(False)
+        data = create_string_buffer(strLength)
+        self.CopyBytes("GetBytes", data)
         if sys.version_info > (3,):
-            for idx in range(0, strLength):
-                self._params.append(idx)
-                self._accessPath = accessPath + "[" + str(idx) + "]"
-                self.Set(ord(src[idx]), reset=False)
-                self._params.pop()
+            return data.raw[:strLength].decode("utf-8")
         else:
-            for idx in range(0, strLength):
-                self._params.append(idx)
-                self._accessPath = accessPath + "[" + str(idx) + "]"
-                self.Set(ord(src[idx]), reset=False)
-                self._params.pop()
+            return data.raw[:strLength]
+
+# SEQUENCE OF INTEGER/REAL/BOOLEAN/ENUMERATED
+
+    def Elements(self, length):
+        """The elements of the SEQUENCE OF of the current path, as a ctypes
+array of the given length over the C struct (and that keeps this instance
+alive); checks the length against the SIZE, and resets the path."""
+        try:
+            key = (self._nodeTypeName, self._Caccessor)
+            resolved = g_arrayFunctions.get(key)
+            if resolved is None:
+                resolved = ResolveArrayFunction(key, len(self._params))
+            bridgeFunc, elementType = resolved
+            elementSize = c_size_t(0)
+            maxLength = c_long(0)
+            address = bridgeFunc(self._ptr, *(self._params + [byref(elementSize), byref(maxLength)]))
+        except Exception as e:
+            oldAP = self._accessPath
+            self.Reset()
+            raise AsnCoderError("The access path you used (%s) is not valid. (%s)" % (oldAP, str(e)))
+        oldAP = self._accessPath
         self.Reset()
+        if elementSize.value != sizeof(elementType):
+            raise AsnCoderError("The elements of %s are %d bytes in C, but %d in %s" % (
+                oldAP, elementSize.value, sizeof(elementType), elementType.__name__))
+        if not 0 <= length <= maxLength.value:
+            raise AsnCoderError("The length (%d) is out of the bounds of %s" % (length, oldAP))
+        elements = (elementType * length).from_address(address)
+        elements.owner = self
+        return elements
+
+    def CurrentLength(self):
+        """GetLength, keeping the path (but resetting it on errors)."""
+        try:
+            return self.GetLength(False)
+        except AsnCoderError:
+            self.Reset()
+            raise
 
-    def GetPyString(self):
-        if sys.version_info > (3,):
-            retval = b""
-            strLength = self.GetLength(False)
-            self._Caccessor += "_iDx"
-            accessPath = self._accessPath
-            for idx in range(0, strLength):
-                self._params.append(idx)
-                self._accessPath = accessPath + "[" + str(idx) + "]"
-                retval += bytes([self.Get(reset=False)])
-                self._params.pop()
+    def AsArray(self):
+        """A NumPy array that views (without copying) the elements of this
+SEQUENCE OF - of its current length."""
+        if numpy is None:
             self.Reset()
-            return retval.decode("utf-8")
+            raise AsnCoderError("AsArray needs NumPy")
+        return numpy.ctypeslib.as_array(self.Elements(self.CurrentLength()))
+
+    def SetFromArray(self, values):
+        """Sets the length and the elements of this SEQUENCE OF from the
+values (e.g. a NumPy array), with one copy."""
+        length = len(values)
+        state = self.GetState()
+        # (the elements first, since Elements checks the bounds)
+        elements = self.Elements(length)
+        self.Reset(state)
+        if length != self.CurrentLength():
+            self.SetLength(length)
         else:
-            retval = ""
-            strLength = self.GetLength(False)
-            self._Caccessor += "_iDx"
-            accessPath = self._accessPath
-            for idx in range(0, strLength):
-                self._params.append(idx)
-                self._accessPath = accessPath + "[" + str(idx) + "]"
-                retval += chr(self.Get(reset=False))
-                self._params.pop()
             self.Reset()
-            return retval
+        if numpy is not None:
+            numpy.ctypeslib.as_array(elements)[:] = values
+        else:
+            elements[:] = list(values)
+
+
+# The ctypes layout mode (asn2dataModel -toPythonCtypes): the generated
+# classes are ctypes Structures laid out as the C types of ASN1SCC, so
+# their fields are read and written directly, without getters/setters.
+
+# The candidates for the C types whose size depends on the ASN1SCC runtime
+g_nativeCtypes = {
+    'flag': [c_bool, c_int],
+    'asn1SccSint': [c_longlong, c_int],
+}
+
+
+def NativeCtype(cTypeName):
+    """The ctypes type with the size of the given C type (as reported by
+the SizeOf_<cTypeName> function of _getset.so)."""
+    sizeOf = JMP["SizeOf_" + cTypeName]
+    sizeOf.restype = c_size_t
+    size = sizeOf()
+    for ctype in g_nativeCtypes[cTypeName]:
+        if sizeof(ctype) == size:
+            return ctype
+    raise AsnCoderError("No ctypes type has the size of %s (%d bytes)" % (cTypeName, size))
+
+
+class CtypesCodec(object):
+    """The ASN1SCC functions of the top-level types of the ctypes layout
+mode: their instances have the layout of the C types, so they are passed
+to ASN1SCC as they are. New instances are zeroed - see Initialize."""
+
+    def Initialize(self):
+        """Sets the ASN1SCC initial value (e.g. the first enumerant)."""
+        JMP[type(self).__name__ + "_Initialize"](byref(self))
+
+    def Encode(self, bitstream, bACN=False):
+        myassert(isinstance(bitstream, DataStream))
+        bitstream.Reset()
+        funcName = type(self).__name__ + ("_ACN_Encode" if bACN else "_Encode")
+        errCode = c_int(0)
+        if not JMP[funcName](byref(self), bitstream._bs, byref(errCode), True):
+            raise AsnCoderError("Error in %s, code: %d" % (funcName, errCode.value))
+
+    def Decode(self, bitstream, bACN=False):
+        myassert(isinstance(bitstream, DataStream))
+        funcName = type(self).__name__ + ("_ACN_Decode" if bACN else "_Decode")
+        errCode = c_int(0)
+        if not JMP[funcName](byref(self), bitstream._bs, byref(errCode)):
+            raise AsnCoderError("Error in %s, code: %d" % (funcName, errCode.value))
+
+    def EncodeACN(self, bitstream):
+        self.Encode(bitstream, True)
+
+    def DecodeACN(self, bitstream):
+        self.Decode(bitstream, True)
+
+    def IsConstraintValid(self):
+        errCode = c_int(0)
+        isValid = JMP[type(self).__name__ + "_IsConstraintValid"](byref(self), byref(errCode))
+        return isValid, errCode.value
+
+
+def FieldLayout(klass, path):
+    """The offset and the size of the field of the ctypes class at the path
+(of field names - and 0, for the first element of arrays)."""
+    offset = 0
+    for field in path:
+        if isinstance(field, int):
+            klass = klass._type_
+            offset += field * sizeof(klass)
+        else:
+            offset += getattr(klass, field).offset
+            klass = dict(x[:2] for x in klass._fields_)[field]
+    return offset, sizeof(klass)
+
+
+def CheckLayouts(layouts):
+    """Compares the sizes and the offsets of the ctypes classes with those
+of the C types, as reported by the LayoutOf_<type> functions of
+_getset.so - layouts is typename => (class, paths of the fields)."""
+    errors = []
+    for typeName, (klass, paths) in sorted(layouts.items()):
+        layoutOf = JMP["LayoutOf_" + typeName]
+        layoutOf.argtypes = [c_int]
+        layoutOf.restype = c_long
+        if layoutOf(0) != sizeof(klass):
+            errors.append("sizeof(%s): %d in C, %d in ctypes" % (typeName, layoutOf(0), sizeof(klass)))
+        for i, path in enumerate(paths):
+            cLayout = layoutOf(2 * i + 1), layoutOf(2 * i + 2)
+            layout = FieldLayout(klass, path)
+            if cLayout != layout:
+                errors.append("%s.%s: offset %d and size %d in C, %d and %d in ctypes" % (
+                    (typeName, ".".join(str(x) for x in path)) + cLayout + layout))
+    if errors:
+        raise AsnCoderError("The ctypes classes are not laid out as the C types:\n    " + "\n    ".join(errors))
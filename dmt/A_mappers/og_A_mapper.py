@@ -23,6 +23,7 @@
 
 # import re
 
+from ..commonPy import outputFiles
 from ..commonPy import asnParser
 from ..commonPy.cleanupNodes import SetOfBadTypenames
 from ..commonPy.asnAST import AsnBasicNode, AsnSequenceOrSet, AsnSequenceOrSetOf, AsnEnumerated, AsnChoice
@@ -91,7 +92,7 @@ def OnShutdown(unused_badTypes: SetOfBadTypenames) -> None:
     # text = open(g_asnFile, 'r').read()
     # text = re.sub(r'^.*BEGIN', 'Datamodel DEFINITIONS ::= BEGIN', text)
     # text = re.sub(r'--.*', '', text)
-    outputFile = open(g_outputDir + "DataView.pr", 'w')
+    outputFile = outputFiles.Open(g_outputDir + "DataView.pr", 'w')
     outputFile.write('Datamodel DEFINITIONS ::= BEGIN\n\n')
     asnParser.PrintGrammarFromAST(outputFile)
     outputFile.write('END\n')
@@ -8,13 +8,14 @@
 import re
 import os
 
-from typing import Union, List  # NOQA pylint: disable=unused-import
+from typing import Union, List, Optional, Dict, Tuple  # NOQA pylint: disable=unused-import
 
+from ..commonPy import outputFiles
 from ..commonPy import asnParser
 from ..commonPy.utility import panic, inform
 from ..commonPy.asnAST import (
     AsnBool, AsnInt, AsnReal, AsnString, isSequenceVariable, AsnEnumerated,
-    AsnSequence, AsnSet, AsnChoice, AsnMetaMember, AsnSequenceOf, AsnSetOf,
+    AsnSequence, AsnSet, AsnChoice, AsnMetaMember, AsnMetaType, AsnSequenceOf, AsnSetOf,
     AsnBasicNode, AsnNode, AsnSequenceOrSet, AsnSequenceOrSetOf,
     AsnAsciiString)
 from ..commonPy.asnParser import AST_Lookup, AST_Leaftypes
@@ -29,6 +30,11 @@ g_outputGetSetC = None
 
 g_bHasStartupRunOnce = False
 
+# The mode of the mapper: Python classes that access the C types via the
+# getters and setters of _getset.so (-toPython), or ctypes classes laid out
+# as the C types, whose fields are accessed directly (-toPythonCtypes)
+g_bCtypesLayout = False
+
 
 def Version() -> None:
     print("Code generator: " +
@@ -39,20 +45,25 @@ def CleanNameAsPythonWants(name: str) -> str:
     return re.sub(r'[^a-zA-Z0-9_]', '_', name)
 
 
-def OnStartup(unused_modelingLanguage: str, asnFile: str, outputDir: str, badTypes: SetOfBadTypenames) -> None:
-    os.system("cp -u \"" + asnFile + "\" \"" + outputDir + "\"")
+def OnStartup(modelingLanguage: str, asnFile: str, outputDir: str, badTypes: SetOfBadTypenames) -> None:
+    outputFiles.Copy(asnFile, outputDir)
     this_path = os.path.dirname(__file__)
     stubs = this_path + os.sep + 'Stubs.py'
-    os.system('cp "{}" "{}"'.format(stubs, outputDir))
+    outputFiles.Copy(stubs, outputDir)
     enum_learner = this_path + os.sep + 'learn_CHOICE_enums.py'
-    os.system('cp "{}" "{}"'.format(enum_learner, outputDir))
-    global g_bHasStartupRunOnce
+    outputFiles.Copy(enum_learner, outputDir)
+    global g_bHasStartupRunOnce, g_bCtypesLayout
+    bCtypesLayout = modelingLanguage.lower() == 'pythonctypes'
     if g_bHasStartupRunOnce:
         # Don't rerun, it has already done all the work
-        # for all the ASN.1 files used
+        # for all the ASN.1 files used - in one of the two modes, since
+        # both write the same files
+        if bCtypesLayout != g_bCtypesLayout:
+            panic("Python_A_mapper: the -toPython and -toPythonCtypes modes can't be used together")  # pragma: no cover
         return  # pragma: no cover
     else:
         g_bHasStartupRunOnce = True
+    g_bCtypesLayout = bCtypesLayout
     if not asnFile.endswith(".asn"):
         panic("The ASN.1 grammar file (%s) doesn't end in .asn" %
               asnFile)  # pragma: no cover
@@ -62,14 +73,23 @@ def OnStartup(unused_modelingLanguage: str, asnFile: str, outputDir: str, badTyp
     base = re.sub(r'[^a-zA-Z0-9_-]', '_', origGrammarBase)
     inform("Python_A_mapper: Creating file '%s'...", outputFilename)
     global g_outputFile
-    g_outputFile = open(outputDir + outputFilename, 'w')
-    g_outputFile.write("from functools import partial\n\n")
-    g_outputFile.write("import DV\n\n")
-    g_outputFile.write("from Stubs import (\n")
-    g_outputFile.write(
-        "    myassert, Clean, DataStream, COMMON)\n\n")
+    g_outputFile = outputFiles.Open(outputDir + outputFilename, 'w')
+    if g_bCtypesLayout:
+        g_outputFile.write("from ctypes import (\n")
+        g_outputFile.write("    Structure, Union, Array, c_double, c_int, c_uint, c_ubyte, c_char)\n\n")
+        g_outputFile.write("import DV\n\n")
+        g_outputFile.write("from Stubs import (\n")
+        g_outputFile.write("    DataStream, CtypesCodec, CheckLayouts, NativeCtype)\n\n")
+        g_outputFile.write("c_flag = NativeCtype('flag')\n")
+        g_outputFile.write("c_asn1SccSint = NativeCtype('asn1SccSint')\n\n\n")
+    else:
+        g_outputFile.write("from functools import partial\n\n")
+        g_outputFile.write("import DV\n\n")
+        g_outputFile.write("from Stubs import (\n")
+        g_outputFile.write(
+            "    myassert, Clean, DataStream, COMMON)\n\n")
     global g_outputGetSetH
-    g_outputGetSetH = open(outputDir + base + "_getset.h", "w")
+    g_outputGetSetH = outputFiles.Open(outputDir + base + "_getset.h", "w")
     g_outputGetSetH.write('#ifndef __GETSET_H__\n#define __GETSET_H__\n\n')
     g_outputGetSetH.write('#include "%s.h"\n\n' % origGrammarBase)
     g_outputGetSetH.write('size_t GetStreamCurrentLength(BitStream *pBitStrm);\n')
@@ -80,11 +100,13 @@ def OnStartup(unused_modelingLanguage: str, asnFile: str, outputDir: str, badTyp
     g_outputGetSetH.write('BitStream *CreateStream(size_t bufferSize);\n')
     g_outputGetSetH.write('void DestroyStream(BitStream *pBitStrm);\n\n')
     global g_outputGetSetC
-    g_outputGetSetC = open(outputDir + "%s_getset.c" % base, "w")
+    g_outputGetSetC = outputFiles.Open(outputDir + "%s_getset.c" % base, "w")
     g_outputGetSetC.write('#include <stdio.h>\n')
     g_outputGetSetC.write('#include <stdlib.h>\n')
     g_outputGetSetC.write('#include <assert.h>\n')
     g_outputGetSetC.write('#include <string.h>\n')
+    if g_bCtypesLayout:
+        g_outputGetSetC.write('#include <stddef.h>\n')
     g_outputGetSetC.write('#include "%s_getset.h"\n\n' % base)
     g_outputGetSetC.write('size_t GetStreamCurrentLength(BitStream *pBitStrm) {\n')
     g_outputGetSetC.write('    return pBitStrm->currentByte + ((pBitStrm->currentBit+7)/8);\n')
@@ -122,7 +144,7 @@ def OnStartup(unused_modelingLanguage: str, asnFile: str, outputDir: str, badTyp
     g_outputGetSetC.write('    free(pBitStrm->buf);\n')
     g_outputGetSetC.write('    free(pBitStrm);\n')
     g_outputGetSetC.write('}\n\n')
-    makefile = open(outputDir + "Makefile.python", 'w')
+    makefile = outputFiles.Open(outputDir + "Makefile.python", 'w')
 
     # Note that this Makefile will use a custom ASN1SCC invocation
     # where "-equal" is passed - the _Equal functions will be generated
@@ -140,11 +162,11 @@ BASEGRAMMAR := %(base)s
 BDIR:= .
 OBJ     := $(BDIR)/$(GRAMMAR).o $(BDIR)/asn1crt.o $(BDIR)/asn1crt_encoding.o $(BDIR)/asn1crt_encoding_uper.o $(BDIR)/asn1crt_encoding_acn.o $(BDIR)/$(BASEGRAMMAR)_getset.o
 
-all:    $(BDIR)/$(BASEGRAMMAR)_getset.so $(BDIR)/DV.py
+all:    $(BDIR)/$(BASEGRAMMAR)_getset.so $(BDIR)/DV.py%(verifyLayout)s
 
 $(BDIR)/$(GRAMMAR)_getset.c:       $(GRAMMAR).asn
 %(tab)smkdir -p $(BDIR)
-%(tab)s$(ASN2DATAMODEL) -toPython -o $(BDIR) $<
+%(tab)s$(ASN2DATAMODEL) -%(option)s -o $(BDIR) $<
 
 # Create the ACN file if it is missing
 $(BDIR)/$(GRAMMAR).acn:
@@ -182,9 +204,20 @@ clean:
 %(tab)srm -f $(BDIR)/DV.py $(BDIR)/*.pyc $(BDIR)/$(BASEGRAMMAR)_getset.? $(BDIR)/$(BASEGRAMMAR)_getset.so
 %(tab)srm -f $(BDIR)/$(GRAMMAR)_asn.py
 '''
-    makefile.write(makefile_text % {'tab': '\t', 'base': base, 'origGrammarBase': origGrammarBase, 'mono': mono_exe})
+    # In the ctypes layout mode, the build checks that the ctypes classes
+    # are laid out as the C types (see VerifyLayout)
+    verifyLayout = ''
+    if g_bCtypesLayout:
+        pythonModule = outputFilename[:-3]
+        verifyLayout = '\n\tcd $(BDIR) && python -c "import %s; %s.VerifyLayout()"' % (pythonModule, pythonModule)
+    makefile.write(makefile_text % {
+        'tab': '\t', 'base': base, 'origGrammarBase': origGrammarBase, 'mono': mono_exe,
+        'option': 'toPythonCtypes' if g_bCtypesLayout else 'toPython', 'verifyLayout': verifyLayout})
     makefile.close()
-    CreateDeclarationsForAllTypes(asnParser.g_names, asnParser.g_leafTypeDict, badTypes)
+    if g_bCtypesLayout:
+        CreateCtypesDeclarationsForAllTypes(asnParser.g_names)
+    else:
+        CreateDeclarationsForAllTypes(asnParser.g_names, asnParser.g_leafTypeDict, badTypes)
     g_outputGetSetH.write('\n/* Helper functions for NATIVE encodings */\n\n')
     g_outputGetSetC.write('\n/* Helper functions for NATIVE encodings */\n\n')
 
@@ -214,10 +247,79 @@ clean:
         g_outputGetSetC.write("void DestroyInstanceOf_%s(byte *pData) {\n" % typ)
         g_outputGetSetC.write('    free(pData);\n')
         g_outputGetSetC.write('}\n\n')
+
+    def WorkOnTypeBatches(nodeTypeName: str) -> None:
+        # The batched encoders/decoders (see EncodeMany/DecodeMany in Stubs.py):
+        # each message starts at a byte boundary, right after the previous one.
+        typ = CleanNameAsPythonWants(nodeTypeName)
+        g_outputGetSetH.write("size_t SizeOf_%s(void);\n" % typ)
+        g_outputGetSetH.write("long RequiredBytesFor_%s(flag bACN);\n" % typ)
+        g_outputGetSetH.write("int EncodeMany_%s(%s **values, int count, byte *buffer, long bufferSize, long *offsets, flag bACN, int *pErrCode);\n" % (typ, typ))
+        g_outputGetSetH.write("int DecodeMany_%s(const byte *buffer, long length, long *pOffset, %s *values, int count, flag bACN, int *pErrCode, int (*callback)(int));\n\n" % (typ, typ))
+        g_outputGetSetC.write("size_t SizeOf_%s(void)\n" % typ)
+        g_outputGetSetC.write('{\n')
+        g_outputGetSetC.write('    return sizeof(%s);\n' % typ)
+        g_outputGetSetC.write('}\n\n')
+        g_outputGetSetC.write("long RequiredBytesFor_%s(flag bACN)\n" % typ)
+        g_outputGetSetC.write('{\n')
+        g_outputGetSetC.write('    return bACN ? %s_REQUIRED_BYTES_FOR_ACN_ENCODING : %s_REQUIRED_BYTES_FOR_ENCODING;\n' % (typ, typ))
+        g_outputGetSetC.write('}\n\n')
+        g_outputGetSetC.write("/* Encodes the values back to back in the buffer; offsets[i] is where the i-th\n")
+        g_outputGetSetC.write("   encoding starts, offsets[count] where the last one ends. Returns the number\n")
+        g_outputGetSetC.write("   of values encoded (less than count on errors, with *pErrCode set). */\n")
+        g_outputGetSetC.write("int EncodeMany_%s(%s **values, int count, byte *buffer, long bufferSize, long *offsets, flag bACN, int *pErrCode)\n" % (typ, typ))
+        g_outputGetSetC.write('{\n')
+        g_outputGetSetC.write('    BitStream bitStrm;\n')
+        g_outputGetSetC.write('    long offset = 0;\n')
+        g_outputGetSetC.write('    int i;\n')
+        g_outputGetSetC.write('    *pErrCode = 0;\n')
+        g_outputGetSetC.write('    for (i = 0; i < count; i++) {\n')
+        g_outputGetSetC.write('        offsets[i] = offset;\n')
+        g_outputGetSetC.write('        if (bufferSize - offset < RequiredBytesFor_%s(bACN))\n' % typ)
+        g_outputGetSetC.write('            return i;\n')
+        g_outputGetSetC.write('        memset(&bitStrm, 0x0, sizeof(BitStream));\n')
+        g_outputGetSetC.write('        bitStrm.buf = buffer + offset;\n')
+        g_outputGetSetC.write('        bitStrm.count = bufferSize - offset;\n')
+        g_outputGetSetC.write('        if (!(bACN\n')
+        g_outputGetSetC.write('              ? %s_ACN_Encode((void*)values[i], &bitStrm, pErrCode, TRUE)\n' % typ)
+        g_outputGetSetC.write('              : %s_Encode((void*)values[i], &bitStrm, pErrCode, TRUE)))\n' % typ)
+        g_outputGetSetC.write('            return i;\n')
+        g_outputGetSetC.write('        offset += GetStreamCurrentLength(&bitStrm);\n')
+        g_outputGetSetC.write('    }\n')
+        g_outputGetSetC.write('    offsets[count] = offset;\n')
+        g_outputGetSetC.write('    return count;\n')
+        g_outputGetSetC.write('}\n\n')
+        g_outputGetSetC.write("/* Decodes the back-to-back messages of the buffer, from *pOffset on (which is\n")
+        g_outputGetSetC.write("   then advanced): up to count of them, into values[0..count-1] - or, with a\n")
+        g_outputGetSetC.write("   callback, all of them into values[0], calling the callback after each one\n")
+        g_outputGetSetC.write("   (and stopping when it returns 0). Returns the number of messages decoded;\n")
+        g_outputGetSetC.write("   *pErrCode is set if a decoding failed. */\n")
+        g_outputGetSetC.write("int DecodeMany_%s(const byte *buffer, long length, long *pOffset, %s *values, int count, flag bACN, int *pErrCode, int (*callback)(int))\n" % (typ, typ))
+        g_outputGetSetC.write('{\n')
+        g_outputGetSetC.write('    BitStream bitStrm;\n')
+        g_outputGetSetC.write('    int i = 0;\n')
+        g_outputGetSetC.write('    *pErrCode = 0;\n')
+        g_outputGetSetC.write('    while (*pOffset < length && (callback || i < count)) {\n')
+        g_outputGetSetC.write('        %s *pVal = callback ? values : values + i;\n' % typ)
+        g_outputGetSetC.write('        memset(&bitStrm, 0x0, sizeof(BitStream));\n')
+        g_outputGetSetC.write('        bitStrm.buf = (byte*)buffer + *pOffset;\n')
+        g_outputGetSetC.write('        bitStrm.count = length - *pOffset;\n')
+        g_outputGetSetC.write('        if (!(bACN\n')
+        g_outputGetSetC.write('              ? %s_ACN_Decode((void*)pVal, &bitStrm, pErrCode)\n' % typ)
+        g_outputGetSetC.write('              : %s_Decode((void*)pVal, &bitStrm, pErrCode)))\n' % typ)
+        g_outputGetSetC.write('            return i;\n')
+        g_outputGetSetC.write('        *pOffset += GetStreamCurrentLength(&bitStrm);\n')
+        g_outputGetSetC.write('        i++;\n')
+        g_outputGetSetC.write('        if (callback && !callback(i - 1))\n')
+        g_outputGetSetC.write('            break;\n')
+        g_outputGetSetC.write('    }\n')
+        g_outputGetSetC.write('    return i;\n')
+        g_outputGetSetC.write('}\n\n')
     for nodeTypename, node in asnParser.g_names.items():
         if node._isArtificial:
             continue
         WorkOnType(nodeTypename)
+        WorkOnTypeBatches(nodeTypename)
     WorkOnType("int")
     g_outputGetSetH.write('\n#endif\n')
     g_outputGetSetH.close()
@@ -229,7 +331,7 @@ clean:
             retType, funcName = line.split()[0:2]
             funcName = funcName.split('(')[0]
             retTypes[funcName] = retType
-    g_outputGetSetC = open(outputDir + "DV_Types.py", 'w')
+    g_outputGetSetC = outputFiles.Open(outputDir + "DV_Types.py", 'w')
     g_outputGetSetC.write('funcTypeLookup = ' + repr(retTypes))
     g_outputGetSetC.close()
 
@@ -381,6 +483,54 @@ def CommonBaseImplIA5String(comment: str,
     g_outputGetSetC.write("}\n")
 
 
+def CommonBaseImplBytes(comment: str,
+                        path: str,
+                        params: Params,
+                        accessPathInC: str,
+                        maxLength: int) -> None:
+    # Bulk access to the bytes of OCTET STRINGs and IA5Strings: one call
+    # (and one memcpy) per string, instead of one _iDx call per byte.
+    # They return FALSE (and copy nothing) if the length is out of bounds.
+    for postfix, decl, copy in [
+            ("GetBytes", "byte *dest", "memcpy(dest, (*root)" + accessPathInC + ", length);"),
+            ("SetBytes", "const byte *src", "memcpy((*root)" + accessPathInC + ", src, length);")]:
+        g_outputGetSetH.write("\n/* %s */\nflag %s_%s(%s, %s, long length);\n" % (comment, path, postfix, params.GetDecl(), decl))
+        g_outputGetSetC.write("\n/* %s */\nflag %s_%s(%s, %s, long length)\n" % (comment, path, postfix, params.GetDecl(), decl))
+        g_outputGetSetC.write("{\n")
+        g_outputGetSetC.write("    if (length < 0 || length > %d)\n" % maxLength)
+        g_outputGetSetC.write("        return FALSE;\n")
+        g_outputGetSetC.write("    " + copy + "\n")
+        g_outputGetSetC.write("    return TRUE;\n")
+        g_outputGetSetC.write("}\n")
+
+
+def NumericElementType(node: Union[str, AsnNode], names: AST_Lookup) -> Optional[str]:
+    '''The C type of the elements of a SEQUENCE OF, if they are fixed-width
+    numbers (INTEGERs, REALs, BOOLEANs or ENUMERATEDs) - else None.'''
+    while isinstance(node, (str, AsnMetaMember, AsnMetaType)):
+        node = names[node if isinstance(node, str) else node._containedType]
+    for klass, ctype in [(AsnBool, "flag"), (AsnInt, "asn1SccSint"), (AsnReal, "double"), (AsnEnumerated, "int")]:
+        if isinstance(node, klass):
+            return ctype
+    return None
+
+
+def CommonBaseImplArray(comment: str,
+                        path: str,
+                        params: Params,
+                        accessPathInC: str) -> None:
+    # The address of the elements of a SEQUENCE OF of numbers (for the
+    # AsArray/SetFromArray of Stubs.py), with their size and maximum number
+    decl = "%s, size_t *pElementSize, long *pMaxLength" % params.GetDecl()
+    g_outputGetSetH.write("\n/* %s */\nbyte *%s_GetArray(%s);\n" % (comment, path, decl))
+    g_outputGetSetC.write("\n/* %s */\nbyte *%s_GetArray(%s)\n" % (comment, path, decl))
+    g_outputGetSetC.write("{\n")
+    g_outputGetSetC.write("    *pElementSize = sizeof((*root)" + accessPathInC + ".arr[0]);\n")
+    g_outputGetSetC.write("    *pMaxLength = sizeof((*root)" + accessPathInC + ".arr) / *pElementSize;\n")
+    g_outputGetSetC.write("    return (byte*)(*root)" + accessPathInC + ".arr;\n")
+    g_outputGetSetC.write("}\n")
+
+
 def CreateGettersAndSetters(
         path: str,
         params: Params,
@@ -406,6 +556,7 @@ def CreateGettersAndSetters(
         params.AddParam('int', "iDx", leafTypeDict)
         CommonBaseImpl("IA5String_bytes", "char", path + "_iDx", params, accessPathInC + ("[" + params._vars[-1] + "]"), "")
         params.Pop()
+        CommonBaseImplBytes("IA5String_bytes", path, params, accessPathInC, node._range[-1])
     elif isinstance(node, AsnString):
         if not node._range:
             panic("Python_A_mapper: string (in %s) must have a SIZE constraint!\n" % node.Location())  # pragma: no cover
@@ -416,6 +567,7 @@ def CreateGettersAndSetters(
         params.AddParam('int', "iDx", leafTypeDict)
         CommonBaseImpl("OCTETSTRING_bytes", "byte", path + "_iDx", params, accessPathInC + (".arr[" + params._vars[-1] + "]"), "")
         params.Pop()
+        CommonBaseImplBytes("OCTETSTRING_bytes", path, params, accessPathInC + ".arr", node._range[-1])
     elif isinstance(node, AsnEnumerated):
         CommonBaseImpl("ENUMERATED", "int", path, params, accessPathInC)
     elif isinstance(node, (AsnSequence, AsnSet, AsnChoice)):
@@ -449,6 +601,8 @@ def CreateGettersAndSetters(
             CommonBaseImpl("SEQUENCEOF/SETOF", "long", path, params, accessPathInC + ".nCount", "Length")
         else:
             CommonBaseImplSequenceFixed("SEQUENCEOF/SETOF", "long", path, params, accessPathInC + ".nCount", node, "Length")
+        if NumericElementType(containedNode, names) is not None:
+            CommonBaseImplArray("SEQUENCEOF/SETOF elements", path, params, accessPathInC)
         params.AddParam('int', "iDx", leafTypeDict)
         CreateGettersAndSetters(path + "_iDx", params, accessPathInC + (".arr[" + params._vars[-1] + "]"), node._containedType, names, leafTypeDict)
         params.Pop()
@@ -600,4 +754,232 @@ def CreateDeclarationsForAllTypes(names: AST_Lookup, leafTypeDict: AST_Leaftypes
         if not names[nodeTypename]._isArtificial:  # and nodeTypename not in badTypes:
             CreateDeclarationForType(nodeTypename, names, leafTypeDict)
 
+
+# The ctypes layout mode (-toPythonCtypes)
+
+# The ctypes types of the numbers (c_flag and c_asn1SccSint are defined by
+# the generated module, since their size depends on the ASN1SCC runtime)
+g_ctypesOfNumbers = [
+    (AsnBool, 'c_flag'), (AsnInt, 'c_asn1SccSint'), (AsnReal, 'c_double'), (AsnEnumerated, 'c_int')]
+
+
+def CtypeOfNumber(node: Union[str, AsnNode]) -> Optional[str]:
+    for klass, ctype in g_ctypesOfNumbers:
+        if isinstance(node, klass):
+            return ctype
+    return None
+
+
+class CtypesClasses:
+    '''The ctypes classes that mirror the C types of ASN1SCC - written out
+    in dependency order (each class after the ones its fields use).'''
+
+    def __init__(self, names: AST_Lookup) -> None:
+        self._names = names
+        self._lines = []  # type: List[str]
+        # type name => class name
+        self._classes = {}  # type: Dict[str, str]
+        self._usedClassNames = set(CleanNameAsPythonWants(x) for x in names)
+
+    def Lines(self) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return self._lines
+
+    def UniqueClassName(self, name: str) -> str:
+        while name in self._usedClassNames:
+            name += "_"
+        self._usedClassNames.add(name)
+        return name
+
+    def FieldType(self, node: Union[str, AsnNode], inlineName: str) -> str:
+        '''The ctypes type of a field (or element) of the given type: plain
+        ctypes types for the numbers and the IA5Strings (so that reading the
+        field returns a Python value), and classes for the rest. Inline
+        OCTET STRINGs get a class of their own, named after inlineName.'''
+        if isinstance(node, (str, AsnMetaMember, AsnMetaType)):
+            typename = node if isinstance(node, str) else node._containedType
+            target = self._names[typename]
+            if CtypeOfNumber(target) is not None or isinstance(target, AsnAsciiString):
+                return self.FieldType(target, inlineName)
+            return self.Define(typename)
+        ctype = CtypeOfNumber(node)
+        if ctype is not None:
+            return ctype
+        if isinstance(node, AsnAsciiString):
+            if not node._range:
+                panic("Python_A_mapper: IA5String (in %s) must have a SIZE constraint!\n" % node.Location())  # pragma: no cover
+            # (with the NULL terminator)
+            return "c_char * %d" % (node._range[-1] + 1)
+        className = self.UniqueClassName(inlineName)
+        self.DefineClass(className, node, "Structure")
+        return className
+
+    def Define(self, nodeTypename: str) -> str:
+        '''Writes the class of the type (if not already written), and
+        returns its name.'''
+        if nodeTypename in self._classes:
+            return self._classes[nodeTypename]
+        className = CleanNameAsPythonWants(nodeTypename)
+        self._classes[nodeTypename] = className
+        node = self._names[nodeTypename]
+        # Only the types of the grammar have ASN1SCC encoders and decoders
+        codec = "" if node._isArtificial else ", CtypesCodec"
+        ctype = CtypeOfNumber(node)
+        if ctype is not None:
+            self._lines.append("class %s(%s%s):" % (className, ctype, codec))
+            if isinstance(node, AsnEnumerated):
+                self._lines.append("    # Allowed enumerants:")
+                for member in node._members:
+                    if member[1] is None:
+                        panic("Python_A_mapper: must have values for enumerants (%s)" % node.Location())  # pragma: no cover
+                    self._lines.append("    %s = %s" % (CleanNameAsPythonWants(member[0]), member[1]))
+            else:
+                self._lines.append("    pass")
+            self._lines.extend(["", ""])
+        elif isinstance(node, AsnAsciiString):
+            if not node._range:
+                panic("Python_A_mapper: IA5String (in %s) must have a SIZE constraint!\n" % node.Location())  # pragma: no cover
+            self._lines.append("class %s(Array%s):" % (className, codec))
+            self._lines.append("    _type_ = c_char")
+            self._lines.append("    _length_ = %d" % (node._range[-1] + 1))
+            self._lines.extend(["", ""])
+        else:
+            self.DefineClass(className, node, "Structure" + codec)
+        return className
+
+    def DefineClass(self, className: str, node: AsnNode, bases: str) -> None:
+        fields = []  # type: List[str]
+        if isinstance(node, (AsnString, AsnSequenceOf, AsnSetOf)):
+            if not node._range:
+                panic("Python_A_mapper: string (in %s) must have a SIZE constraint!\n" % node.Location())  # pragma: no cover
+            if isSequenceVariable(node):
+                fields.append('("nCount", c_int)')
+            if isinstance(node, AsnString):
+                elementType = "c_ubyte"
+            else:
+                elementType = self.FieldType(node._containedType, className + "_elm")
+            fields.append('("arr", %s * %d)' % (elementType, node._range[-1]))
+        elif isinstance(node, AsnChoice):
+            unionName = self.UniqueClassName(className + "_unchecked_union")
+            members = [
+                '("%s", %s)' % (CleanNameAsPythonWants(child[0]),
+                                self.FieldType(child[1], className + "_" + CleanNameAsPythonWants(child[0])))
+                for child in node._members]
+            self.WriteClass(unionName, "Union", members)
+            fields.extend(['("kind", c_int)', '("u", %s)' % unionName])
+        elif isinstance(node, (AsnSequence, AsnSet)):
+            optionals = []  # type: List[str]
+            for child in node._members:
+                childVarname = CleanNameAsPythonWants(child[0])
+                fields.append('("%s", %s)' % (childVarname, self.FieldType(child[1], className + "_" + childVarname)))
+                if child[3]:
+                    optionals.append('("%s", c_uint, 1)' % childVarname)
+            if optionals:
+                existName = self.UniqueClassName(className + "_exist")
+                self.WriteClass(existName, "Structure", optionals)
+                fields.append('("exist", %s)' % existName)
+        else:  # pragma: no cover
+            panic("Unexpected ASN.1 type... Send this grammar to ESA")  # pragma: no cover
+        self.WriteClass(className, bases, fields)
+
+    def WriteClass(self, className: str, bases: str, fields: List[str]) -> None:  # pylint: disable=invalid-sequence-index
+        self._lines.append("class %s(%s):" % (className, bases))
+        self._lines.append("    _fields_ = [")
+        self._lines.extend("        " + x + "," for x in fields)
+        self._lines.append("    ]")
+        self._lines.extend(["", ""])
+
+
+def CollectLayout(
+        node: Union[str, AsnNode],
+        accessPathInC: str,
+        path: List[Union[str, int]],
+        names: AST_Lookup,
+        layout: List[Tuple[str, List[Union[str, int]]]]) -> None:  # pylint: disable=invalid-sequence-index
+    '''The fields of the type (their C designators, for offsetof, and their
+    paths, for Stubs.FieldLayout) - down to the types of the grammar, that
+    have layout checks of their own.'''
+    if isinstance(node, (str, AsnMetaMember, AsnMetaType)):
+        target = names[node if isinstance(node, str) else node._containedType]
+        if not target._isArtificial:
+            return
+        node = target
+
+    def AddField(field: Union[str, int], designator: str) -> List[Union[str, int]]:  # pylint: disable=invalid-sequence-index
+        fieldPath = path + [field]
+        layout.append((accessPathInC + designator, fieldPath))
+        return fieldPath
+
+    if isinstance(node, (AsnString, AsnSequenceOf, AsnSetOf)) and not isinstance(node, AsnAsciiString):
+        if isSequenceVariable(node):
+            AddField("nCount", ".nCount")
+        arrPath = AddField("arr", ".arr")
+        if isinstance(node, (AsnSequenceOf, AsnSetOf)):
+            CollectLayout(node._containedType, accessPathInC + ".arr[0]", arrPath + [0], names, layout)
+    elif isinstance(node, AsnChoice):
+        AddField("kind", ".kind")
+        unionPath = AddField("u", ".u")
+        for child in node._members:
+            childVarname = CleanNameAsPythonWants(child[0])
+            layout.append((accessPathInC + ".u." + childVarname, unionPath + [childVarname]))
+            CollectLayout(child[1], accessPathInC + ".u." + childVarname, unionPath + [childVarname], names, layout)
+    elif isinstance(node, (AsnSequence, AsnSet)):
+        for child in node._members:
+            childVarname = CleanNameAsPythonWants(child[0])
+            CollectLayout(child[1], accessPathInC + "." + childVarname, AddField(childVarname, "." + childVarname), names, layout)
+        # (the bits of the OPTIONAL fields are checked as a whole)
+        if any(child[3] for child in node._members):
+            AddField("exist", ".exist")
+
+
+def CreateCtypesDeclarationsForAllTypes(names: AST_Lookup) -> None:
+    classes = CtypesClasses(names)
+    layouts = []  # type: List[Tuple[str, List[Tuple[str, List[Union[str, int]]]]]]
+    for nodeTypename in names:
+        # As in CreateDeclarationsForAllTypes, the "bad types" (IA5Strings) are kept
+        if not names[nodeTypename]._isArtificial:
+            classes.Define(nodeTypename)
+            layout = []  # type: List[Tuple[str, List[Union[str, int]]]]
+            CollectLayout(names[nodeTypename], "", [], names, layout)
+            layouts.append((CleanNameAsPythonWants(nodeTypename), layout))
+    g_outputFile.write("\n".join(classes.Lines()) + "\n")
+
+    # The sizes of the C types that depend on the ASN1SCC runtime (see NativeCtype in Stubs.py)
+    for ctype in ["flag", "asn1SccSint"]:
+        g_outputGetSetH.write("size_t SizeOf_%s(void);\n" % ctype)
+        g_outputGetSetC.write("size_t SizeOf_%s(void)\n" % ctype)
+        g_outputGetSetC.write('{\n')
+        g_outputGetSetC.write('    return sizeof(%s);\n' % ctype)
+        g_outputGetSetC.write('}\n\n')
+
+    # The layout checks: LayoutOf_T(0) is the size of T, and LayoutOf_T(2*i+1)
+    # and LayoutOf_T(2*i+2) the offset and the size of its i-th field
+    g_outputFile.write("# The fields whose offsets and sizes VerifyLayout compares with the C ones\n")
+    g_outputFile.write("# (in the order of the LayoutOf_<type> functions of _getset.so)\n")
+    g_outputFile.write("g_layouts = {\n")
+    for typ, layout in layouts:
+        if layout:
+            g_outputFile.write("    '%s': (%s, [\n" % (typ, typ))
+            for _, path in layout:
+                g_outputFile.write("        %s,\n" % repr(tuple(path)))
+            g_outputFile.write("    ]),\n")
+        else:
+            g_outputFile.write("    '%s': (%s, []),\n" % (typ, typ))
+        g_outputGetSetH.write("long LayoutOf_%s(int i);\n" % typ)
+        g_outputGetSetC.write("long LayoutOf_%s(int i)\n" % typ)
+        g_outputGetSetC.write('{\n')
+        g_outputGetSetC.write('    static const long layout[] = {\n')
+        g_outputGetSetC.write('        (long)sizeof(%s),\n' % typ)
+        for designator, _ in layout:
+            g_outputGetSetC.write('        (long)offsetof(%s, %s), (long)sizeof(((%s*)0)->%s),\n' % (
+                typ, designator[1:], typ, designator[1:]))
+        g_outputGetSetC.write('    };\n')
+        g_outputGetSetC.write('    if (i < 0 || i >= (int)(sizeof(layout) / sizeof(layout[0])))\n')
+        g_outputGetSetC.write('        return -1;\n')
+        g_outputGetSetC.write('    return layout[i];\n')
+        g_outputGetSetC.write('}\n\n')
+    g_outputFile.write("}\n\n\n")
+    g_outputFile.write("def VerifyLayout():\n")
+    g_outputFile.write("    ''' Check that the classes are laid out as the C types of ASN1SCC '''\n")
+    g_outputFile.write("    CheckLayouts(g_layouts)\n")
+
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -32,6 +32,7 @@ import re
 from distutils import spawn
 from typing import List, Union, Set  # NOQA
 
+from ..commonPy import outputFiles
 from ..commonPy import asnParser
 from ..commonPy.utility import panic, inform
 from ..commonPy.createInternalTypes import ScanChildren
@@ -89,7 +90,7 @@ def OnStartup(unused_modelingLanguage: str, asnFiles: List[str], outputDir: str,
     inform("QGenAda_A_mapper: Creating file '%s'...", outputFilename)
     global g_outputFile
     outputDir += "../"
-    g_outputFile = open(outputDir + outputFilename, 'w')
+    g_outputFile = outputFiles.Open(outputDir + outputFilename, 'w')
     g_definedTypes.clear()
     global g_octetStrings
     g_octetStrings = 0
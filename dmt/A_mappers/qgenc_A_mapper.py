@@ -25,6 +25,7 @@ import re
 
 from typing import Union, Set, List  # NOQA pylint: disable=unused-import
 
+from ..commonPy import outputFiles
 from ..commonPy.utility import panic, inform
 from ..commonPy import asnParser
 from ..commonPy.asnAST import (
@@ -68,7 +69,7 @@ def OnStartup(unused_modelingLanguage: str, unused_asnFiles: List[str], outputDi
     outputFilename = "Simulink_DataView_asn.m"
     inform("QGenC_A_mapper: Creating file '%s'...", outputFilename)
     global g_outputFile
-    g_outputFile = open(outputDir + outputFilename, 'w')
+    g_outputFile = outputFiles.Open(outputDir + outputFilename, 'w')
     g_definedTypes.clear()
     global g_octetStrings
     g_octetStrings = 0
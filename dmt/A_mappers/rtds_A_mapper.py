@@ -23,6 +23,7 @@ to RTDS. It is used by the backend of Semantix's code generator A.'''
 
 import re
 
+from ..commonPy import outputFiles
 from ..commonPy.cleanupNodes import SetOfBadTypenames
 from ..commonPy.asnParser import AST_Leaftypes, AsnNode
 from ..commonPy.asnAST import AsnSequenceOrSet, AsnSequenceOrSetOf, AsnEnumerated, AsnChoice
@@ -97,6 +98,6 @@ def OnShutdown(unused_badTypes: SetOfBadTypenames) -> None:
     # outputFile.write('END\n')
     # outputFile.close()
 
-    outputFile = open(g_outputDir + "RTDSdataView.asn", 'w')
+    outputFile = outputFiles.Open(g_outputDir + "RTDSdataView.asn", 'w')
     outputFile.write(re.sub(r'^.*BEGIN', 'RTDSdataView DEFINITIONS ::= BEGIN', open(g_asnFile, 'r').read()))
     outputFile.close()
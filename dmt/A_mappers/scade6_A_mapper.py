@@ -30,6 +30,7 @@ import random
 from xml.dom.minidom import Document, Node  # type: ignore  # NOQA  pylint: disable=unused-import
 from typing import Union, Set, Dict  # NOQA pylint: disable=unused-import
 
+from ..commonPy import outputFiles
 from ..commonPy.utility import inform, panic
 from ..commonPy.asnAST import (
     AsnBasicNode, AsnString, AsnEnumerated, AsnMetaMember, AsnSet,
@@ -112,7 +113,7 @@ def OnStartup(unused_modelingLanguage: str, asnFile: str, outputDir: str, unused
 
     inform("Scade612_A_mapper: Creating file '%s'...", outputFilename)
     global g_outputFile
-    g_outputFile = open(outputDir + outputFilename, 'wb')
+    g_outputFile = outputFiles.Open(outputDir + outputFilename, 'wb')
 
     global g_mainOid
     g_mainOid = "/" + RandomHex(4) + "/" + RandomHex(3) + "/"
@@ -22,6 +22,7 @@ import re
 
 from typing import Union, Set, List  # NOQA pylint: disable=unused-import
 
+from ..commonPy import outputFiles
 from ..commonPy.utility import panic, inform
 from ..commonPy import asnParser
 from ..commonPy.asnAST import (
@@ -66,7 +67,7 @@ def OnStartup(unused_modelingLanguage: str, unused_asnFile: str, outputDir: str,
     outputFilename = "Simulink_DataView_asn.m"
     inform("Simulink_A_mapper: Creating file '%s'...", outputFilename)
     global g_outputFile
-    g_outputFile = open(outputDir + outputFilename, 'w')
+    g_outputFile = outputFiles.Open(outputDir + outputFilename, 'w')
     g_definedTypes.clear()
     global g_octetStrings
     g_octetStrings = 0
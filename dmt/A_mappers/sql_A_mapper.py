@@ -26,6 +26,7 @@ import re
 
 from typing import List, Union, Set, IO, Any, Dict  # NOQA pylint: disable=unused-import
 
+from ..commonPy import outputFiles
 from ..commonPy.asnAST import (
     AsnMetaMember, AsnChoice, AsnSet, AsnSequence, AsnSequenceOf, AsnSetOf,
     AsnBasicNode, AsnSequenceOrSet, AsnSequenceOrSetOf, AsnEnumerated,
@@ -301,7 +302,7 @@ def OnShutdown(badTypes: SetOfBadTypenames) -> None:
     g_bShutdownRun = True
 
     global g_sqlOutput
-    g_sqlOutput = open(
+    g_sqlOutput = outputFiles.Open(
         g_outputDir + os.sep + g_uniqueStringOfASN1files + ".sql", 'w')
     d = g_asnFiles if isinstance(g_asnFiles, str) else '","'.join(g_asnFiles)
     g_sqlOutput.write('--  SQL statements for types used in "%s"\n' % d)
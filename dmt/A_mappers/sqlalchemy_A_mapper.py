@@ -26,6 +26,7 @@ import re
 
 from typing import List, Union, IO, Any, Dict, Set  # NOQA pylint: disable=unused-import
 
+from ..commonPy import outputFiles
 from ..commonPy.asnAST import (
     AsnMetaMember, AsnChoice, AsnSet, AsnSequence, AsnSequenceOf,
     AsnSetOf, isSequenceVariable, AsnBasicNode, AsnSequenceOrSet,
@@ -533,7 +534,7 @@ def OnShutdown(badTypes: SetOfBadTypenames) -> None:
     g_bShutdownRun = True
 
     global g_sqlalchemyOutput
-    g_sqlalchemyOutput = open(
+    g_sqlalchemyOutput = outputFiles.Open(
         g_outputDir + os.sep + g_uniqueStringOfASN1files + "_model.py", 'w')
     d = g_asnFiles if isinstance(g_asnFiles, str) else '","'.join(g_asnFiles)  # type: str
     typenameList = []  # type: List[str]
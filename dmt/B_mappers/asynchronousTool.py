@@ -27,6 +27,7 @@ import os
 
 from typing import Tuple, IO, Any, Dict  # NOQA pylint: disable=unused-import
 
+from ..commonPy import outputFiles
 from ..commonPy.utility import inform, panicWithCallStack
 from ..commonPy.asnParser import Typename, AsnNode, AST_Lookup, AST_Leaftypes  # NOQA pylint: disable=unused-import
 
@@ -89,10 +90,10 @@ class ASynchronousToolGlueGenerator:
         outputCsourceFilename = self.CleanNameAsToolWants(prefix) + "_ASN1_Types.c"
 
         inform(str(self.__class__) + ": Creating file '%s'...", outputCheaderFilename)
-        self.C_HeaderFile = open(outputDir + outputCheaderFilename, 'w')
+        self.C_HeaderFile = outputFiles.Open(outputDir + outputCheaderFilename, 'w')
 
         inform(str(self.__class__) + ": Creating file '%s'...", outputCsourceFilename)
-        self.C_SourceFile = open(outputDir + outputCsourceFilename, 'w')
+        self.C_SourceFile = outputFiles.Open(outputDir + outputCsourceFilename, 'w')
 
         self.asn_name = os.path.basename(os.path.splitext(asnFile)[0])
 
@@ -38,13 +38,14 @@ output parameters, which have C callable interfaces.
 
 from typing import List
 
+from ..commonPy import configMT
 from ..commonPy.utility import panic
 from ..commonPy.asnAST import (
     sourceSequenceLimit, isSequenceVariable, targetSequenceLimit,
     AsnInt, AsnReal, AsnBool, AsnSequenceOrSet, AsnSequenceOrSetOf,
     AsnChoice, AsnOctetString, AsnEnumerated, AsnNode)
 from ..commonPy.asnParser import AST_Lookup, AST_Leaftypes
-from ..commonPy.recursiveMapper import RecursiveMapper
+from ..commonPy.recursiveMapper import RecursiveMapper, Emitter, OutlinedCRoutine
 from .asynchronousTool import ASynchronousToolGlueGenerator
 
 isAsynchronous = True
@@ -53,6 +54,7 @@ cBackend = None
 
 # noinspection PyListCreation
 # pylint: disable=no-self-use
+# pylint: disable=arguments-renamed
 class FromCtoOSS(RecursiveMapper):
     def __init__(self) -> None:
         self.uniqueID = 0
@@ -61,89 +63,90 @@ class FromCtoOSS(RecursiveMapper):
         self.uniqueID += 1
         return self.uniqueID
 
-    def MapInteger(self, srcCVariable: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (destVar, srcCVariable)]
+    def EmitInteger(self, emitter: Emitter, srcCVariable: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (destVar, srcCVariable))
 
-    def MapReal(self, srcCVariable: str, destVar: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (destVar, srcCVariable)]
+    def EmitReal(self, emitter: Emitter, srcCVariable: str, destVar: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (destVar, srcCVariable))
 
-    def MapBoolean(self, srcCVariable: str, destVar: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = (char)%s;\n" % (destVar, srcCVariable)]
+    def EmitBoolean(self, emitter: Emitter, srcCVariable: str, destVar: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = (char)%s;\n" % (destVar, srcCVariable))
 
-    def MapOctetString(self, srcCVariable: str, destVar: str, node: AsnOctetString, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
-        lines.append("{\n")
-        lines.append("    int i;\n")
+    def EmitOctetString(self, emitter: Emitter, srcCVariable: str, destVar: str, node: AsnOctetString, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("{\n")
+        emitter.Line("    int i;\n")
         limit = sourceSequenceLimit(node, srcCVariable)
-        lines.append("    for(i=0; i<%s; i++)\n" % limit)
-        lines.append("        %s.value[i] = %s.arr[i];\n" % (destVar, srcCVariable))
-        lines.append("    %s.length = %s;\n" % (destVar, limit))
-        lines.append("}\n")
-        return lines
+        emitter.Line("    for(i=0; i<%s; i++)\n" % limit)
+        emitter.Line("        %s.value[i] = %s.arr[i];\n" % (destVar, srcCVariable))
+        emitter.Line("    %s.length = %s;\n" % (destVar, limit))
+        emitter.Line("}\n")
 
-    def MapEnumerated(self, srcCVariable: str, destVar: str, _: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (destVar, srcCVariable)]
+    def EmitEnumerated(self, emitter: Emitter, srcCVariable: str, destVar: str, _: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (destVar, srcCVariable))
 
-    def MapSequence(self, srcCVariable: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitSequence(self, emitter: Emitter, srcCVariable: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         for child in node._members:
-            lines.extend(
-                self.Map(
-                    "%s.%s" % (srcCVariable, self.CleanName(child[0])),
-                    destVar + "." + self.CleanName(child[0]),
-                    child[1],
-                    leafTypeDict,
-                    names))
-        return lines
+            self.Emit(
+                emitter,
+                "%s.%s" % (srcCVariable, self.CleanName(child[0])),
+                destVar + "." + self.CleanName(child[0]),
+                child[1],
+                leafTypeDict,
+                names)
 
-    def MapSet(self, srcCVariable: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequence(srcCVariable, destVar, node, leafTypeDict, names)  # pragma: nocover
+    def EmitSet(self, emitter: Emitter, srcCVariable: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequence(emitter, srcCVariable, destVar, node, leafTypeDict, names)  # pragma: nocover
 
-    def MapChoice(self, srcCVariable: str, destVar: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitChoice(self, emitter: Emitter, srcCVariable: str, destVar: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         childNo = 0
         for child in node._members:
             childNo += 1
-            lines.append("%sif (%s.kind == %s) {\n" %
+            emitter.Line("%sif (%s.kind == %s) {\n" %
                          (self.maybeElse(childNo), srcCVariable, self.CleanName(child[2])))
-            lines.extend(
-                ['    ' + x
-                 for x in self.Map(
-                     "%s.u.%s" % (srcCVariable, self.CleanName(child[0])),
-                     destVar + ".u." + self.CleanName(child[0]),
-                     child[1],
-                     leafTypeDict,
-                     names)])
-            lines.append("    %s.choice = OSS_%s_chosen;\n" % (destVar, self.CleanName(child[0])))
-            lines.append("}\n")
-        return lines
-
-    def MapSequenceOf(self, srcCVariable: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
-        lines.append("{\n")
+            with emitter.Indented():
+                self.Emit(
+                    emitter,
+                    "%s.u.%s" % (srcCVariable, self.CleanName(child[0])),
+                    destVar + ".u." + self.CleanName(child[0]),
+                    child[1],
+                    leafTypeDict,
+                    names)
+            emitter.Line("    %s.choice = OSS_%s_chosen;\n" % (destVar, self.CleanName(child[0])))
+            emitter.Line("}\n")
+
+    def EmitSequenceOf(self, emitter: Emitter, srcCVariable: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Line("{\n")
         uniqueId = self.UniqueID()
-        lines.append("    int i%s;\n" % uniqueId)
+        emitter.Line("    int i%s;\n" % uniqueId)
         limit = sourceSequenceLimit(node, srcCVariable)
-        lines.append("    for(i%s=0; i%s<%s; i%s++) {\n" % (uniqueId, uniqueId, limit, uniqueId))
-        lines.extend(
-            ["        " + x
-             for x in self.Map(
-                 "%s.arr[i%s]" % (srcCVariable, uniqueId),
-                 "%s.value[i%s]" % (destVar, uniqueId),
-                 node._containedType,
-                 leafTypeDict,
-                 names)])
-        lines.append("    }\n")
-        lines.append("    %s.count = %s;\n" % (destVar, limit))
-        lines.append("}\n")
-        return lines
-
-    def MapSetOf(self, srcCVariable: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequenceOf(srcCVariable, destVar, node, leafTypeDict, names)  # pragma: nocover
+        emitter.Line("    for(i%s=0; i%s<%s; i%s++) {\n" % (uniqueId, uniqueId, limit, uniqueId))
+        with emitter.Indented("        "):
+            self.Emit(
+                emitter,
+                "%s.arr[i%s]" % (srcCVariable, uniqueId),
+                "%s.value[i%s]" % (destVar, uniqueId),
+                node._containedType,
+                leafTypeDict,
+                names)
+        emitter.Line("    }\n")
+        emitter.Line("    %s.count = %s;\n" % (destVar, limit))
+        emitter.Line("}\n")
+
+    def EmitSetOf(self, emitter: Emitter, srcCVariable: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequenceOf(emitter, srcCVariable, destVar, node, leafTypeDict, names)  # pragma: nocover
+
+    def OutlinedCall(self, srcCVariable: str, destVar: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["FromCtoOSS_%s(&%s, &%s);\n" % (self.CleanName(typename), srcCVariable, destVar)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "FromCtoOSS_" + cleanName, "asn1Scc" + cleanName, "OSS_" + cleanName, node, leafTypeDict, names)
 
 
 # noinspection PyListCreation
 # pylint: disable=no-self-use
+# pylint: disable=arguments-renamed
 class FromOSStoC(RecursiveMapper):
     def __init__(self) -> None:
         self.uniqueID = 0
@@ -152,87 +155,87 @@ class FromOSStoC(RecursiveMapper):
         self.uniqueID += 1
         return self.uniqueID
 
-    def MapInteger(self, srcVar: str, dstCVariable: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (dstCVariable, srcVar)]
+    def EmitInteger(self, emitter: Emitter, srcVar: str, dstCVariable: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (dstCVariable, srcVar))
 
-    def MapReal(self, srcVar: str, dstCVariable: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (dstCVariable, srcVar)]
+    def EmitReal(self, emitter: Emitter, srcVar: str, dstCVariable: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (dstCVariable, srcVar))
 
-    def MapBoolean(self, srcVar: str, dstCVariable: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = (%s)?1:0;\n" % (dstCVariable, srcVar)]
+    def EmitBoolean(self, emitter: Emitter, srcVar: str, dstCVariable: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = (%s)?1:0;\n" % (dstCVariable, srcVar))
 
-    def MapOctetString(self, srcVar: str, dstCVariable: str, node: AsnOctetString, _: AST_Leaftypes, __: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
-        lines.append("{\n")
-        lines.append("    int i;\n")
-        lines.append("    for(i=0; i<%s.length; i++)\n" % srcVar)
-        lines.append("        %s.arr[i] = %s.value[i];\n" % (dstCVariable, srcVar))
-        lines.append("    while(i<%d) { %s.arr[i]=0; i++; }\n" % (node._range[-1], dstCVariable))
+    def EmitOctetString(self, emitter: Emitter, srcVar: str, dstCVariable: str, node: AsnOctetString, _: AST_Leaftypes, __: AST_Lookup) -> None:
+        emitter.Line("{\n")
+        emitter.Line("    int i;\n")
+        emitter.Line("    for(i=0; i<%s.length; i++)\n" % srcVar)
+        emitter.Line("        %s.arr[i] = %s.value[i];\n" % (dstCVariable, srcVar))
+        emitter.Line("    while(i<%d) { %s.arr[i]=0; i++; }\n" % (node._range[-1], dstCVariable))
         if isSequenceVariable(node):
-            lines.append("    %s.nCount = %s.length;\n" % (dstCVariable, srcVar))
-        lines.append("}\n")
-        return lines
+            emitter.Line("    %s.nCount = %s.length;\n" % (dstCVariable, srcVar))
+        emitter.Line("}\n")
 
-    def MapEnumerated(self, srcVar: str, dstCVariable: str, _: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (dstCVariable, srcVar)]
+    def EmitEnumerated(self, emitter: Emitter, srcVar: str, dstCVariable: str, _: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (dstCVariable, srcVar))
 
-    def MapSequence(self, srcVar: str, dstCVariable: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitSequence(self, emitter: Emitter, srcVar: str, dstCVariable: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         for child in node._members:
-            lines.extend(
-                self.Map(
-                    srcVar + "." + self.CleanName(child[0]),
-                    "%s.%s" % (dstCVariable, self.CleanName(child[0])),
-                    child[1],
-                    leafTypeDict,
-                    names))
-        return lines
+            self.Emit(
+                emitter,
+                srcVar + "." + self.CleanName(child[0]),
+                "%s.%s" % (dstCVariable, self.CleanName(child[0])),
+                child[1],
+                leafTypeDict,
+                names)
 
-    def MapSet(self, srcVar: str, dstCVariable: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequence(srcVar, dstCVariable, node, leafTypeDict, names)  # pragma: nocover
+    def EmitSet(self, emitter: Emitter, srcVar: str, dstCVariable: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequence(emitter, srcVar, dstCVariable, node, leafTypeDict, names)  # pragma: nocover
 
-    def MapChoice(self, srcVar: str, dstCVariable: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitChoice(self, emitter: Emitter, srcVar: str, dstCVariable: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         childNo = 0
         for child in node._members:
             childNo += 1
-            lines.append("%sif (%s.choice == OSS_%s_chosen) {\n" %
+            emitter.Line("%sif (%s.choice == OSS_%s_chosen) {\n" %
                          (self.maybeElse(childNo), srcVar, self.CleanName(child[0])))
-            lines.extend(
-                ['    ' + x
-                 for x in self.Map(
-                     srcVar + ".u." + self.CleanName(child[0]),
-                     "%s.u.%s" % (dstCVariable, self.CleanName(child[0])),
-                     child[1],
-                     leafTypeDict,
-                     names)])
-            lines.append("    %s.kind = %s;\n" % (dstCVariable, self.CleanName(child[2])))
-            lines.append("}\n")
-        return lines
-
-    def MapSequenceOf(self, srcVar: str, dstCVariable: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
-        lines.append("{\n")
+            with emitter.Indented():
+                self.Emit(
+                    emitter,
+                    srcVar + ".u." + self.CleanName(child[0]),
+                    "%s.u.%s" % (dstCVariable, self.CleanName(child[0])),
+                    child[1],
+                    leafTypeDict,
+                    names)
+            emitter.Line("    %s.kind = %s;\n" % (dstCVariable, self.CleanName(child[2])))
+            emitter.Line("}\n")
+
+    def EmitSequenceOf(self, emitter: Emitter, srcVar: str, dstCVariable: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Line("{\n")
         uniqueId = self.UniqueID()
-        lines.append("    int i%s;\n" % uniqueId)
+        emitter.Line("    int i%s;\n" % uniqueId)
         if isSequenceVariable(node):
-            lines.append("    %s.nCount = %s.count;\n" % (dstCVariable, srcVar))
-        lines.append("    for(i%s=0; i%s<%s; i%s++) {\n" %
+            emitter.Line("    %s.nCount = %s.count;\n" % (dstCVariable, srcVar))
+        emitter.Line("    for(i%s=0; i%s<%s; i%s++) {\n" %
                      (uniqueId, uniqueId, targetSequenceLimit(node, dstCVariable), uniqueId))
-        lines.extend(
-            ["        " + x
-             for x in self.Map(
-                 srcVar + ".value[i%s]" % uniqueId,
-                 "%s.arr[i%s]" % (dstCVariable, uniqueId),
-                 node._containedType,
-                 leafTypeDict,
-                 names)])
-        lines.append("    }\n")
-        lines.append("}\n")
-        return lines
-
-    def MapSetOf(self, srcVar: str, dstCVariable: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequenceOf(srcVar, dstCVariable, node, leafTypeDict, names)  # pragma: nocover
+        with emitter.Indented("        "):
+            self.Emit(
+                emitter,
+                srcVar + ".value[i%s]" % uniqueId,
+                "%s.arr[i%s]" % (dstCVariable, uniqueId),
+                node._containedType,
+                leafTypeDict,
+                names)
+        emitter.Line("    }\n")
+        emitter.Line("}\n")
+
+    def EmitSetOf(self, emitter: Emitter, srcVar: str, dstCVariable: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequenceOf(emitter, srcVar, dstCVariable, node, leafTypeDict, names)  # pragma: nocover
+
+    def OutlinedCall(self, srcVar: str, dstCVariable: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["FromOSStoC_%s(&%s, &%s);\n" % (self.CleanName(typename), srcVar, dstCVariable)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "FromOSStoC_" + cleanName, "OSS_" + cleanName, "asn1Scc" + cleanName, node, leafTypeDict, names)
 
 
 class C_GlueGenerator(ASynchronousToolGlueGenerator):
@@ -240,6 +243,9 @@ class C_GlueGenerator(ASynchronousToolGlueGenerator):
         ASynchronousToolGlueGenerator.__init__(self)
         self.FromOSStoC = FromOSStoC()
         self.FromCtoOSS = FromCtoOSS()
+        if configMT.outlineMappers:
+            self.FromOSStoC.EnableOutlining()
+            self.FromCtoOSS.EnableOutlining()
 
     def Version(self) -> None:
         print("Code generator: " + "$Id: c_B_mapper.py 2390 2012-07-19 12:39:17Z ttsiodras $")  # pragma: no cover
@@ -256,6 +262,19 @@ class C_GlueGenerator(ASynchronousToolGlueGenerator):
         if encoding.lower() not in self.supportedEncodings:
             panic(str(self.__class__) + ": in (%s), encoding can be one of %s (not '%s')" %  # pragma: no cover
                   (nodeTypename, self.supportedEncodings, encoding))  # pragma: no cover
+        emitter = Emitter()
+        if self.useOSS and encoding.lower() == "uper":
+            with emitter.Indented():
+                self.FromCtoOSS.Emit(
+                    emitter,
+                    "(*pSrc)",
+                    "var_" + self.CleanNameAsToolWants(nodeTypename),
+                    node,
+                    leafTypeDict,
+                    names)
+            # The outlined conversion routines must precede their callers
+            self.C_SourceFile.write("".join(self.FromCtoOSS.OutlinedRoutines(leafTypeDict, names)))
+
         tmpSpName = "Encode_%s_%s" % \
             ({"uper": "UPER", "native": "NATIVE", "acn": "ACN"}[encoding.lower()],
              self.CleanNameAsToolWants(nodeTypename))
@@ -290,14 +309,7 @@ class C_GlueGenerator(ASynchronousToolGlueGenerator):
 
         # Write the mapping code for the message if using OSS
         if self.useOSS and encoding.lower() == "uper":
-            lines = self.FromCtoOSS.Map(
-                "(*pSrc)",
-                "var_" + self.CleanNameAsToolWants(nodeTypename),
-                node,
-                leafTypeDict,
-                names)
-            lines = ["    " + x for x in lines]
-            self.C_SourceFile.write("".join(lines))
+            emitter.WriteTo(self.C_SourceFile)
 
         if self.useOSS and encoding.lower() == "uper":
             # setup the OSS encoder
@@ -346,6 +358,19 @@ class C_GlueGenerator(ASynchronousToolGlueGenerator):
             panic(str(self.__class__) + ": in (%s), encoding can be one of %s (not '%s')" %  # pragma: no cover
                   (nodeTypename, self.supportedEncodings, encoding))  # pragma: no cover
 
+        emitter = Emitter()
+        if self.useOSS and encoding.lower() == "uper":
+            with emitter.Indented("        "):
+                self.FromOSStoC.Emit(
+                    emitter,
+                    "(*pVar_" + self.CleanNameAsToolWants(nodeTypename) + ")",
+                    "(*pDst)",
+                    node,
+                    leafTypeDict,
+                    names)
+            # The outlined conversion routines must precede their callers
+            self.C_SourceFile.write("".join(self.FromOSStoC.OutlinedRoutines(leafTypeDict, names)))
+
         tmpSpName = "Decode_%s_%s" % \
             ({"uper": "UPER", "native": "NATIVE", "acn": "ACN"}[encoding.lower()],
              self.CleanNameAsToolWants(nodeTypename))
@@ -389,14 +414,7 @@ class C_GlueGenerator(ASynchronousToolGlueGenerator):
                                         (self.CleanNameAsToolWants(nodeTypename)))
 
         if self.useOSS and encoding.lower() == "uper":
-            lines = self.FromOSStoC.Map(
-                "(*pVar_" + self.CleanNameAsToolWants(nodeTypename) + ")",
-                "(*pDst)",
-                node,
-                leafTypeDict,
-                names)
-            lines = ["        " + x for x in lines]
-            self.C_SourceFile.write("".join(lines))
+            emitter.WriteTo(self.C_SourceFile)
 
         if self.useOSS and encoding.lower() == "uper":
             self.C_SourceFile.write("        ossFreeBuf(g_world, pVar_%s);\n" %
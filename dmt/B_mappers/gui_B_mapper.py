@@ -26,6 +26,7 @@ import os
 
 from typing import Set, IO, Union, Any, List, Dict  # NOQA pylint: disable=unused-import
 
+from ..commonPy import outputFiles
 from ..commonPy.asnAST import (
     AsnBasicNode, AsnEnumerated, AsnSequence, AsnSet, AsnChoice,
     AsnSequenceOf, AsnSetOf, AsnMetaMember, AsnInt, AsnReal, AsnOctetString,
@@ -221,9 +222,9 @@ def OneTimeOnly(
     global g_maybeFVname
     g_maybeFVname = maybeFVname
     global g_HeaderFile
-    g_HeaderFile = open(outputDir + 'telecmds.h', 'w')
+    g_HeaderFile = outputFiles.Open(outputDir + 'telecmds.h', 'w')
     global g_GnuplotFile
-    g_GnuplotFile = open(outputDir + 'gnuplot', 'w')
+    g_GnuplotFile = outputFiles.Open(outputDir + 'gnuplot', 'w')
     g_HeaderFile.write('''#ifndef __TELECMDS_H__
 #define __TELECMDS_H__
 
@@ -275,25 +276,25 @@ public:
 };
 ''')
     global g_MyEvents
-    g_MyEvents = open(outputDir + "MyEvents.inc", "w")
+    g_MyEvents = outputFiles.Open(outputDir + "MyEvents.inc", "w")
     global g_MyCreation
-    g_MyCreation = open(outputDir + "MyCreation.inc", "w")
+    g_MyCreation = outputFiles.Open(outputDir + "MyCreation.inc", "w")
     global g_MyClickPrototypes
-    g_MyClickPrototypes = open(outputDir + "MyClickPrototypes.inc", "w")
+    g_MyClickPrototypes = outputFiles.Open(outputDir + "MyClickPrototypes.inc", "w")
     global g_MyControls
-    g_MyControls = open(outputDir + "MyControls.inc", "w")
+    g_MyControls = outputFiles.Open(outputDir + "MyControls.inc", "w")
     global g_MyLoad
-    g_MyLoad = open(g_outputDir + 'MyLoad.inc', 'w')
+    g_MyLoad = outputFiles.Open(g_outputDir + 'MyLoad.inc', 'w')
     global g_MySave
-    g_MySave = open(g_outputDir + 'MySave.inc', 'w')
+    g_MySave = outputFiles.Open(g_outputDir + 'MySave.inc', 'w')
     global g_MyThreadsInc
-    g_MyThreadsInc = open(g_outputDir + 'MyThreads.inc', 'w')
+    g_MyThreadsInc = outputFiles.Open(g_outputDir + 'MyThreads.inc', 'w')
     global g_MyThreadsH
-    g_MyThreadsH = open(g_outputDir + 'MyThreads.h', 'w')
+    g_MyThreadsH = outputFiles.Open(g_outputDir + 'MyThreads.h', 'w')
     global g_MyTelemetryActions
-    g_MyTelemetryActions = open(g_outputDir + "MyTelemetryActions.inc", 'w')
+    g_MyTelemetryActions = outputFiles.Open(g_outputDir + "MyTelemetryActions.inc", 'w')
     global g_SourceFile
-    g_SourceFile = open(outputDir + 'telecmds.cpp', 'w')
+    g_SourceFile = outputFiles.Open(outputDir + 'telecmds.cpp', 'w')
     global g_asn_name
     g_asn_name = os.path.basename(os.path.splitext(asnFile)[0])
     g_SourceFile.write("#include \"%s.h\"\n\n" % g_asn_name)
@@ -346,7 +347,7 @@ public:
 
     # Instructions for actions per RI
     global g_MyAction
-    g_MyAction = open(outputDir + "MyActions.inc", "w")
+    g_MyAction = outputFiles.Open(outputDir + "MyActions.inc", "w")
 
     g_MyThreadsH.write("#ifndef __MYTHREADSH__\n")
     g_MyThreadsH.write("#define __MYTHREADSH__\n\n")
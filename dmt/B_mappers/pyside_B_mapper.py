@@ -5,6 +5,7 @@ import re
 import os
 from typing import List
 
+from ..commonPy import outputFiles
 from ..commonPy.asnAST import (
     AsnInt, AsnBool, AsnReal, AsnEnumerated,
     AsnOctetString, AsnChoice, AsnSequence, AsnSet,
@@ -41,7 +42,7 @@ def OneTimeOnly(
         FVname: str,
         unused_useOSS: bool) -> None:
     global g_PyDataModel
-    g_PyDataModel = open(outputDir + 'datamodel.py', 'w')
+    g_PyDataModel = outputFiles.Open(outputDir + 'datamodel.py', 'w')
     g_PyDataModel.write('''#!/usr/bin/python
 
 import DV
@@ -54,7 +55,7 @@ errCodes = {{}}
 '''.format(fvname=FVname))
 
     global g_QUiFile
-    g_QUiFile = open(outputDir + 'guilayout.ui', 'w')
+    g_QUiFile = outputFiles.Open(outputDir + 'guilayout.ui', 'w')
     g_QUiFile.write('''<?xml version="1.0" encoding="UTF-8"?>
 <ui version="4.0">
  <class>MainWindow</class>
@@ -151,7 +152,7 @@ def OnStartup(
 
     # Create the per-PI/RI backend file that includes Encode/Decode functions
     global g_BackendFile
-    g_BackendFile = open(outputDir + '%s_backend.py' % CleanSP, 'w')
+    g_BackendFile = outputFiles.Open(outputDir + '%s_backend.py' % CleanSP, 'w')
     g_BackendFile.write('''#!/usr/bin/python
 
 import sys
@@ -23,6 +23,7 @@ import os
 
 from typing import Set, Dict  # NOQA pylint: disable=unused-import
 
+from ..commonPy import outputFiles
 from ..commonPy.aadlAST import ApLevelContainer, Param
 from ..commonPy.asnParser import AST_Leaftypes, AST_Lookup, AsnNode
 
@@ -70,7 +71,7 @@ def OnStartup(modelingLanguage: str,
 
     global g_PythonFile
     if g_PythonFile is None:
-        g_PythonFile = open(outputDir + "python/PythonController.py", "w")
+        g_PythonFile = outputFiles.Open(outputDir + "python/PythonController.py", "w")
         g_headerPython.append("from __future__ import absolute_import\n\n")
         g_headerPython.append("import threading, time, sys, os, ctypes\n")
         # g_headerPython.append("from PythonAccess import *")
@@ -94,7 +95,7 @@ def OnStartup(modelingLanguage: str,
     # For TCs, that is not necessary, since SendTC... functions have already been generated (see below)
     global g_HeaderFile
     if g_HeaderFile is None:
-        g_HeaderFile = open(outputDir + "python/gui_api.h", "w")
+        g_HeaderFile = outputFiles.Open(outputDir + "python/gui_api.h", "w")
         g_HeaderFile.write('#ifndef __HEADER_' + cleanFVname + "_H__\n")
         g_HeaderFile.write('#define __HEADER_' + cleanFVname + "_H__\n\n")
         g_HeaderFile.write('typedef unsigned char byte;\n\n')
@@ -105,7 +106,7 @@ def OnStartup(modelingLanguage: str,
 
     global g_SourceFile
     if g_SourceFile is None:
-        g_SourceFile = open(outputDir + "python/gui_api.c", "w")
+        g_SourceFile = outputFiles.Open(outputDir + "python/gui_api.c", "w")
         g_SourceFile.write('#include <stdio.h>\n')
         g_SourceFile.write('#include <string.h>\n')
         g_SourceFile.write('#include <unistd.h>\n')
@@ -39,6 +39,7 @@ stubs (to allow calling from the VM side) are also generated.
 '''
 
 from typing import List
+from ..commonPy import configMT
 from ..commonPy.utility import panicWithCallStack
 from ..commonPy.asnAST import (
     sourceSequenceLimit, isSequenceVariable, AsnInt, AsnReal, AsnEnumerated,
@@ -46,7 +47,7 @@ from ..commonPy.asnAST import (
     AsnNode)
 from ..commonPy.asnParser import AST_Lookup, AST_Leaftypes
 from ..commonPy.aadlAST import AadlPort, AadlParameter, ApLevelContainer, Param
-from ..commonPy.recursiveMapper import RecursiveMapper
+from ..commonPy.recursiveMapper import RecursiveMapper, OutlinedCRoutine
 from .synchronousTool import SynchronousToolGlueGenerator
 
 isAsynchronous = False
@@ -142,6 +143,14 @@ class FromQGenCToASN1SCC(RecursiveMapper):
     def MapSetOf(self, srcQGenC: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return self.MapSequenceOf(srcQGenC, destVar, node, leafTypeDict, names)  # pragma: nocover
 
+    def OutlinedCall(self, srcQGenC: str, destVar: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromQGenCToASN1SCC(&%s, &%s);\n" % (self.CleanName(typename), srcQGenC, destVar)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromQGenCToASN1SCC", cleanName, "asn1Scc" + cleanName, node, leafTypeDict, names)
+
 
 # pylint: disable=no-self-use
 class FromASN1SCCtoQGenC(RecursiveMapper):
@@ -224,6 +233,14 @@ class FromASN1SCCtoQGenC(RecursiveMapper):
     def MapSetOf(self, srcVar: str, dstQGenC: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return self.MapSequenceOf(srcVar, dstQGenC, node, leafTypeDict, names)  # pragma: nocover
 
+    def OutlinedCall(self, srcVar: str, dstQGenC: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromASN1SCCtoQGenC(&%s, &%s);\n" % (self.CleanName(typename), srcVar, dstQGenC)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromASN1SCCtoQGenC", "asn1Scc" + cleanName, cleanName, node, leafTypeDict, names)
+
 
 # pylint: disable=no-self-use
 class FromQGenCToOSS(RecursiveMapper):
@@ -305,6 +322,14 @@ class FromQGenCToOSS(RecursiveMapper):
     def MapSetOf(self, srcQGenC: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return self.MapSequenceOf(srcQGenC, destVar, node, leafTypeDict, names)  # pragma: nocover
 
+    def OutlinedCall(self, srcQGenC: str, destVar: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromQGenCToOSS(&%s, &%s);\n" % (self.CleanName(typename), srcQGenC, destVar)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromQGenCToOSS", cleanName, "OSS_" + cleanName, node, leafTypeDict, names)
+
 
 # pylint: disable=no-self-use
 class FromOSStoQGenC(RecursiveMapper):
@@ -385,24 +410,45 @@ class FromOSStoQGenC(RecursiveMapper):
     def MapSetOf(self, srcVar: str, dstQGenC: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return self.MapSequenceOf(srcVar, dstQGenC, node, leafTypeDict, names)  # pragma: nocover
 
+    def OutlinedCall(self, srcVar: str, dstQGenC: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromOSStoQGenC(&%s, &%s);\n" % (self.CleanName(typename), srcVar, dstQGenC)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromOSStoQGenC", "OSS_" + cleanName, cleanName, node, leafTypeDict, names)
+
 
 class QGenCGlueGenerator(SynchronousToolGlueGenerator):
     g_FVname = None  # type: str
 
+    def __init__(self) -> None:
+        super().__init__()
+        # The same mappers are used for all the parameters, so that the
+        # outlined conversion routines are only emitted once per file.
+        self._fromQGenCToASN1SCC = FromQGenCToASN1SCC()
+        self._fromQGenCToOSS = FromQGenCToOSS()
+        self._fromASN1SCCtoQGenC = FromASN1SCCtoQGenC()
+        self._fromOSStoQGenC = FromOSStoQGenC()
+        if configMT.outlineMappers:
+            for mapper in [self._fromQGenCToASN1SCC, self._fromQGenCToOSS,
+                           self._fromASN1SCCtoQGenC, self._fromOSStoQGenC]:
+                mapper.EnableOutlining()
+
     def Version(self) -> None:
         print("Code generator: " + "$Id: qgenc_B_mapper.py 2390 2014-11-27 12:39:17Z dtuulik $")  # pragma: no cover
 
     def FromToolToASN1SCC(self) -> RecursiveMapper:
-        return FromQGenCToASN1SCC()
+        return self._fromQGenCToASN1SCC
 
     def FromToolToOSS(self) -> RecursiveMapper:
-        return FromQGenCToOSS()
+        return self._fromQGenCToOSS
 
     def FromASN1SCCtoTool(self) -> RecursiveMapper:
-        return FromASN1SCCtoQGenC()
+        return self._fromASN1SCCtoQGenC
 
     def FromOSStoTool(self) -> RecursiveMapper:
-        return FromOSStoQGenC()
+        return self._fromOSStoQGenC
 
     def HeadersOnStartup(self, unused_modelingLanguage: str, unused_asnFile: str, subProgram: ApLevelContainer, unused_subProgramImplementation: str, unused_outputDir: str, unused_maybeFVname: str) -> None:
         if self.useOSS:
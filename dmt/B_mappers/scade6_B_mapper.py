@@ -37,6 +37,7 @@ stubs (to allow calling from the VM side) are also generated.
 
 from typing import List
 
+from ..commonPy import configMT
 from ..commonPy.utility import panic, panicWithCallStack
 from ..commonPy.asnAST import (
     isSequenceVariable, sourceSequenceLimit, AsnInt, AsnBool, AsnReal, AsnBasicNode,
@@ -45,7 +46,7 @@ from ..commonPy.asnAST import (
 from ..commonPy.asnParser import AST_Lookup, AST_Leaftypes
 from ..commonPy.aadlAST import AadlPort, AadlParameter, ApLevelContainer, Param
 
-from ..commonPy.recursiveMapper import RecursiveMapper
+from ..commonPy.recursiveMapper import RecursiveMapper, OutlinedCRoutine
 from .synchronousTool import SynchronousToolGlueGenerator
 
 isAsynchronous = False
@@ -135,6 +136,14 @@ class FromSCADEtoASN1SCC(RecursiveMapper):
     def MapSetOf(self, srcScadeMacro: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return self.MapSequenceOf(srcScadeMacro, destVar, node, leafTypeDict, names)  # pragma: nocover
 
+    def OutlinedCall(self, srcScadeMacro: str, destVar: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromSCADEtoASN1SCC(&%s, &%s);\n" % (self.CleanName(typename), srcScadeMacro, destVar)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromSCADEtoASN1SCC", cleanName, "asn1Scc" + cleanName, node, leafTypeDict, names)
+
 
 # pylint: disable=no-self-use
 class FromASN1SCCtoSCADE(RecursiveMapper):
@@ -232,6 +241,14 @@ class FromASN1SCCtoSCADE(RecursiveMapper):
     def MapSetOf(self, srcVar: str, dstScadeMacro: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return self.MapSequenceOf(srcVar, dstScadeMacro, node, leafTypeDict, names)  # pragma: nocover
 
+    def OutlinedCall(self, srcVar: str, dstScadeMacro: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromASN1SCCtoSCADE(&%s, &%s);\n" % (self.CleanName(typename), srcVar, dstScadeMacro)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromASN1SCCtoSCADE", "asn1Scc" + cleanName, cleanName, node, leafTypeDict, names)
+
 
 # noinspection PyListCreation
 # pylint: disable=no-self-use
@@ -314,6 +331,14 @@ class FromSCADEtoOSS(RecursiveMapper):
     def MapSetOf(self, srcScadeMacro: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return self.MapSequenceOf(srcScadeMacro, destVar, node, leafTypeDict, names)  # pragma: nocover
 
+    def OutlinedCall(self, srcScadeMacro: str, destVar: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromSCADEtoOSS(&%s, &%s);\n" % (self.CleanName(typename), srcScadeMacro, destVar)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromSCADEtoOSS", cleanName, "OSS_" + cleanName, node, leafTypeDict, names)
+
 
 # noinspection PyListCreation
 # pylint: disable=no-self-use
@@ -408,22 +433,44 @@ class FromOSStoSCADE(RecursiveMapper):
     def MapSetOf(self, srcVar: str, dstScadeMacro: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
         return self.MapSequenceOf(srcVar, dstScadeMacro, node, leafTypeDict, names)  # pragma: nocover
 
+    def OutlinedCall(self, srcVar: str, dstScadeMacro: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromOSStoSCADE(&%s, &%s);\n" % (self.CleanName(typename), srcVar, dstScadeMacro)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromOSStoSCADE", "OSS_" + cleanName, cleanName, node, leafTypeDict, names)
+
 
 class ScadeGlueGenerator(SynchronousToolGlueGenerator):
+    def __init__(self) -> None:
+        super().__init__()
+        # When outlining, the same mappers are used for all the parameters, so
+        # that the outlined conversion routines are only emitted once per file
+        # (otherwise each parameter gets new ones, whose loop indexes start at 1)
+        self._fromSCADEtoASN1SCC = FromSCADEtoASN1SCC()
+        self._fromSCADEtoOSS = FromSCADEtoOSS()
+        self._fromASN1SCCtoSCADE = FromASN1SCCtoSCADE()
+        self._fromOSStoSCADE = FromOSStoSCADE()
+        if configMT.outlineMappers:
+            for mapper in [self._fromSCADEtoASN1SCC, self._fromSCADEtoOSS,
+                           self._fromASN1SCCtoSCADE, self._fromOSStoSCADE]:
+                mapper.EnableOutlining()
+
     def Version(self) -> None:
         print("Code generator: " + "$Id: scade6_B_mapper.py 2390 2012-07-19 12:39:17Z ttsiodras $")  # pragma: no cover
 
     def FromToolToASN1SCC(self) -> RecursiveMapper:
-        return FromSCADEtoASN1SCC()
+        return self._fromSCADEtoASN1SCC if configMT.outlineMappers else FromSCADEtoASN1SCC()
 
     def FromToolToOSS(self) -> RecursiveMapper:
-        return FromSCADEtoOSS()
+        return self._fromSCADEtoOSS if configMT.outlineMappers else FromSCADEtoOSS()
 
     def FromASN1SCCtoTool(self) -> RecursiveMapper:
-        return FromASN1SCCtoSCADE()
+        return self._fromASN1SCCtoSCADE if configMT.outlineMappers else FromASN1SCCtoSCADE()
 
     def FromOSStoTool(self) -> RecursiveMapper:
-        return FromOSStoSCADE()
+        return self._fromOSStoSCADE if configMT.outlineMappers else FromOSStoSCADE()
 
     def HeadersOnStartup(self, unused_modelingLanguage: str, unused_asnFile: str, subProgram: ApLevelContainer, unused_subProgramImplementation: str, unused_outputDir: str, maybeFVname: str) -> None:
         if self.useOSS:
@@ -37,6 +37,7 @@ stubs (to allow calling from the VM side) are also generated.
 
 from typing import List
 
+from ..commonPy import configMT
 from ..commonPy.utility import panicWithCallStack
 from ..commonPy.asnAST import (
     AsnInt, AsnReal, AsnBool, AsnEnumerated, isSequenceVariable, sourceSequenceLimit,
@@ -44,7 +45,7 @@ from ..commonPy.asnAST import (
 from ..commonPy.aadlAST import AadlPort, AadlParameter, ApLevelContainer, Param
 from ..commonPy.asnParser import AST_Lookup, AST_Leaftypes
 
-from ..commonPy.recursiveMapper import RecursiveMapper
+from ..commonPy.recursiveMapper import RecursiveMapper, Emitter, OutlinedCRoutine
 from .synchronousTool import SynchronousToolGlueGenerator
 
 isAsynchronous = False
@@ -59,348 +60,369 @@ def IsElementMappedToPrimitive(node: AsnSequenceOrSetOf, names: AST_Lookup) -> b
 
 
 # pylint: disable=no-self-use
+# pylint: disable=arguments-renamed
 class FromSimulinkToASN1SCC(RecursiveMapper):
-    def MapInteger(self, srcSimulink: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = (asn1SccSint) %s;\n" % (destVar, srcSimulink)]
+    def EmitInteger(self, emitter: Emitter, srcSimulink: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = (asn1SccSint) %s;\n" % (destVar, srcSimulink))
 
-    def MapReal(self, srcSimulink: str, destVar: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = (double) %s;\n" % (destVar, srcSimulink)]
+    def EmitReal(self, emitter: Emitter, srcSimulink: str, destVar: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = (double) %s;\n" % (destVar, srcSimulink))
 
-    def MapBoolean(self, srcSimulink: str, destVar: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = (asn1SccUint) %s;\n" % (destVar, srcSimulink)]
+    def EmitBoolean(self, emitter: Emitter, srcSimulink: str, destVar: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = (asn1SccUint) %s;\n" % (destVar, srcSimulink))
 
-    def MapOctetString(self, srcSimulink: str, destVar: str, node: AsnOctetString, _: AST_Leaftypes, __: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitOctetString(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnOctetString, _: AST_Leaftypes, __: AST_Lookup) -> None:
         if not node._range:
             panicWithCallStack("OCTET STRING (in %s) must have a SIZE constraint inside ASN.1,\nor else we can't generate C code!" % node.Location())  # pragma: no cover
         for i in range(0, node._range[-1]):
-            lines.append("%s.arr[%d] = %s.element_data[%d];\n" % (destVar, i, srcSimulink, i))
+            emitter.Line("%s.arr[%d] = %s.element_data[%d];\n" % (destVar, i, srcSimulink, i))
         if isSequenceVariable(node):
-            lines.append("%s.nCount = %s.length;\n" % (destVar, srcSimulink))
+            emitter.Line("%s.nCount = %s.length;\n" % (destVar, srcSimulink))
         # No nCount anymore
         # else:
-        #     lines.append("%s.nCount = %s;\n" % (destVar, node._range[-1]))
-        return lines
+        #     emitter.Line("%s.nCount = %s;\n" % (destVar, node._range[-1]))
 
-    def MapEnumerated(self, srcSimulink: str, destVar: str, _: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (destVar, srcSimulink)]
+    def EmitEnumerated(self, emitter: Emitter, srcSimulink: str, destVar: str, _: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (destVar, srcSimulink))
 
-    def MapSequence(self, srcSimulink: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitSequence(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         for child in node._members:
-            lines.extend(
-                self.Map(
-                    "%s.%s" % (srcSimulink, self.CleanName(child[0])),
-                    destVar + "." + self.CleanName(child[0]),
-                    child[1],
-                    leafTypeDict,
-                    names))
-        return lines
+            self.Emit(
+                emitter,
+                "%s.%s" % (srcSimulink, self.CleanName(child[0])),
+                destVar + "." + self.CleanName(child[0]),
+                child[1],
+                leafTypeDict,
+                names)
 
-    def MapSet(self, srcSimulink: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequence(srcSimulink, destVar, node, leafTypeDict, names)  # pragma: nocover
+    def EmitSet(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequence(emitter, srcSimulink, destVar, node, leafTypeDict, names)  # pragma: nocover
 
-    def MapChoice(self, srcSimulink: str, destVar: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitChoice(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         childNo = 0
         for child in node._members:
             childNo += 1
-            lines.append("%sif (%s.choiceIdx == %d) {\n" % (self.maybeElse(childNo), srcSimulink, childNo))
-            lines.extend(
-                ['    ' + x
-                 for x in self.Map(
-                     "%s.%s" % (srcSimulink, self.CleanName(child[0])),
-                     destVar + ".u." + self.CleanName(child[0]),
-                     child[1],
-                     leafTypeDict,
-                     names)])
-            lines.append("    %s.kind = %s;\n" % (destVar, self.CleanName(child[2])))
-            lines.append("}\n")
-        return lines
-
-    def MapSequenceOf(self, srcSimulink: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+            emitter.Line("%sif (%s.choiceIdx == %d) {\n" % (self.maybeElse(childNo), srcSimulink, childNo))
+            with emitter.Indented():
+                self.Emit(
+                    emitter,
+                    "%s.%s" % (srcSimulink, self.CleanName(child[0])),
+                    destVar + ".u." + self.CleanName(child[0]),
+                    child[1],
+                    leafTypeDict,
+                    names)
+            emitter.Line("    %s.kind = %s;\n" % (destVar, self.CleanName(child[2])))
+            emitter.Line("}\n")
+
+    def EmitSequenceOf(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         if not node._range:
             panicWithCallStack("need a SIZE constraint or else we can't generate C code (%s)!\n" % node.Location())  # pragma: no cover
         isMappedToPrimitive = IsElementMappedToPrimitive(node, names)
-        lines = []  # type: List[str]
         for i in range(0, node._range[-1]):
-            lines.extend(
-                self.Map(("%s.element_data[%d]" % (srcSimulink, i)) if isMappedToPrimitive else ("%s.element_%02d" % (srcSimulink, i)),
-                         destVar + ".arr[%d]" % i,
-                         node._containedType,
-                         leafTypeDict,
-                         names))
+            self.Emit(
+                emitter,
+                ("%s.element_data[%d]" % (srcSimulink, i)) if isMappedToPrimitive else ("%s.element_%02d" % (srcSimulink, i)),
+                destVar + ".arr[%d]" % i,
+                node._containedType,
+                leafTypeDict,
+                names)
         if isSequenceVariable(node):
-            lines.append("%s.nCount = %s.length;\n" % (destVar, srcSimulink))
+            emitter.Line("%s.nCount = %s.length;\n" % (destVar, srcSimulink))
         # No nCount anymore
         # else:
-        #     lines.append("%s.nCount = %s;\n" % (destVar, node._range[-1]))
-        return lines
+        #     emitter.Line("%s.nCount = %s;\n" % (destVar, node._range[-1]))
+
+    def EmitSetOf(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequenceOf(emitter, srcSimulink, destVar, node, leafTypeDict, names)  # pragma: nocover
+
+    def OutlinedCall(self, srcSimulink: str, destVar: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromSimulinkToASN1SCC(&%s, &%s);\n" % (self.CleanName(typename), srcSimulink, destVar)]
 
-    def MapSetOf(self, srcSimulink: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequenceOf(srcSimulink, destVar, node, leafTypeDict, names)  # pragma: nocover
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromSimulinkToASN1SCC", cleanName, "asn1Scc" + cleanName, node, leafTypeDict, names)
 
 
 # pylint: disable=no-self-use
+# pylint: disable=arguments-renamed
 class FromASN1SCCtoSimulink(RecursiveMapper):
-    def MapInteger(self, srcVar: str, dstSimulink: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (dstSimulink, srcVar)]
+    def EmitInteger(self, emitter: Emitter, srcVar: str, dstSimulink: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (dstSimulink, srcVar))
 
-    def MapReal(self, srcVar: str, dstSimulink: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (dstSimulink, srcVar)]
+    def EmitReal(self, emitter: Emitter, srcVar: str, dstSimulink: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (dstSimulink, srcVar))
 
-    def MapBoolean(self, srcVar: str, dstSimulink: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (dstSimulink, srcVar)]
+    def EmitBoolean(self, emitter: Emitter, srcVar: str, dstSimulink: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (dstSimulink, srcVar))
 
-    def MapOctetString(self, srcVar: str, dstSimulink: str, node: AsnOctetString, _: AST_Leaftypes, __: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+    def EmitOctetString(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnOctetString, _: AST_Leaftypes, __: AST_Lookup) -> None:
         if not node._range:
             panicWithCallStack("OCTET STRING (in %s) must have a SIZE constraint inside ASN.1,\nor else we can't generate C code!" % node.Location())  # pragma: no cover
 
-        lines = []  # type: List[str]
         limit = sourceSequenceLimit(node, srcVar)
-        lines.append("unsigned int i=0;\n")
-        lines.append("for(i=0; i<%s; i++)\n        %s.element_data[i] = %s.arr[i];\n" % (limit, dstSimulink, srcVar))
+        emitter.Line("unsigned int i=0;\n")
+        emitter.Line("for(i=0; i<%s; i++)\n        %s.element_data[i] = %s.arr[i];\n" % (limit, dstSimulink, srcVar))
 
         if len(node._range) > 1 and node._range[0] != node._range[1]:
-            lines.append("%s.length = %s;\n" % (dstSimulink, limit))
-        return lines
+            emitter.Line("%s.length = %s;\n" % (dstSimulink, limit))
 
-    def MapEnumerated(self, srcVar: str, dstSimulink: str, node: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+    def EmitEnumerated(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> None:
         if None in [x[1] for x in node._members]:
             panicWithCallStack("an ENUMERATED must have integer values! (%s)" % node.Location())  # pragma: no cover
-        return ["%s = %s;\n" % (dstSimulink, srcVar)]
+        emitter.Line("%s = %s;\n" % (dstSimulink, srcVar))
 
-    def MapSequence(self, srcVar: str, dstSimulink: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitSequence(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         for child in node._members:
-            lines.extend(
-                self.Map(
-                    srcVar + "." + self.CleanName(child[0]),
-                    "%s.%s" % (dstSimulink, self.CleanName(child[0])),
-                    child[1],
-                    leafTypeDict,
-                    names))
-        return lines
+            self.Emit(
+                emitter,
+                srcVar + "." + self.CleanName(child[0]),
+                "%s.%s" % (dstSimulink, self.CleanName(child[0])),
+                child[1],
+                leafTypeDict,
+                names)
 
-    def MapSet(self, srcVar: str, dstSimulink: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequence(srcVar, dstSimulink, node, leafTypeDict, names)  # pragma: nocover
+    def EmitSet(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequence(emitter, srcVar, dstSimulink, node, leafTypeDict, names)  # pragma: nocover
 
-    def MapChoice(self, srcVar: str, dstSimulink: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitChoice(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         childNo = 0
         for child in node._members:
             childNo += 1
-            lines.append("%sif (%s.kind == %s) {\n" % (self.maybeElse(childNo), srcVar, self.CleanName(child[2])))
-            lines.extend(
-                ['    ' + x
-                 for x in self.Map(
-                     srcVar + ".u." + self.CleanName(child[0]),
-                     "%s.%s" % (dstSimulink, self.CleanName(child[0])),
-                     child[1],
-                     leafTypeDict,
-                     names)])
-            lines.append("    %s.choiceIdx = %d;\n" % (dstSimulink, childNo))
-            lines.append("}\n")
-        return lines
-
-    def MapSequenceOf(self, srcVar: str, dstSimulink: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+            emitter.Line("%sif (%s.kind == %s) {\n" % (self.maybeElse(childNo), srcVar, self.CleanName(child[2])))
+            with emitter.Indented():
+                self.Emit(
+                    emitter,
+                    srcVar + ".u." + self.CleanName(child[0]),
+                    "%s.%s" % (dstSimulink, self.CleanName(child[0])),
+                    child[1],
+                    leafTypeDict,
+                    names)
+            emitter.Line("    %s.choiceIdx = %d;\n" % (dstSimulink, childNo))
+            emitter.Line("}\n")
+
+    def EmitSequenceOf(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         if not node._range:
             panicWithCallStack("need a SIZE constraint or else we can't generate C code (%s)!\n" % node.Location())  # pragma: no cover
         isMappedToPrimitive = IsElementMappedToPrimitive(node, names)
-        lines = []  # type: List[str]
         for i in range(0, node._range[-1]):
-            lines.extend(self.Map(
+            self.Emit(
+                emitter,
                 srcVar + ".arr[%d]" % i,
                 ("%s.element_data[%d]" % (dstSimulink, i)) if isMappedToPrimitive else ("%s.element_%02d" % (dstSimulink, i)),
                 node._containedType,
                 leafTypeDict,
-                names))
+                names)
         if isSequenceVariable(node):
-            lines.append("%s.length = %s.nCount;\n" % (dstSimulink, srcVar))
-        return lines
+            emitter.Line("%s.length = %s.nCount;\n" % (dstSimulink, srcVar))
+
+    def EmitSetOf(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequenceOf(emitter, srcVar, dstSimulink, node, leafTypeDict, names)  # pragma: nocover
 
-    def MapSetOf(self, srcVar: str, dstSimulink: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequenceOf(srcVar, dstSimulink, node, leafTypeDict, names)  # pragma: nocover
+    def OutlinedCall(self, srcVar: str, dstSimulink: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromASN1SCCtoSimulink(&%s, &%s);\n" % (self.CleanName(typename), srcVar, dstSimulink)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromASN1SCCtoSimulink", "asn1Scc" + cleanName, cleanName, node, leafTypeDict, names)
 
 
 # pylint: disable=no-self-use
+# pylint: disable=arguments-renamed
 class FromSimulinkToOSS(RecursiveMapper):
-    def MapInteger(self, srcSimulink: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (destVar, srcSimulink)]
+    def EmitInteger(self, emitter: Emitter, srcSimulink: str, destVar: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (destVar, srcSimulink))
 
-    def MapReal(self, srcSimulink: str, destVar: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (destVar, srcSimulink)]
+    def EmitReal(self, emitter: Emitter, srcSimulink: str, destVar: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (destVar, srcSimulink))
 
-    def MapBoolean(self, srcSimulink: str, destVar: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = (char) %s;\n" % (destVar, srcSimulink)]
+    def EmitBoolean(self, emitter: Emitter, srcSimulink: str, destVar: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = (char) %s;\n" % (destVar, srcSimulink))
 
-    def MapOctetString(self, srcSimulink: str, destVar: str, node: AsnOctetString, _: AST_Leaftypes, __: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitOctetString(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnOctetString, _: AST_Leaftypes, __: AST_Lookup) -> None:
         if not node._range:
             panicWithCallStack("OCTET STRING (in %s) must have a SIZE constraint inside ASN.1,\nor else we can't generate C code!" % node.Location())  # pragma: no cover
         for i in range(0, node._range[-1]):
-            lines.append("%s.value[%d] = %s.element_data[%d];\n" % (destVar, i, srcSimulink, i))
+            emitter.Line("%s.value[%d] = %s.element_data[%d];\n" % (destVar, i, srcSimulink, i))
         if len(node._range) > 1 and node._range[0] != node._range[1]:
-            lines.append("%s.length = %s.length;\n" % (destVar, srcSimulink))
+            emitter.Line("%s.length = %s.length;\n" % (destVar, srcSimulink))
         else:
-            lines.append("%s.length = %s;\n" % (destVar, node._range[-1]))
-        return lines
+            emitter.Line("%s.length = %s;\n" % (destVar, node._range[-1]))
 
-    def MapEnumerated(self, srcSimulink: str, destVar: str, _: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (destVar, srcSimulink)]
+    def EmitEnumerated(self, emitter: Emitter, srcSimulink: str, destVar: str, _: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (destVar, srcSimulink))
 
-    def MapSequence(self, srcSimulink: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitSequence(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         for child in node._members:
-            lines.extend(
-                self.Map(
-                    "%s.%s" % (srcSimulink, self.CleanName(child[0])),
-                    destVar + "." + self.CleanName(child[0]),
-                    child[1],
-                    leafTypeDict,
-                    names))
-        return lines
+            self.Emit(
+                emitter,
+                "%s.%s" % (srcSimulink, self.CleanName(child[0])),
+                destVar + "." + self.CleanName(child[0]),
+                child[1],
+                leafTypeDict,
+                names)
 
-    def MapSet(self, srcSimulink: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequence(srcSimulink, destVar, node, leafTypeDict, names)  # pragma: nocover
+    def EmitSet(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequence(emitter, srcSimulink, destVar, node, leafTypeDict, names)  # pragma: nocover
 
-    def MapChoice(self, srcSimulink: str, destVar: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitChoice(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         childNo = 0
         for child in node._members:
             childNo += 1
-            lines.append("%sif (%s.choiceIdx == %d) {\n" % (self.maybeElse(childNo), srcSimulink, childNo))
-            lines.extend(
-                ['    ' + x
-                 for x in self.Map(
-                     "%s.%s" % (srcSimulink, self.CleanName(child[0])),
-                     destVar + ".u." + self.CleanName(child[0]),
-                     child[1],
-                     leafTypeDict,
-                     names)])
-            lines.append("    %s.choice = OSS_%s_chosen;\n" % (destVar, self.CleanName(child[0])))
-            lines.append("}\n")
-        return lines
-
-    def MapSequenceOf(self, srcSimulink: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+            emitter.Line("%sif (%s.choiceIdx == %d) {\n" % (self.maybeElse(childNo), srcSimulink, childNo))
+            with emitter.Indented():
+                self.Emit(
+                    emitter,
+                    "%s.%s" % (srcSimulink, self.CleanName(child[0])),
+                    destVar + ".u." + self.CleanName(child[0]),
+                    child[1],
+                    leafTypeDict,
+                    names)
+            emitter.Line("    %s.choice = OSS_%s_chosen;\n" % (destVar, self.CleanName(child[0])))
+            emitter.Line("}\n")
+
+    def EmitSequenceOf(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         if not node._range:
             panicWithCallStack("(%s) needs a SIZE constraint or else we can't generate C code!\n" % node.Location())  # pragma: no cover
         isMappedToPrimitive = IsElementMappedToPrimitive(node, names)
-        lines = []  # type: List[str]
         for i in range(0, node._range[-1]):
-            lines.extend(
-                self.Map(("%s.element_data[%d]" % (srcSimulink, i)) if isMappedToPrimitive else ("%s.element_%02d" % (srcSimulink, i)),
-                         destVar + ".value[%d]" % i,
-                         node._containedType,
-                         leafTypeDict,
-                         names))
+            self.Emit(
+                emitter,
+                ("%s.element_data[%d]" % (srcSimulink, i)) if isMappedToPrimitive else ("%s.element_%02d" % (srcSimulink, i)),
+                destVar + ".value[%d]" % i,
+                node._containedType,
+                leafTypeDict,
+                names)
         if len(node._range) > 1 and node._range[0] != node._range[1]:
-            lines.append("%s.count = %s.length;\n" % (destVar, srcSimulink))
+            emitter.Line("%s.count = %s.length;\n" % (destVar, srcSimulink))
         else:
-            lines.append("%s.count = %s;\n" % (destVar, node._range[-1]))
-        return lines
+            emitter.Line("%s.count = %s;\n" % (destVar, node._range[-1]))
+
+    def EmitSetOf(self, emitter: Emitter, srcSimulink: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequenceOf(emitter, srcSimulink, destVar, node, leafTypeDict, names)  # pragma: nocover
+
+    def OutlinedCall(self, srcSimulink: str, destVar: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromSimulinkToOSS(&%s, &%s);\n" % (self.CleanName(typename), srcSimulink, destVar)]
 
-    def MapSetOf(self, srcSimulink: str, destVar: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequenceOf(srcSimulink, destVar, node, leafTypeDict, names)  # pragma: nocover
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromSimulinkToOSS", cleanName, "OSS_" + cleanName, node, leafTypeDict, names)
 
 
 # pylint: disable=no-self-use
+# pylint: disable=arguments-renamed
 class FromOSStoSimulink(RecursiveMapper):
-    def MapInteger(self, srcVar: str, dstSimulink: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (dstSimulink, srcVar)]
+    def EmitInteger(self, emitter: Emitter, srcVar: str, dstSimulink: str, _: AsnInt, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (dstSimulink, srcVar))
 
-    def MapReal(self, srcVar: str, dstSimulink: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (dstSimulink, srcVar)]
+    def EmitReal(self, emitter: Emitter, srcVar: str, dstSimulink: str, _: AsnReal, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (dstSimulink, srcVar))
 
-    def MapBoolean(self, srcVar: str, dstSimulink: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return ["%s = %s;\n" % (dstSimulink, srcVar)]
+    def EmitBoolean(self, emitter: Emitter, srcVar: str, dstSimulink: str, _: AsnBool, __: AST_Leaftypes, ___: AST_Lookup) -> None:
+        emitter.Line("%s = %s;\n" % (dstSimulink, srcVar))
 
-    def MapOctetString(self, srcVar: str, dstSimulink: str, node: AsnOctetString, _: AST_Leaftypes, __: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+    def EmitOctetString(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnOctetString, _: AST_Leaftypes, __: AST_Lookup) -> None:
         if not node._range:
             panicWithCallStack("OCTET STRING (in %s) must have a SIZE constraint inside ASN.1,\nor else we can't generate C code!" % node.Location())  # pragma: no cover
-        lines = []  # type: List[str]
         for i in range(0, node._range[-1]):
-            lines.append("if (%s.length >= %d) %s.element_data[%d] = %s.value[%d]; else %s.element_data[%d] = 0;\n" %
+            emitter.Line("if (%s.length >= %d) %s.element_data[%d] = %s.value[%d]; else %s.element_data[%d] = 0;\n" %
                          (srcVar, i + 1, dstSimulink, i, srcVar, i, dstSimulink, i))
         if len(node._range) > 1 and node._range[0] != node._range[1]:
-            lines.append("%s.length = %s.length;" % (dstSimulink, srcVar))
-        return lines
+            emitter.Line("%s.length = %s.length;" % (dstSimulink, srcVar))
 
-    def MapEnumerated(self, srcVar: str, dstSimulink: str, node: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+    def EmitEnumerated(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnEnumerated, __: AST_Leaftypes, ___: AST_Lookup) -> None:
         if None in [x[1] for x in node._members]:
             panicWithCallStack("an ENUMERATED must have integer values! (%s)" % node.Location())  # pragma: no cover
-        return ["%s = %s;\n" % (dstSimulink, srcVar)]
+        emitter.Line("%s = %s;\n" % (dstSimulink, srcVar))
 
-    def MapSequence(self, srcVar: str, dstSimulink: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitSequence(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         for child in node._members:
-            lines.extend(
-                self.Map(
-                    srcVar + "." + self.CleanName(child[0]),
-                    "%s.%s" % (dstSimulink, self.CleanName(child[0])),
-                    child[1],
-                    leafTypeDict,
-                    names))
-        return lines
+            self.Emit(
+                emitter,
+                srcVar + "." + self.CleanName(child[0]),
+                "%s.%s" % (dstSimulink, self.CleanName(child[0])),
+                child[1],
+                leafTypeDict,
+                names)
 
-    def MapSet(self, srcVar: str, dstSimulink: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequence(srcVar, dstSimulink, node, leafTypeDict, names)  # pragma: nocover
+    def EmitSet(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnSequenceOrSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequence(emitter, srcVar, dstSimulink, node, leafTypeDict, names)  # pragma: nocover
 
-    def MapChoice(self, srcVar: str, dstSimulink: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        lines = []  # type: List[str]
+    def EmitChoice(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         childNo = 0
         for child in node._members:
             childNo += 1
-            lines.append("%sif (%s.choice == OSS_%s_chosen) {\n" % (self.maybeElse(childNo), srcVar, self.CleanName(child[0])))
-            lines.extend(
-                ['    ' + x
-                 for x in self.Map(
-                     srcVar + ".u." + self.CleanName(child[0]),
-                     "%s.%s" % (dstSimulink, self.CleanName(child[0])),
-                     child[1],
-                     leafTypeDict,
-                     names)])
-            lines.append("    %s.choiceIdx = %d;\n" % (dstSimulink, childNo))
-            lines.append("}\n")
-        return lines
-
-    def MapSequenceOf(self, srcVar: str, dstSimulink: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+            emitter.Line("%sif (%s.choice == OSS_%s_chosen) {\n" % (self.maybeElse(childNo), srcVar, self.CleanName(child[0])))
+            with emitter.Indented():
+                self.Emit(
+                    emitter,
+                    srcVar + ".u." + self.CleanName(child[0]),
+                    "%s.%s" % (dstSimulink, self.CleanName(child[0])),
+                    child[1],
+                    leafTypeDict,
+                    names)
+            emitter.Line("    %s.choiceIdx = %d;\n" % (dstSimulink, childNo))
+            emitter.Line("}\n")
+
+    def EmitSequenceOf(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
         if not node._range:
             panicWithCallStack("(%s) needs a SIZE constraint or else we can't generate C code!\n" % node.Location())  # pragma: no cover
         isMappedToPrimitive = IsElementMappedToPrimitive(node, names)
-        lines = []  # type: List[str]
         for i in range(0, node._range[-1]):
-            lines.extend(self.Map(
+            self.Emit(
+                emitter,
                 srcVar + ".value[%d]" % i,
                 ("%s.element_data[%d]" % (dstSimulink, i)) if isMappedToPrimitive else ("%s.element_%02d" % (dstSimulink, i)),
                 node._containedType,
                 leafTypeDict,
-                names))
+                names)
         if len(node._range) > 1 and node._range[0] != node._range[1]:
-            lines.append("%s.length = %s.count;\n" % (dstSimulink, srcVar))
-        return lines
+            emitter.Line("%s.length = %s.count;\n" % (dstSimulink, srcVar))
+
+    def EmitSetOf(self, emitter: Emitter, srcVar: str, dstSimulink: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        self.EmitSequenceOf(emitter, srcVar, dstSimulink, node, leafTypeDict, names)  # pragma: nocover
 
-    def MapSetOf(self, srcVar: str, dstSimulink: str, node: AsnSequenceOrSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
-        return self.MapSequenceOf(srcVar, dstSimulink, node, leafTypeDict, names)  # pragma: nocover
+    def OutlinedCall(self, srcVar: str, dstSimulink: str, typename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return ["Convert_%s_FromOSStoSimulink(&%s, &%s);\n" % (self.CleanName(typename), srcVar, dstSimulink)]
+
+    def OutlinedRoutine(self, typename: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        cleanName = self.CleanName(typename)
+        return OutlinedCRoutine(
+            self, "Convert_" + cleanName + "_FromOSStoSimulink", "OSS_" + cleanName, cleanName, node, leafTypeDict, names)
 
 
 class SimulinkGlueGenerator(SynchronousToolGlueGenerator):
     g_FVname = None  # type: str
 
+    def __init__(self) -> None:
+        super().__init__()
+        # The same mappers are used for all the parameters, so that the
+        # outlined conversion routines are only emitted once per file.
+        self._fromSimulinkToASN1SCC = FromSimulinkToASN1SCC()
+        self._fromSimulinkToOSS = FromSimulinkToOSS()
+        self._fromASN1SCCtoSimulink = FromASN1SCCtoSimulink()
+        self._fromOSStoSimulink = FromOSStoSimulink()
+        if configMT.outlineMappers:
+            for mapper in [self._fromSimulinkToASN1SCC, self._fromSimulinkToOSS,
+                           self._fromASN1SCCtoSimulink, self._fromOSStoSimulink]:
+                mapper.EnableOutlining()
+
     def Version(self) -> None:
         print("Code generator: " + "$Id: simulink_B_mapper.py 2390 2012-07-19 12:39:17Z ttsiodras $")  # pragma: no cover
 
     def FromToolToASN1SCC(self) -> RecursiveMapper:
-        return FromSimulinkToASN1SCC()
+        return self._fromSimulinkToASN1SCC
 
     def FromToolToOSS(self) -> RecursiveMapper:
-        return FromSimulinkToOSS()
+        return self._fromSimulinkToOSS
 
     def FromASN1SCCtoTool(self) -> RecursiveMapper:
-        return FromASN1SCCtoSimulink()
+        return self._fromASN1SCCtoSimulink
 
     def FromOSStoTool(self) -> RecursiveMapper:
-        return FromOSStoSimulink()
+        return self._fromOSStoSimulink
 
     def HeadersOnStartup(self, unused_modelingLanguage: str, unused_asnFile: str, subProgram: ApLevelContainer, unused_subProgramImplementation: str, unused_outputDir: str, unused_maybeFVname: str) -> None:
         if self.useOSS:
@@ -26,9 +26,10 @@ import os
 
 from typing import IO, Any, Generic, TypeVar  # NOQA pylint: disable=unused-import
 
+from ..commonPy import outputFiles
 from ..commonPy.utility import panic, inform, panicWithCallStack
 from ..commonPy.aadlAST import InParam, OutParam, InOutParam, ApLevelContainer, Param
-from ..commonPy.recursiveMapper import RecursiveMapperGeneric
+from ..commonPy.recursiveMapper import RecursiveMapperGeneric, Emitter
 from ..commonPy.asnAST import AsnNode
 from ..commonPy.asnParser import AST_Lookup, AST_Leaftypes
 
@@ -115,10 +116,10 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
             outputADAheaderFilename = outputADAheaderFilename.lower()
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputADAheaderFilename)
-            self.ADA_HeaderFile = open(outputDir + outputADAheaderFilename, 'w')
+            self.ADA_HeaderFile = outputFiles.Open(outputDir + outputADAheaderFilename, 'w')
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputADAsourceFilename)
-            self.ADA_SourceFile = open(outputDir + outputADAsourceFilename, 'w')
+            self.ADA_SourceFile = outputFiles.Open(outputDir + outputADAsourceFilename, 'w')
 
             self.asn_name = os.path.basename(os.path.splitext(asnFile)[0])
 
@@ -150,16 +151,16 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
             outputADAheaderFilename = outputADAheaderFilename.lower()
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputCheaderFilename)
-            self.C_HeaderFile = open(outputDir + outputCheaderFilename, 'w')
+            self.C_HeaderFile = outputFiles.Open(outputDir + outputCheaderFilename, 'w')
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputCsourceFilename)
-            self.C_SourceFile = open(outputDir + outputCsourceFilename, 'w')
+            self.C_SourceFile = outputFiles.Open(outputDir + outputCsourceFilename, 'w')
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputADAheaderFilename)
-            self.ADA_HeaderFile = open(outputDir + outputADAheaderFilename, 'w')
+            self.ADA_HeaderFile = outputFiles.Open(outputDir + outputADAheaderFilename, 'w')
 
             inform(str(self.__class__) + ": Creating file '%s'...", outputADAsourceFilename)
-            self.ADA_SourceFile = open(outputDir + outputADAsourceFilename, 'w')
+            self.ADA_SourceFile = outputFiles.Open(outputDir + outputADAsourceFilename, 'w')
 
             self.asn_name = os.path.basename(os.path.splitext(asnFile)[0])
 
@@ -241,6 +242,23 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
             self.ADA_SourceFile.write(
                 "    end Ada_%s;\n\n" % tmpSpName)
         else:
+            if self.useOSS and encoding.lower() == "uper":
+                toolToAsn1 = self.FromToolToOSS()  # pylint: disable=assignment-from-no-return
+            else:
+                toolToAsn1 = self.FromToolToASN1SCC()  # pylint: disable=assignment-from-no-return
+            emitter = Emitter()
+            if toolToAsn1:
+                with emitter.Indented():
+                    toolToAsn1.Emit(
+                        emitter,
+                        srcVar,
+                        "var_" + self.CleanNameAsToolWants(nodeTypename),
+                        node,
+                        leafTypeDict,
+                        names)
+                # The outlined conversion routines must precede their callers
+                self.C_SourceFile.write("".join(toolToAsn1.OutlinedRoutines(leafTypeDict, names)))
+
             self.C_HeaderFile.write(
                 "int %s(void *pBuffer, size_t iMaxBufferSize);\n" % tmpSpName)
             self.ADA_HeaderFile.write(
@@ -278,19 +296,7 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
                     self.C_SourceFile.write("    BitStream_Init(&strm, pBuffer, iMaxBufferSize);\n")
 
             # Write the mapping code for the message
-            if self.useOSS and encoding.lower() == "uper":
-                toolToAsn1 = self.FromToolToOSS()  # pylint: disable=assignment-from-no-return
-            else:
-                toolToAsn1 = self.FromToolToASN1SCC()  # pylint: disable=assignment-from-no-return
-            lines = toolToAsn1.Map(
-                srcVar,
-                "var_" + self.CleanNameAsToolWants(nodeTypename),
-                node,
-                leafTypeDict,
-                names) if toolToAsn1 else []
-
-            lines = ["    " + x for x in lines]
-            self.C_SourceFile.write("".join(lines))
+            emitter.WriteTo(self.C_SourceFile)
 
             if self.useOSS and encoding.lower() == "uper":
                 # setup the OSS encoder
@@ -377,6 +383,25 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
                 panic(str(self.__class__) + ": in (%s), encoding can be one of %s (not '%s')" %  # pragma: no cover
                       (subProgram._id + "." + subProgramImplementation, self.supportedEncodings, encoding))  # pragma: no cover
 
+            if self.useOSS and encoding.lower() == "uper":
+                asn1ToTool = self.FromOSStoTool()  # pylint: disable=assignment-from-no-return
+                asn1Var = "(*pVar_" + self.CleanNameAsToolWants(nodeTypename) + ")"
+            else:
+                asn1ToTool = self.FromASN1SCCtoTool()  # pylint: disable=assignment-from-no-return
+                asn1Var = "var_" + self.CleanNameAsToolWants(nodeTypename)
+            emitter = Emitter()
+            if asn1ToTool:
+                with emitter.Indented("        "):
+                    asn1ToTool.Emit(
+                        emitter,
+                        asn1Var,
+                        targetVar,
+                        node,
+                        leafTypeDict,
+                        names)
+                # The outlined conversion routines must precede their callers
+                self.C_SourceFile.write("".join(asn1ToTool.OutlinedRoutines(leafTypeDict, names)))
+
             self.C_HeaderFile.write(
                 "int %s(void *pBuffer, size_t iBufferSize);\n" % tmpSpName)
 
@@ -424,24 +449,7 @@ class SynchronousToolGlueGeneratorGeneric(Generic[TSource, TDestin]):
                                             (self.CleanNameAsToolWants(nodeTypename),
                                              self.CleanNameAsToolWants(nodeTypename)))
 
-            if self.useOSS and encoding.lower() == "uper":
-                asn1ToTool = self.FromOSStoTool()  # pylint: disable=assignment-from-no-return
-                lines = asn1ToTool.Map(
-                    "(*pVar_" + self.CleanNameAsToolWants(nodeTypename) + ")",
-                    targetVar,
-                    node,
-                    leafTypeDict,
-                    names) if asn1ToTool else []
-            else:
-                asn1ToTool = self.FromASN1SCCtoTool()  # pylint: disable=assignment-from-no-return
-                lines = asn1ToTool.Map(
-                    "var_" + self.CleanNameAsToolWants(nodeTypename),
-                    targetVar,
-                    node,
-                    leafTypeDict,
-                    names) if asn1ToTool else []
-            lines = ["        " + x for x in lines]
-            self.C_SourceFile.write("".join(lines))
+            emitter.WriteTo(self.C_SourceFile)
 
             if self.useOSS and encoding.lower() == "uper":
                 self.C_SourceFile.write("        ossFreeBuf(g_world, pVar_%s);\n" % self.CleanNameAsToolWants(nodeTypename))
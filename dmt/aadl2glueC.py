@@ -79,9 +79,10 @@ but with an extra call to OnFinal at the end.
 '''
 
 import os
+import re
 import sys
-import hashlib
-from distutils import spawn
+import multiprocessing
+import shutil
 
 from typing import cast, Optional, Dict, List, Tuple, Set, Any  # NOQA pylint: disable=unused-import
 
@@ -106,9 +107,15 @@ from .B_mappers.module_protos import Sync_B_Mapper, Async_B_Mapper
 
 from . import commonPy
 
-from .commonPy.utility import panic, inform
+from .commonPy.utility import panic, inform, warn
 from .commonPy import verify
-from .commonPy.cleanupNodes import DiscoverBadTypes, SetOfBadTypenames
+from .commonPy import buildCache
+from .commonPy import outputFiles
+from .commonPy import glueManifest
+from .commonPy import aadlParser
+from .commonPy import aadlFragments
+from .commonPy import instrumentation
+from .commonPy.cleanupNodes import SetOfBadTypenames
 from .commonPy.asnParser import Filename, Typename, AST_Lookup, AST_TypesOfFile, AST_Leaftypes  # NOQA pylint: disable=unused-import
 from .commonPy.asnAST import AsnNode  # NOQA pylint: disable=unused-import
 from .commonPy.aadlAST import ApLevelContainer, Param  # NOQA pylint: disable=unused-import
@@ -141,41 +148,29 @@ g_sync_mappers = {
     'vhdl': vhdl_B_mapper,
 }
 
+# The synchronous backends whose glue only depends on its own SP (one
+# OnStartup/OnShutdown cycle per SP, and no state kept across SPs) - so
+# with -j, they run in worker processes. The async backends and the
+# custom ones (GUI, VHDL) accumulate state, and always run in the parent.
+g_parallelSyncLanguages = frozenset(['Scade6', 'Simulink', 'QgenC'])
 
-def ParseAADLfilesAndResolveSignals() -> None:
-    '''Invokes the ANTLR generated AADL parser, and resolves
-all references to AAADL Data types into the param._signal member
-of each SUBPROGRAM param.'''
-    projectCache = os.getenv("PROJECT_CACHE")
-    if projectCache is not None:
-        if not os.path.isdir(projectCache):
-            try:
-                os.mkdir(projectCache)
-            except:
-                panic("The configured cache folder:\n\n\t" + projectCache +
-                      "\n\n...is not there!\n")
-    cachedModelExists = False
-    aadlASTcache = None
-    if projectCache is not None:
-        filehash = hashlib.md5()
-        for each in sorted(sys.argv[1:]):
-            filehash.update(open(each).read().encode('utf-8'))
-        newHash = filehash.hexdigest()
-        # set the name of the Pickle files containing the dumped AST
-        aadlASTcache = projectCache + os.sep + newHash + "_aadl_ast.pickle"
-        if not os.path.exists(aadlASTcache):
-            print("[DMT] No cached AADL model found for",
-                  ",".join(sys.argv[1:]))
-        else:
-            cachedModelExists = True
-            print("[DMT] Reusing cached AADL model for",
-                  ",".join(sys.argv[1:]))
+# The synchronous backends whose SPs all write the same files (opened in
+# the OnStartup of the first SP, and named after its FV) - so the glue of
+# all their SPs is a single unit of the manifest.
+g_sharedSyncLanguages = frozenset(['gui', 'python'])
+
+# What the forked workers inherit: the asnFile, useOSS and badTypes of ProcessSync
+g_workerArgs = None  # type: Any
 
+
+def ParseAADLfilesAndResolveSignals(usePython2: bool = False) -> None:
+    '''Parses the AADL files (in-process, or via the ANTLR generated
+parser under python2), and resolves all references to AAADL Data types
+into the param._signal member of each SUBPROGRAM param.'''
     import pickle
-    if cachedModelExists:
-        astInfo = pickle.load(open(aadlASTcache, 'rb'), fix_imports=False)
-    else:
-        import tempfile
+    import tempfile
+
+    def ParseAADLfilesWithPython2() -> Any:
         f = tempfile.NamedTemporaryFile(delete=False)
         astFile = f.name
         f.close()
@@ -184,13 +179,52 @@ of each SUBPROGRAM param.'''
             os.path.abspath(os.path.dirname(__file__)), "parse_aadl.py")
         cmd = "python2 " + parserUtility + " -o " + astFile + ' ' + \
             ' '.join(sys.argv[1:])
-        if os.system(cmd) != 0:
+        try:
+            if os.system(cmd) != 0:
+                panic("AADL parsing failed. Aborting...")
+            with open(astFile, 'rb') as astData:
+                return pickle.load(astData, fix_imports=False)
+        finally:
             if os.path.exists(astFile):
                 os.unlink(astFile)
-            panic("AADL parsing failed. Aborting...")
-        astInfo = pickle.load(open(astFile, 'rb'), fix_imports=False)
-        if aadlASTcache:
-            pickle.dump(astInfo, open(aadlASTcache, 'wb'), fix_imports=False)
+
+    def LoadPython2Model() -> Tuple[Any, bool]:
+        if cache is None:
+            return ParseAADLfilesWithPython2(), True
+        key = cache.Key("aadl", sorted(sys.argv[1:]))
+        # Parallel invocations on the same inputs wait for the first one
+        with cache.Producer(key):
+            # The entry is the model and the parser that made it (entries
+            # of the older format - just the model - are treated as missing)
+            entry = cache.LoadPickle(key, "aadl_ast.pickle")
+            if isinstance(entry, tuple):
+                print("[DMT] Reusing cached AADL model for",
+                      ",".join(sys.argv[1:]))
+            else:
+                print("[DMT] No cached AADL model found for",
+                      ",".join(sys.argv[1:]))
+                entry = (ParseAADLfilesWithPython2(), True)
+                cache.StorePickle(key, "aadl_ast.pickle", entry, "the AADL model")
+        return entry
+
+    def ParseAADLfiles() -> Tuple[Any, bool]:
+        '''The model, and whether it was made by python2 (in which case the
+        classes of its objects must be patched - see FixMetaClasses).'''
+        if not usePython2:
+            try:
+                if cache is None:
+                    return aadlParser.ParseAADLfiles(sys.argv[1:]), False
+                # Only the files that changed are parsed
+                return aadlFragments.LoadAADLfiles(sys.argv[1:], cache), False
+            except aadlParser.AadlSyntaxError as e:
+                if not shutil.which('python2'):
+                    panic(str(e))
+                # The ANTLR parser has the last word on what is valid AADL
+                warn("%s\nRetrying with the python2 AADL parser...", str(e))
+        return LoadPython2Model()
+
+    cache = buildCache.ProjectCache()
+    astInfo, fromPython2 = ParseAADLfiles()
 
     def FixMetaClasses(sp: ApLevelContainer) -> None:
         def patchMe(o: Any) -> None:
@@ -218,6 +252,8 @@ of each SUBPROGRAM param.'''
                   'g_signals', 'g_systems', 'g_subProgramImplementations',
                   'g_threadImplementations']:
             setattr(commonPy.aadlAST, k, astInfo[k])
+        if not fromPython2:
+            return
         for k in ['g_processImplementations',
                   'g_subProgramImplementations', 'g_threadImplementations']:
             for si in astInfo[k]:
@@ -226,8 +262,6 @@ of each SUBPROGRAM param.'''
                 sp = commonPy.aadlAST.g_apLevelContainers[sp]
                 FixMetaClasses(sp)
     except Exception as e:
-        if os.path.exists(astFile):
-            os.unlink(astFile)
         panic(str(e))
 
 
@@ -236,7 +270,7 @@ def SpecialCodes(asnFile: str) -> None:
 the scope of individual parameters (e.g. it needs access to all ASN.1
 types). This used to cover Dumpable C/Ada Types and OG headers.'''
     outputDir = commonPy.configMT.outputDir
-    asn1SccPath = spawn.find_executable('asn1.exe')
+    asn1SccPath = shutil.which('asn1.exe', mode=os.F_OK)
     # allow externally-defined flags when calling the asn1 compiler (e.g. to set word size based on target)
     extraFlags = os.getenv("ASN1SCC_FLAGS") or ""
     if asnFile is not None:
@@ -314,13 +348,59 @@ def ProcessSync(
             processor = backend.OnEnumerated
         else:  # pragma: no cover
             panic("Unexpected type of element: %s" % leafType)  # pragma: no cover
-        processor(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
+        with instrumentation.Phase(nodeTypename, "type", backend=modelingLanguage):
+            processor(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
 
     # For synchronous backend, call OnShutdown once per each sp_impl
     backend.OnShutdown(modelingLanguage, asnFile, sp, sp_impl, maybeFVname)
     return backend
 
 
+def ProcessSyncInWorker(units: List[List[str]]) -> Tuple[int, List[List[str]], int, int, List[Dict[str, Any]]]:  # pylint: disable=invalid-sequence-index
+    '''Runs a group of synchronous units (in order) in a worker, and returns
+    the exit code (panic calls sys.exit, which must not escape a pool
+    worker), the files that each unit generated, the counts of the
+    generated files it wrote and left untouched, and its instrumentation
+    events.'''
+    asnFile, useOSS, badTypes = g_workerArgs
+    # (the counts of the parent, when it forked the worker, are not ours)
+    writtenBefore, untouchedBefore = outputFiles.Counts()
+    exitCode = 0
+    files = []  # type: List[List[str]]
+    try:
+        for si in units:
+            spName, sp_impl, modelingLanguage, maybeFVname = si[0], si[1], si[2], si[3]
+            sp = commonPy.aadlAST.g_apLevelContainers[spName]
+            mark = len(outputFiles.Opened())
+            with instrumentation.Phase(modelingLanguage, "backend", sp=spName, impl=sp_impl):
+                ProcessSync(modelingLanguage, asnFile, sp, sp_impl, maybeFVname, useOSS, badTypes)
+            files.append(outputFiles.Opened()[mark:])
+    except SystemExit as e:
+        exitCode = e.code if isinstance(e.code, int) else 1
+    finally:
+        outputFiles.CloseAll()
+    written, untouched = outputFiles.Counts()
+    return exitCode, files, written - writtenBefore, untouched - untouchedBefore, instrumentation.TakeEvents()
+
+
+def StartSyncWorkers(
+        groups: List[List[List[str]]],
+        asnFile: str,
+        useOSS: bool,
+        badTypes: SetOfBadTypenames,
+        jobs: int) -> Tuple[Any, Any]:  # pylint: disable=invalid-sequence-index
+    '''Starts processing the groups of synchronous units in a pool of
+    workers, and returns the pool and the (asynchronous) result.'''
+    # The workers are forked (so they inherit the ASN.1 and AADL models)
+    # before the parent generates anything. These backends don't modify
+    # the models, so the workers can run many groups each.
+    global g_workerArgs
+    g_workerArgs = (asnFile, useOSS, badTypes)
+    sys.stdout.flush()
+    pool = multiprocessing.get_context('fork').Pool(processes=jobs)
+    return pool, pool.map_async(ProcessSyncInWorker, groups)
+
+
 def getAsyncBackend(modelingLanguage: str) -> Async_B_Mapper:
     if modelingLanguage not in g_async_mappers:
         panic("Asynchronous modeling language '%s' not supported" % modelingLanguage)
@@ -390,7 +470,8 @@ def ProcessAsync(  # pylint: disable=dangerous-default-value
                 processor = backend.OnEnumerated
             else:  # pragma: no cover
                 panic("Unexpected type of element: %s" % leafType)  # pragma: no cover
-            processor(nodeTypename, node, leafTypeDict, names)
+            with instrumentation.Phase(nodeTypename, "type", backend=modelingLanguage):
+                processor(nodeTypename, node, leafTypeDict, names)
     return backend
 
 
@@ -463,7 +544,8 @@ def ProcessCustomBackends(
                         processor = backend.OnSetOf
                     elif leafType == 'ENUMERATED':
                         processor = backend.OnEnumerated
-                    processor(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
+                    with instrumentation.Phase(nodeTypename, "type", backend=lang):
+                        processor(nodeTypename, node, sp, sp_impl, param, leafTypeDict, names)
             else:  # pragma: no cover
                 panic("Unexpected type of element: %s" % leafTypeDict[nodeTypename])  # pragma: no cover
         for backend in getCustomBackends(lang):
@@ -485,6 +567,8 @@ def main() -> None:
         import pdb  # pragma: no cover pylint: disable=wrong-import-position,wrong-import-order
         pdb.set_trace()  # pragma: no cover
 
+    instrumentation.Start("aadl2glueC")
+
     if "-profile" in sys.argv:
         sys.argv.remove("-profile")
         import cProfile
@@ -514,7 +598,7 @@ def main() -> None:
         try:
             commonPy.configMT.outputDir = os.path.normpath(sys.argv[idx + 1]) + os.sep
         except:  # pragma: no cover
-            panic('Usage: %s [-v] [-verbose] [-useOSS] [-o dirname] input1.aadl [input2.aadl] ...\n' % sys.argv[0])  # pragma: no cover
+            panic('Usage: %s [-v] [-verbose] [-useOSS] [-outline] [-full] [-python2Parser] [-j N] [-o dirname] input1.aadl [input2.aadl] ...\n' % sys.argv[0])  # pragma: no cover
         del sys.argv[idx]
         del sys.argv[idx]
         if not os.path.isdir(commonPy.configMT.outputDir):
@@ -528,16 +612,43 @@ def main() -> None:
     useOSS = "-useOSS" in sys.argv
     if useOSS:
         sys.argv.remove("-useOSS")
+    if "-outline" in sys.argv:
+        # One conversion routine per named type, instead of inline expansion
+        # (in the C, Simulink, SCADE6 and QGenC glue - the OG/SDL glue maps
+        # to the C types that ObjectGeode generates, whose names we don't know)
+        commonPy.configMT.outlineMappers = True
+        sys.argv.remove("-outline")
+    # Ignore the manifest of the previous run, and regenerate all the glue
+    fullRegeneration = "-full" in sys.argv
+    if fullRegeneration:
+        sys.argv.remove("-full")
+    # Use the (ANTLR2-based) AADL parser of python2, instead of the in-process one
+    usePython2 = "-python2Parser" in sys.argv
+    if usePython2:
+        sys.argv.remove("-python2Parser")
+    # Run up to N synchronous backends in parallel
+    jobs = 1
+    if sys.argv.count("-j") != 0:
+        idx = sys.argv.index("-j")
+        try:
+            jobs = int(sys.argv[idx + 1])
+        except:  # pragma: no cover
+            panic('Usage: %s [-v] [-verbose] [-useOSS] [-outline] [-full] [-python2Parser] [-j N] [-o dirname] input1.aadl [input2.aadl] ...\n' % sys.argv[0])  # pragma: no cover
+        del sys.argv[idx]
+        del sys.argv[idx]
+        if jobs < 1:
+            panic("The number of parallel jobs must be at least 1.\n")  # pragma: no cover
 
     # No other options must remain in the cmd line...
     if len(sys.argv) < 2:
-        panic('Usage: %s [-v] [-verbose] [-useOSS] [-o dirname] input1.aadl [input2.aadl] ...\n' % sys.argv[0])  # pragma: no cover
+        panic('Usage: %s [-v] [-verbose] [-useOSS] [-outline] [-full] [-python2Parser] [-j N] [-o dirname] input1.aadl [input2.aadl] ...\n' % sys.argv[0])  # pragma: no cover
     commonPy.configMT.showCode = True
     for f in sys.argv[1:]:
         if not os.path.isfile(f):
             panic("'%s' is not a file!\n" % f)  # pragma: no cover
 
-    ParseAADLfilesAndResolveSignals()
+    with instrumentation.Phase("AADL parsing", "aadl", files=sys.argv[1:]):
+        ParseAADLfilesAndResolveSignals(usePython2)
 
     uniqueDataFiles = {}  # type: Dict[Filename, Dict[str, List[ApLevelContainer]]]
     for sp in list(commonPy.aadlAST.g_apLevelContainers.values()):
@@ -554,18 +665,20 @@ def main() -> None:
     elif asn1files:
         panic("There appear to be more than one ASN.1 files referenced (%s)..." % str(asn1files))
 
+    validator = verify.ASTValidator(commonPy.asnParser.g_names)
     if asnFile is not None:
         inform("Checking that all base nodes have mandatory ranges set in %s..." % asnFile)
-        names = commonPy.asnParser.g_names
-        for node in names.values():
-            verify.VerifyRanges(node, names)
+        with instrumentation.Phase("VerifyRanges", "validation", filename=asnFile):
+            for name in commonPy.asnParser.g_names:
+                validator.VerifyRanges(name)
 
     SystemsAndImplementations = commonPy.aadlAST.g_subProgramImplementations[:]
     SystemsAndImplementations.extend(commonPy.aadlAST.g_threadImplementations[:])
     SystemsAndImplementations.extend(commonPy.aadlAST.g_processImplementations[:])
 
     # If some AST nodes must be skipped (for any reason), go learn about them
-    badTypes = DiscoverBadTypes()
+    with instrumentation.Phase("BadTypes", "validation"):
+        badTypes = validator.BadTypes()
 
     # Update ASN.1 nodes to carry size info (only for Signal params)
     for si in SystemsAndImplementations:
@@ -583,18 +696,76 @@ def main() -> None:
                 # (typo?) node._asnSize = param._signal._asnSize
 
     if {"ada", "qgenada"} & {y[2].lower() for y in SystemsAndImplementations}:
-        SpecialCodes(asnFile)
+        with instrumentation.Phase("ASN1SCC (Ada)", "spawn"):
+            SpecialCodes(asnFile)
 
-    asynchronousBackends = set([])  # type: Set[Async_B_Mapper]
+    asynchronousBackends = {}  # type: Dict[str, Async_B_Mapper]
 
     # Moving to static typing - no more dynamic imports,
     # so this information must be statically available
     async_languages = list(g_async_mappers.keys())
 
+    # The work units whose inputs didn't change since the previous run
+    # (as per the manifest in the output folder) are skipped.
+    manifest = glueManifest.Manifest(commonPy.configMT.outputDir, loadPrevious=not fullRegeneration)
+    types = glueManifest.TypeFingerprints(commonPy.asnParser.g_names)
+    options = [asnFile, useOSS, commonPy.configMT.outlineMappers]
+    asyncFingerprints = {}  # type: Dict[str, str]
+    asyncFiles = {}  # type: Dict[str, List[str]]
+    skippedAsync = set()  # type: Set[str]
+    sharedFingerprints = {}  # type: Dict[str, str]
+    sharedFiles = {}  # type: Dict[str, List[str]]
+    skippedShared = set()  # type: Set[str]
+
+    def SyncUnit(si: List[str]) -> Tuple[str, str]:  # pylint: disable=invalid-sequence-index
+        spName, sp_impl, modelingLanguage, maybeFVname = si[0], si[1], si[2], si[3]
+        if modelingLanguage in g_sharedSyncLanguages:
+            unit = "sync/" + modelingLanguage
+            if unit not in sharedFingerprints:
+                sharedFingerprints[unit] = glueManifest.Fingerprint(
+                    unit, options,
+                    [[list(x), glueManifest.ParamsFingerprint(commonPy.aadlAST.g_apLevelContainers[x[0]], types)]
+                     for x in SystemsAndImplementations if x[2] == modelingLanguage])
+            return unit, sharedFingerprints[unit]
+        unit = "sync/%s/%s/%s" % (modelingLanguage, spName, sp_impl)
+        return unit, glueManifest.Fingerprint(
+            unit, options, maybeFVname, glueManifest.ParamsFingerprint(commonPy.aadlAST.g_apLevelContainers[spName], types))
+
+    def AdaGlueFile(si: List[str]) -> str:  # pylint: disable=invalid-sequence-index
+        # The <sp>_<impl>.adb/.ads that the glue of the unit writes (whatever
+        # its language - see SynchronousToolGlueGenerator.OnStartup)
+        return re.sub(r'[^a-zA-Z0-9_]', '_', si[0] + "_" + si[1]).lower()
+
+    # With -j, the synchronous units that can run in workers are grouped by
+    # their Ada output files: the units that would write the same files run
+    # in the same worker, in their serial order. If units that run in the
+    # parent also write them, the whole group stays in the parent.
+    parentAdaFiles = {AdaGlueFile(si) for si in SystemsAndImplementations if si[2] not in g_parallelSyncLanguages}
+    delegated = set()  # type: Set[Tuple[str, ...]]
+    groups = {}  # type: Dict[str, List[List[str]]]
+    fingerprints = {}  # type: Dict[str, str]
+    for si in SystemsAndImplementations if jobs > 1 else []:
+        spName, sp_impl, modelingLanguage = si[0], si[1], si[2]
+        if modelingLanguage not in g_parallelSyncLanguages or not commonPy.aadlAST.g_apLevelContainers[spName]._params:
+            continue
+        if AdaGlueFile(si) in parentAdaFiles:
+            continue
+        delegated.add(tuple(si))
+        unit, fingerprints[unit] = SyncUnit(si)
+        if manifest.IsUpToDate(unit, fingerprints[unit]):
+            inform("The glue of %s.%s is up to date.", spName, sp_impl)
+            continue
+        groups.setdefault(AdaGlueFile(si), []).append(si)
+    workers = None  # type: Optional[Tuple[Any, Any]]
+    if groups:
+        workers = StartSyncWorkers(list(groups.values()), asnFile, useOSS, badTypes, jobs)
+
     for si in SystemsAndImplementations:
         spName, sp_impl, modelingLanguage, maybeFVname = si[0], si[1], si[2], si[3]
         if modelingLanguage is None:
             continue  # pragma: no cover
+        if tuple(si) in delegated:
+            continue
         sp = commonPy.aadlAST.g_apLevelContainers[spName]
         inform("Creating glue for parameters of %s.%s...", sp._id, sp_impl)
 
@@ -611,16 +782,94 @@ def main() -> None:
             modelingLanguage = "C"
 
         if modelingLanguage in async_languages:
-            m = ProcessAsync(modelingLanguage, asnFile, sp, maybeFVname, useOSS, badTypes)
-            asynchronousBackends.add(m)
+            # The encoders/decoders are generated for all the types, and
+            # the backend is started with the FV name of its first user.
+            unit = "async/" + modelingLanguage
+            if unit not in asyncFingerprints:
+                asyncFingerprints[unit] = glueManifest.Fingerprint(
+                    unit, options, maybeFVname, sorted(badTypes), types.OfAll(badTypes))
+                if manifest.IsUpToDate(unit, asyncFingerprints[unit]):
+                    inform("The %s glue is up to date.", modelingLanguage)
+                    skippedAsync.add(modelingLanguage)
+            if modelingLanguage in skippedAsync:
+                continue
+            mark = len(outputFiles.Opened())
+            with instrumentation.Phase(modelingLanguage, "backend", sp=spName, impl=sp_impl):
+                m = ProcessAsync(modelingLanguage, asnFile, sp, maybeFVname, useOSS, badTypes)
+            asynchronousBackends[modelingLanguage] = m
+            asyncFiles.setdefault(modelingLanguage, []).extend(outputFiles.Opened()[mark:])
         else:
-            ProcessSync(modelingLanguage, asnFile, sp, sp_impl, maybeFVname, useOSS, badTypes)
+            unit, fingerprint = SyncUnit([spName, sp_impl, modelingLanguage, maybeFVname])
+            if modelingLanguage in g_sharedSyncLanguages:
+                # All the SPs of the language are (re)generated together
+                if unit not in sharedFiles:
+                    sharedFiles[unit] = []
+                    if manifest.IsUpToDate(unit, fingerprint):
+                        inform("The %s glue is up to date.", modelingLanguage)
+                        skippedShared.add(unit)
+                if unit in skippedShared:
+                    continue
+            elif manifest.IsUpToDate(unit, fingerprint):
+                inform("The glue of %s.%s is up to date.", sp._id, sp_impl)
+                continue
+            mark = len(outputFiles.Opened())
+            with instrumentation.Phase(modelingLanguage, "backend", sp=spName, impl=sp_impl):
+                ProcessSync(modelingLanguage, asnFile, sp, sp_impl, maybeFVname, useOSS, badTypes)
+            generated = outputFiles.Opened()[mark:]
+            if unit in sharedFiles:
+                sharedFiles[unit].extend(generated)
+                generated = sharedFiles[unit]
+            manifest.Record(unit, fingerprint, generated)
 
     # SystemsAndImplementation loop completed - time to call OnShutdown ONCE for each async backend that we loaded
-    for asyncBackend in asynchronousBackends:
-        asyncBackend.OnShutdown(modelingLanguage, asnFile, maybeFVname)
+    for asyncLanguage, asyncBackend in asynchronousBackends.items():
+        mark = len(outputFiles.Opened())
+        with instrumentation.Phase(asyncLanguage, "backend", step="OnShutdown"):
+            asyncBackend.OnShutdown(modelingLanguage, asnFile, maybeFVname)
+        unit = "async/" + asyncLanguage
+        manifest.Record(unit, asyncFingerprints[unit], asyncFiles[asyncLanguage] + outputFiles.Opened()[mark:])
+
+    customSystemsAndImplementations = [
+        si for si in SystemsAndImplementations
+        if si[2] is not None and si[2].lower() in ["gui_ri", "gui_pi", "vhdl"]]
+    if not customSystemsAndImplementations:
+        with instrumentation.Phase("custom", "backend"):
+            ProcessCustomBackends(asnFile, useOSS, SystemsAndImplementations)
+    else:
+        # The VHDL backends also extract templates (that are not tracked),
+        # so they are always regenerated.
+        fingerprint = None  # type: Optional[str]
+        if not any(si[2].lower() == "vhdl" for si in customSystemsAndImplementations):
+            fingerprint = glueManifest.Fingerprint(
+                "custom", options,
+                [[list(si), glueManifest.ParamsFingerprint(commonPy.aadlAST.g_apLevelContainers[si[0]], types)]
+                 for si in customSystemsAndImplementations])
+        if manifest.IsUpToDate("custom", fingerprint):
+            inform("The GUI glue is up to date.")
+        else:
+            mark = len(outputFiles.Opened())
+            with instrumentation.Phase("custom", "backend"):
+                ProcessCustomBackends(asnFile, useOSS, SystemsAndImplementations)
+            manifest.Record("custom", fingerprint, outputFiles.Opened()[mark:])
 
-    ProcessCustomBackends(asnFile, useOSS, SystemsAndImplementations)
+    if workers is not None:
+        pool, result = workers
+        try:
+            results = result.get()
+        finally:
+            pool.close()
+            pool.join()
+        for group, (_, files, written, untouched, events) in zip(groups.values(), results):
+            for si, unitFiles in zip(group, files):
+                unit = SyncUnit(si)[0]
+                manifest.Record(unit, fingerprints[unit], unitFiles)
+            outputFiles.AddCounts(written, untouched)
+            instrumentation.AddEvents(events)
+        for exitCode, _, _, _, _ in results:
+            if exitCode != 0:
+                sys.exit(exitCode)
+    outputFiles.Report()
+    manifest.Save()
 
 
 if __name__ == "__main__":
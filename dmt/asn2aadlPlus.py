@@ -9,7 +9,6 @@ references (in AADL) to all the existing types.
 import os
 import re
 import sys
-import copy
 import shutil
 import getopt
 import hashlib
@@ -20,6 +19,7 @@ import distutils.spawn as spawn
 
 from .commonPy import configMT
 from .commonPy import asnParser
+from .commonPy import instrumentation
 from .commonPy import __version__
 
 from .commonPy.asnAST import (
@@ -102,14 +102,7 @@ def calculateForNativeAndASN1SCC(absASN1SCCpath, autosrc, names, inputFiles):
 
     uniqueASNfiles = {}
     for asnFile in inputASN1files:
-        tmpNames = {}
-        for name in asnParser.g_typesOfFile[asnFile]:
-            tmpNames[name] = asnParser.g_names[name]
-
-        uniqueASNfiles[asnFile] = [
-            copy.copy(tmpNames),                            # map Typename to type definition class from asnAST
-            copy.copy(asnParser.g_astOfFile[asnFile]),    # list of nameless type definitions
-            copy.copy(asnParser.g_leafTypeDict)]   # map from Typename to leafType
+        uniqueASNfiles[asnFile] = asnParser.ViewOfFile(asnFile)
 
     configMT.outputDir = autosrc + os.sep
     # dumpable.CreateDumpableCtypes(uniqueASNfiles)
@@ -217,6 +210,8 @@ def main():
         import pdb  # pragma: no cover pylint: disable=wrong-import-position,wrong-import-order
         pdb.set_trace()  # pragma: no cover
 
+    instrumentation.Start("asn2aadlPlus")
+
     if "-v" in sys.argv:
         import pkg_resources  # pragma: no cover
         version = pkg_resources.require("dmt")[0].version  # pragma: no cover
@@ -362,7 +357,8 @@ def main():
         # If taste-updata-dataview is called, then we just want the GUI to be aware
         # of the list of ASN.1 types - the Ellidiss GUI does not care about the
         # Source_Data_Size values... so skip all GCC-related work!
-        messageSizes = calculateForNativeAndASN1SCC(absASN1SCCpath, autosrc, asnParser.g_names, inputFiles)
+        with instrumentation.Phase("Message sizes", "spawn"):
+            messageSizes = calculateForNativeAndASN1SCC(absASN1SCCpath, autosrc, asnParser.g_names, inputFiles)
         for nodeTypename in list(messageSizes.keys()):
             messageSizes[nodeTypename] = [messageSizes[nodeTypename], (8 * (int((messageSizes[nodeTypename] - 1) / 8)) + 8)]
 
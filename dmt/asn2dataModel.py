@@ -18,16 +18,19 @@ It reads the ASN.1 specification of the exchanged messages, and
 generates the semantically equivalent ModelingTool/ModelingLanguage
 declarations (e.g. SCADE/Lustre, Matlab/Simulink statements, etc).
 '''
+import io
 import os
+import gc
 import sys
-import copy
+import multiprocessing
 
-from typing import cast, Dict, Tuple, Any, List  # NOQA pylint: disable=unused-import
+from typing import cast, Dict, Tuple, Any, List, Set  # NOQA pylint: disable=unused-import
 
-from .commonPy import configMT, asnParser, cleanupNodes, verify
+from .commonPy import configMT, asnParser, verify, outputFiles, instrumentation
 from .commonPy.utility import inform, panic
-from .commonPy.asnParser import Filename, Typename, AST_Lookup, AST_TypesOfFile, AST_Leaftypes  # NOQA pylint: disable=unused-import
+from .commonPy.asnParser import Filename, Typename, AST_Lookup, AST_TypesOfFile, AST_Leaftypes, AST_FileView  # NOQA pylint: disable=unused-import
 from .commonPy.asnAST import AsnNode  # NOQA pylint: disable=unused-import
+from .commonPy.cleanupNodes import SetOfBadTypenames
 
 from . import A_mappers  # NOQA pylint:disable=unused-import
 
@@ -52,7 +55,8 @@ def usage(argsToTools: Dict[str, str]) -> None:
     '''Print usage instructions.'''
     msg = 'Usage: %s <options> input1.asn1 [input2.asn1]...\nWhere options are:\n'
     msg += '\t-verbose\t\tDisplay more debug output\n'
-    msg += '\t-o dirname\t\tDirectory to place generated files\nAnd one of:\n'
+    msg += '\t-o dirname\t\tDirectory to place generated files\n'
+    msg += '\t-j N\t\t\tRun up to N backends (or ASN.1 files) in parallel\nAnd one of:\n'
     for opt in sorted(argsToTools.keys()):
         msg += '\t-' + opt + ' (for ' + argsToTools[opt][0].upper() + argsToTools[opt][1:] + ')\n'
     panic(msg % sys.argv[0])
@@ -68,6 +72,7 @@ def getBackend(modelingLanguage: str) -> A_Mapper:
         'RTDS': rtds_A_mapper,
         'ada': ada_A_mapper,
         'python': python_A_mapper,
+        'pythonCtypes': python_A_mapper,
         'smp2': smp2_A_mapper,
         'qgenada': qgenada_A_mapper,
         'qgenc': qgenc_A_mapper,
@@ -80,12 +85,161 @@ def getBackend(modelingLanguage: str) -> A_Mapper:
     return cast(A_Mapper, backends[modelingLanguage])
 
 
+# For some languages we want to pass the complete list of ASN.1 files to ASN1SCC,
+# instead of working per type:
+g_wholeGrammarLanguages = ["c", "ada", "smp2", "qgenc", "qgenada"]
+
+# The languages whose backends generate independent output files for each
+# ASN.1 file - so in parallel mode, their work is split across the files.
+# (The others either keep state across files, or all write the same file.)
+g_perFileLanguages = ["scade5", "scade6"]
+
+# The work of the parallel mode's worker processes (inherited via fork)
+g_uniqueASNfiles = {}  # type: Dict[Filename, AST_FileView]
+g_badTypes = set()  # type: SetOfBadTypenames
+
+
+def RunMappings(
+        modelingLanguage: str,
+        asnFiles: List[str],
+        uniqueASNfiles: Dict[Filename, AST_FileView],
+        badTypes: SetOfBadTypenames) -> None:  # pylint: disable=invalid-sequence-index
+    backend = getBackend(modelingLanguage)
+
+    if modelingLanguage.lower() in g_wholeGrammarLanguages:
+        backend.OnStartup(modelingLanguage, asnFiles, configMT.outputDir, badTypes)
+        backend.OnShutdown(badTypes)
+        return
+
+    # Work on each ASN.1 file's types
+    for asnFile in asnFiles:
+        if 'OnStartup' in dir(backend):
+            backend.OnStartup(modelingLanguage, asnFile, configMT.outputDir, badTypes)
+
+        leafTypeDict = uniqueASNfiles[asnFile].leafTypes
+
+        inform("Executing mappings for types inside %s...", asnFile)
+        names = uniqueASNfiles[asnFile].names
+        for nodeTypename in sorted(names):
+            # Check if this type must be skipped
+            if nodeTypename in badTypes and modelingLanguage.lower() not in ['python', 'pythonctypes']:
+                # all languages but python discard IA5Strings
+                continue
+            node = names[nodeTypename]
+            inform("Processing %s (%s)...", nodeTypename, modelingLanguage)
+
+            # First, make sure we know what leaf type this node is
+            assert nodeTypename in leafTypeDict
+
+            leafType = leafTypeDict[nodeTypename]
+            if leafType in ['BOOLEAN', 'INTEGER', 'REAL', 'OCTET STRING', 'AsciiString']:
+                processor = backend.OnBasic
+            elif leafType == 'SEQUENCE':
+                processor = backend.OnSequence
+            elif leafType == 'SET':
+                processor = backend.OnSet  # pragma: no cover
+            elif leafType == 'CHOICE':
+                processor = backend.OnChoice
+            elif leafType == 'SEQUENCEOF':
+                processor = backend.OnSequenceOf
+            elif leafType == 'SETOF':
+                processor = backend.OnSetOf  # pragma: no cover
+            elif leafType == 'ENUMERATED':
+                processor = backend.OnEnumerated
+            else:  # pragma: no cover
+                panic("Unexpected type of element: %s" % leafType)  # pragma: no cover
+            with instrumentation.Phase(nodeTypename, "type", backend=modelingLanguage):
+                processor(nodeTypename, node, leafTypeDict)
+
+        if 'OnShutdown' in dir(backend):
+            backend.OnShutdown(badTypes)
+
+
+def RunBackend(
+        modelingLanguage: str,
+        asnFiles: List[str],
+        uniqueASNfiles: Dict[Filename, AST_FileView],
+        badTypes: SetOfBadTypenames) -> None:  # pylint: disable=invalid-sequence-index
+    with instrumentation.Phase(modelingLanguage, "backend", files=asnFiles):
+        RunMappings(modelingLanguage, asnFiles, uniqueASNfiles, badTypes)
+
+
+def RunBackendInWorker(work: Tuple[str, List[str]]) -> Tuple[int, int, int, List[Dict[str, Any]]]:  # pylint: disable=invalid-sequence-index
+    '''Runs one unit of work of the parallel mode, and returns its exit code
+    (panic calls sys.exit, which must not escape a pool worker), the
+    counts of the generated files it wrote and left untouched, and its
+    instrumentation events.'''
+    modelingLanguage, asnFiles = work
+    exitCode = 0
+    try:
+        RunBackend(modelingLanguage, asnFiles, g_uniqueASNfiles, g_badTypes)
+    except SystemExit as e:
+        exitCode = e.code if isinstance(e.code, int) else 1
+    finally:
+        # Some backends leave their output files open, relying on the
+        # interpreter's shutdown to commit/flush them - which doesn't
+        # happen in pool workers (they exit via os._exit).
+        outputFiles.CloseAll()
+        for obj in gc.get_objects():
+            if isinstance(obj, io.IOBase) and not obj.closed:
+                try:
+                    obj.flush()
+                except (OSError, ValueError):
+                    pass
+    written, untouched = outputFiles.Counts()
+    return exitCode, written, untouched, instrumentation.TakeEvents()
+
+
+def RunBackendsInParallel(
+        modelingLanguages: List[str],
+        uniqueASNfiles: Dict[Filename, AST_FileView],
+        badTypes: SetOfBadTypenames,
+        jobs: int) -> None:  # pylint: disable=invalid-sequence-index
+    # The units of work, in the order of the sequential mode - and without
+    # duplicates (e.g. -toC and -toCPP), that would write the same files.
+    work = []  # type: List[Tuple[str, List[str]]]
+    seen = set()  # type: Set[Tuple[Any, Tuple[str, ...]]]
+    for modelingLanguage in modelingLanguages:
+        if modelingLanguage.lower() in g_perFileLanguages:
+            filesPerUnit = [[x] for x in uniqueASNfiles]
+        else:
+            filesPerUnit = [list(uniqueASNfiles.keys())]
+        for asnFiles in filesPerUnit:
+            key = (getBackend(modelingLanguage), tuple(asnFiles))
+            if key not in seen:
+                seen.add(key)
+                work.append((modelingLanguage, asnFiles))
+
+    # The workers are forked, so they inherit the resolved AST; and each
+    # one runs a single unit of work, so that the AST fixups done by some
+    # backends (e.g. SQL) never leak into the next one - which keeps the
+    # output independent of the scheduling.
+    global g_uniqueASNfiles, g_badTypes
+    g_uniqueASNfiles = uniqueASNfiles
+    g_badTypes = badTypes
+    sys.stdout.flush()
+    pool = multiprocessing.get_context('fork').Pool(processes=jobs, maxtasksperchild=1)
+    try:
+        results = pool.map(RunBackendInWorker, work, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+    for _, written, untouched, events in results:
+        outputFiles.AddCounts(written, untouched)
+        instrumentation.AddEvents(events)
+    for exitCode, _, _, _ in results:
+        if exitCode != 0:
+            sys.exit(exitCode)
+
+
 def main() -> None:
     if "-pdb" in sys.argv:
         sys.argv.remove("-pdb")  # pragma: no cover
         import pdb  # pragma: no cover pylint: disable=wrong-import-position,wrong-import-order
         pdb.set_trace()  # pragma: no cover
 
+    instrumentation.Start("asn2dataModel")
+
     if "-v" in sys.argv:
         import pkg_resources  # pragma: no cover
         version = pkg_resources.require("dmt")[0].version  # pragma: no cover
@@ -102,6 +256,7 @@ def main() -> None:
         'toRTDS': 'RTDS',
         'toAda': 'ada',
         'toPython': 'python',
+        'toPythonCtypes': 'pythonCtypes',
         'toSMP2': 'smp2',
         'toQGenAda': 'qgenada',
         'toQGenC': 'qgenc',
@@ -131,6 +286,17 @@ def main() -> None:
     if "-verbose" in sys.argv:
         configMT.verbose = True
         sys.argv.remove("-verbose")
+    jobs = 1
+    if sys.argv.count("-j") != 0:
+        idx = sys.argv.index("-j")
+        try:
+            jobs = int(sys.argv[idx + 1])
+        except:   # pragma: no cover
+            usage(argsToTools)  # pragma: no cover
+        del sys.argv[idx]
+        del sys.argv[idx]
+        if jobs < 1:
+            panic("The number of parallel jobs must be at least 1.\n")  # pragma: no cover
     for i in argsToTools:
         if "-" + i in sys.argv:
             toolSelected[i] = True
@@ -143,88 +309,46 @@ def main() -> None:
     if not any(toolSelected[i] for i in argsToTools):
         usage(argsToTools)  # pragma: no cover
 
+    # (the two modes of the Python mapper write the same files)
+    if toolSelected['toPython'] and toolSelected['toPythonCtypes']:
+        panic("Only one of -toPython and -toPythonCtypes can be used at a time.\n")
+
     for f in sys.argv[1:]:
         if not os.path.isfile(f):
             panic("'%s' is not a file!\n" % f)  # pragma: no cover
 
-    uniqueFilenames = list(set(sys.argv[1:]))
-    asnParser.ParseAsnFileList(uniqueFilenames)
+    # (in the order given in the command line, for deterministic output)
+    uniqueFilenames = list(dict.fromkeys(sys.argv[1:]))
+    model = asnParser.ParseAsnFileList(uniqueFilenames)
 
-    uniqueASNfiles = {}  # type: Dict[Filename, Tuple[AST_Lookup, List[AsnNode], AST_Leaftypes]]
+    uniqueASNfiles = {}  # type: Dict[Filename, AST_FileView]
+    validator = verify.ASTValidator(model._names)
     for asnFile in uniqueFilenames:
-        tmpNames = {}  # type: AST_Lookup
-        for name in asnParser.g_typesOfFile[asnFile]:
-            tmpNames[name] = asnParser.g_names[name]
-
-        uniqueASNfiles[asnFile] = (
-            copy.copy(tmpNames),                            # map Typename to type definition class from asnAST
-            copy.copy(asnParser.g_astOfFile[asnFile]),    # list of nameless type definitions
-            copy.copy(asnParser.g_leafTypeDict))   # map from Typename to leafType
+        uniqueASNfiles[asnFile] = asnParser.ViewOfFile(asnFile, model)
 
         inform("Checking that all base nodes have mandatory ranges set in %s..." % asnFile)
-        for node in list(tmpNames.values()):
-            verify.VerifyRanges(node, asnParser.g_names)
+        with instrumentation.Phase("VerifyRanges", "validation", filename=asnFile):
+            for name in uniqueASNfiles[asnFile].names:
+                validator.VerifyRanges(name)
 
     if configMT.debugParser:
         sys.exit(0)  # pragma: no cover
 
     # If some AST nodes must be skipped (for any reason), go learn about them
-    badTypes = cleanupNodes.DiscoverBadTypes()
-
-    # For each ASN.1 grammar file referenced in the system level description
-    for arg, modelingLanguage in argsToTools.items():
-        if not toolSelected[arg]:
-            continue
-        backend = getBackend(modelingLanguage)
-
-        # For some languages we want to pass the complete list of ASN.1 files to ASN1SCC,
-        # instead of working per type:
-        if modelingLanguage.lower() in ["c", "ada", "smp2", "qgenc", "qgenada"]:
-            backend.OnStartup(modelingLanguage, list(uniqueASNfiles.keys()), configMT.outputDir, badTypes)
-            backend.OnShutdown(badTypes)
-            continue  # bug in coverage.py...  # pragma: no cover
-
-        # Work on each ASN.1 file's types
-        for asnFile in uniqueASNfiles:
-            if 'OnStartup' in dir(backend):
-                backend.OnStartup(modelingLanguage, asnFile, configMT.outputDir, badTypes)
-
-            leafTypeDict = uniqueASNfiles[asnFile][2]
-
-            inform("Executing mappings for types inside %s...", asnFile)
-            names = uniqueASNfiles[asnFile][0]
-            for nodeTypename in sorted(names):
-                # Check if this type must be skipped
-                if nodeTypename in badTypes and modelingLanguage.lower() != 'python':
-                    # all languages but python discard IA5Strings
-                    continue
-                node = names[nodeTypename]
-                inform("Processing %s (%s)...", nodeTypename, modelingLanguage)
-
-                # First, make sure we know what leaf type this node is
-                assert nodeTypename in leafTypeDict
-
-                leafType = leafTypeDict[nodeTypename]
-                if leafType in ['BOOLEAN', 'INTEGER', 'REAL', 'OCTET STRING', 'AsciiString']:
-                    processor = backend.OnBasic
-                elif leafType == 'SEQUENCE':
-                    processor = backend.OnSequence
-                elif leafType == 'SET':
-                    processor = backend.OnSet  # pragma: no cover
-                elif leafType == 'CHOICE':
-                    processor = backend.OnChoice
-                elif leafType == 'SEQUENCEOF':
-                    processor = backend.OnSequenceOf
-                elif leafType == 'SETOF':
-                    processor = backend.OnSetOf  # pragma: no cover
-                elif leafType == 'ENUMERATED':
-                    processor = backend.OnEnumerated
-                else:  # pragma: no cover
-                    panic("Unexpected type of element: %s" % leafType)  # pragma: no cover
-                processor(nodeTypename, node, leafTypeDict)
-
-            if 'OnShutdown' in dir(backend):
-                backend.OnShutdown(badTypes)
+    with instrumentation.Phase("BadTypes", "validation"):
+        badTypes = validator.BadTypes()
+
+    selectedLanguages = [
+        modelingLanguage
+        for arg, modelingLanguage in argsToTools.items()
+        if toolSelected[arg]]
+    if jobs > 1:
+        RunBackendsInParallel(selectedLanguages, uniqueASNfiles, badTypes, jobs)
+    else:
+        # For each ASN.1 grammar file referenced in the system level description
+        for modelingLanguage in selectedLanguages:
+            RunBackend(modelingLanguage, list(uniqueASNfiles.keys()), uniqueASNfiles, badTypes)
+    outputFiles.Report()
 
 
 if __name__ == "__main__":
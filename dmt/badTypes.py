@@ -83,7 +83,6 @@ import sys
 
 from typing import cast, Optional, Dict, List, Tuple, Any  # NOQA pylint: disable=unused-import
 
-from .commonPy.cleanupNodes import DiscoverBadTypes
 from .commonPy.asnParser import Filename, Typename, AST_Lookup, AST_TypesOfFile, AST_Leaftypes  # NOQA pylint: disable=unused-import
 from .commonPy.asnAST import AsnNode  # NOQA pylint: disable=unused-import
 from .commonPy.aadlAST import ApLevelContainer, Param  # NOQA pylint: disable=unused-import
@@ -107,13 +106,13 @@ def main() -> None:
             panic("'%s' is not a file!\n" % f)  # pragma: no cover
 
     asn1files = sys.argv[1:]
-    asnParser.ParseAsnFileList(asn1files)
-    names = asnParser.g_names
-    for node in names.values():
-        verify.VerifyRanges(node, names)
+    names = asnParser.ParseAsnFileList(asn1files)._names
+    validator = verify.ASTValidator(names)
+    for name in names:
+        validator.VerifyRanges(name)
 
     # If some AST nodes must be skipped (for any reason), go learn about them
-    badTypes = DiscoverBadTypes()
+    badTypes = validator.BadTypes()
     print("\n".join(badTypes))
 
 
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+This module contains the shared API for parsing ASN.1 and AADL
+and performing code generation via AST traversals.
+"""
+from . import configMT
+from . import asnParser
+from . import asnAST
+from . import aadlAST
+from . import utility
+from . import createInternalTypes
+from . import verify
+from . import recursiveMapper
+from . import cleanupNodes
+from . import buildCache
+from . import outputFiles
+
+import pkg_resources  # pragma: no cover
+__version__ = "2.2-dev"
+
+
+def print_version() -> None:
+    print("TASTE Data Modelling Tools version {}\n\n"
+          "The following tools are available:\n"
+          "   asn2aadlPlus    - Convert ASN.1 models to AADL\n"
+          "   asn2dataModel   - TASTE A Mappers (from ASN.1 to C, Python, etc.)\n"
+          "   aadl2glueC      - TASTE B Mappers (from ASN.1+AADL to glue code)\n"
+          "   msgPrinter      - Generate serializers of ASN.1 instances\n"
+          "   msgPrinterASN1  - Generate serializers of ASN.1 instances (other encodings)\n"
+          "   smp2asn         - SMP2 to ASN.1 converter\n".format(__version__))
@@ -39,12 +39,15 @@
 
 from typing import Tuple, Union, Dict, Any, List  # NOQA pylint: disable=unused-import
 
+g_signals = {}  # type: Dict[str, Signal]
 g_apLevelContainers = {}  # type: Dict[str, ApLevelContainer]
 
 g_subProgramImplementations = []  # type: List[Tuple[str,str,str,str]]
 g_processImplementations = []  # type: List[Tuple[str,str,str,str]]
 g_threadImplementations = []  # type: List[Tuple[str,str,str,str]]
 
+g_systems = {}  # type: Dict[str, List[str]]
+
 # AST classes
 
 
@@ -0,0 +1,148 @@
+# (C)  Semantix Information Technologies,
+#      Neuropublic,
+#      European Space Agency
+#
+# The license of the Data Modelling Tools (DMT) is GPL with Runtime Exception
+
+'''
+The per-file cache of the AADL models.
+
+Each AADL file is parsed into a fragment of the model (see aadlParser),
+which is stored in the PROJECT_CACHE under a key made of the file (path
+and content) and of what else its parsing depends on: the package that
+the previous file ended in, and configMT.g_bOnlySubprograms. When e.g.
+only the concurrency view is regenerated, the fragments of the interface
+and data views are reused, and only the new file is parsed; the fragments
+are then merged (and their signals resolved) at load time.
+
+The fragments are stored as JSON, in a versioned format that refers to
+the aadlAST classes by name only - so it is independent of the module
+paths of the classes (and of pickle). Objects are stored once, in a
+table, and the references to them are {"#": index} - so objects that
+the parser shared (e.g. the Signals under their two names) stay shared
+(lists are stored by value).
+'''
+
+import json
+
+from typing import Any, Dict, IO, List, Optional  # NOQA pylint: disable=unused-import
+
+from . import aadlAST, aadlParser, configMT
+from .buildCache import BuildCache
+
+# Increase this when the format (or the contents) of the fragments change
+g_fragmentVersion = 1
+
+# The classes that can appear in a fragment
+g_classes = {
+    klass.__name__: klass
+    for klass in [
+        aadlAST.ApLevelContainer, aadlAST.Signal,
+        aadlAST.InParam, aadlAST.OutParam, aadlAST.InOutParam,
+        aadlAST.AadlParameter, aadlAST.AadlPort, aadlAST.AadlEventPort, aadlAST.AadlEventDataPort,
+        aadlAST.AadlPropertyAssociationNoModes, aadlAST.AadlContainedPropertyAssociation,
+        aadlAST.UniquePortIdentifier, aadlAST.Connection, aadlParser.AadlModel]}
+
+
+class FragmentFormatError(Exception):
+    pass
+
+
+def ToData(model: aadlParser.AadlModel) -> Dict[str, Any]:
+    '''The JSON-compatible form of a fragment.'''
+    table = []  # type: List[Any]
+    indexes = {}  # type: Dict[int, int]
+
+    def Encode(value: Any) -> Any:
+        if value is None or isinstance(value, (str, int, float)):
+            return value
+        if isinstance(value, (list, tuple)):
+            return [Encode(x) for x in value]
+        if isinstance(value, dict):
+            return {"dict": [[k, Encode(v)] for k, v in value.items()]}
+        className = type(value).__name__
+        if g_classes.get(className) is not type(value):
+            raise FragmentFormatError("Unexpected %s in an AADL fragment" % className)
+        index = indexes.get(id(value))
+        if index is None:
+            index = indexes[id(value)] = len(table)
+            table.append(None)
+            table[index] = [className, {k: Encode(v) for k, v in vars(value).items()}]
+        return {"#": index}
+
+    root = Encode(model)
+    return {"version": g_fragmentVersion, "objects": table, "root": root}
+
+
+def FromData(data: Dict[str, Any]) -> aadlParser.AadlModel:
+    '''The fragment stored by ToData.'''
+    if data.get("version") != g_fragmentVersion:
+        raise FragmentFormatError("Unsupported fragment version")
+    table = data["objects"]
+    objects = []  # type: List[Any]
+    for className, _ in table:
+        klass = g_classes.get(className)
+        if klass is None:
+            raise FragmentFormatError("Unknown class %s in an AADL fragment" % className)
+        objects.append(klass.__new__(klass))
+
+    def Decode(value: Any) -> Any:
+        if isinstance(value, list):
+            return [Decode(x) for x in value]
+        if isinstance(value, dict):
+            if "#" in value:
+                return objects[value["#"]]
+            return {k: Decode(v) for k, v in value["dict"]}
+        return value
+
+    for obj, (_, attributes) in zip(objects, table):
+        for k, v in attributes.items():
+            setattr(obj, k, Decode(v))
+    model = Decode(data["root"])
+    if not isinstance(model, aadlParser.AadlModel):
+        raise FragmentFormatError("The root of an AADL fragment must be an AadlModel")
+    # (JSON turned the tuples of the external implementations into lists)
+    model._externals = [tuple(x) for x in model._externals]
+    return model
+
+
+def LoadFragment(cache: BuildCache, key: str) -> Optional[aadlParser.AadlModel]:
+    '''Returns the cached fragment, or None if it is missing, unreadable
+    or in an older format.'''
+    path = cache.Lookup(key, "aadl_fragment.json")
+    if path is None:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return FromData(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError, IndexError, AttributeError, FragmentFormatError):
+        return None
+
+
+def StoreFragment(cache: BuildCache, key: str, model: aadlParser.AadlModel, filename: str) -> None:
+    def Writer(f: IO[Any]) -> None:
+        f.write(json.dumps(ToData(model), separators=(',', ':')).encode('utf-8'))
+    cache.Publish(key, "aadl_fragment.json", Writer, "the AADL model of " + filename)
+
+
+def LoadAADLfiles(listOfFilenames: List[str], cache: BuildCache) -> Dict[str, Any]:  # pylint: disable=invalid-sequence-index
+    '''Like aadlParser.ParseAADLfiles, but only parses the files whose
+    fragments are not in the cache.'''
+    fragments = []  # type: List[aadlParser.AadlModel]
+    currentPackage = ""
+    for aadlFilename in listOfFilenames:
+        key = cache.Key(
+            "aadlFragment:%d:%s:%s" % (g_fragmentVersion, configMT.g_bOnlySubprograms, currentPackage),
+            [aadlFilename])
+        # Parallel invocations on the same inputs wait for the first one
+        with cache.Producer(key):
+            fragment = LoadFragment(cache, key)
+            if fragment is not None:
+                print("[DMT] Reusing cached AADL model for", aadlFilename)
+            else:
+                print("[DMT] No cached AADL model found for", aadlFilename)
+                fragment = aadlParser.ParseAADLfile(aadlFilename, currentPackage)
+                StoreFragment(cache, key, fragment, aadlFilename)
+        currentPackage = fragment._currentPackage
+        fragments.append(fragment)
+    return aadlParser.Merge(fragments)
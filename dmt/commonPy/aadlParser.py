@@ -0,0 +1,754 @@
+# (C) Semantix Information Technologies,
+#      Neuropublic,
+#      European Space Agency
+#
+# The license of the Data Modelling Tools (DMT) is GPL with Runtime Exception
+
+'''
+AADL Parser
+
+The AADL parser that runs inside the Python 3 process of aadl2glueC. It
+recognizes the language of the ANTLR2 grammar in commonPy2/aadl.g (the
+one that parse_aadl.py runs under python2), and performs the same actions
+on it - but it creates the commonPy.aadlAST objects directly, so there is
+no python2 process to spawn and no pickle to move the model across.
+
+Only the rules that carry actions are parsed in full: the features,
+properties and connections of threads, processes, systems, subprograms
+and data. The rest (subcomponents, calls, flows, modes, annexes, property
+sets, port groups and the other component categories) is only checked
+for balanced brackets and ';' terminators, and is skipped.
+'''
+
+import re
+
+from typing import Any, Dict, List, NoReturn, Optional, Tuple  # NOQA pylint: disable=unused-import
+
+from . import configMT
+from .utility import inform, panic
+from .aadlAST import (
+    ApLevelContainer, Signal, InParam, OutParam, InOutParam,
+    AadlParameter, AadlPort, AadlEventPort, AadlEventDataPort,
+    AadlPropertyAssociationNoModes, AadlContainedPropertyAssociation,
+    UniquePortIdentifier, Connection)
+from .aadlAST import Param  # NOQA pylint: disable=unused-import
+
+# The keywords of the lexer in aadl.g (case insensitive, like everything in AADL)
+g_keywords = frozenset([
+    'access', 'and', 'all', 'annex', 'applies', 'binding', 'aadlboolean',
+    'bus', 'calls', 'classifier', 'reference', 'connections', 'constant',
+    'data', 'delta', 'device', 'end', 'enumeration', 'event', 'extends',
+    'false', 'features', 'flow', 'flows', 'group', 'implementation', 'in',
+    'inherit', 'initial', 'aadlinteger', 'inverse', 'is', 'list', 'memory',
+    'mode', 'modes', 'none', 'not', 'of', 'or', 'out', 'package',
+    'parameter', 'path', 'port', 'private', 'process', 'processor',
+    'properties', 'property', 'provides', 'public', 'range', 'aadlreal',
+    'refined', 'refines', 'requires', 'server', 'set', 'sink', 'source',
+    'aadlstring', 'subcomponents', 'subprogram', 'system', 'thread', 'to',
+    'transitions', 'true', 'type', 'units', 'value'])
+
+g_componentCategories = frozenset([
+    'thread', 'data', 'subprogram', 'process', 'processor', 'memory',
+    'bus', 'device', 'system'])
+
+# The keywords that start the subclauses of component types and implementations
+g_subclauses = frozenset([
+    'features', 'refines', 'subcomponents', 'calls', 'connections', 'flows',
+    'modes', 'properties', 'annex', 'end'])
+
+g_tokenRE = re.compile(r'''
+    (?P<ws>[ \t\f\v]+)
+  | (?P<newline>\r\n|\r|\n)
+  | (?P<comment>--[^\n\r]*)
+  | (?P<annex>\{\*\*.*?\*\*\})
+  | (?P<number>[0-9][0-9_]*(?:\#[0-9a-fA-F_]+\#(?:[eE]\+?[0-9]+)?|(?:\.[0-9][0-9_]*)?(?:[eE][+-]?[0-9]+)?))
+  | (?P<ident>[A-Za-z][A-Za-z0-9_]*)
+  | (?P<string>"(?:\\.|[^"\\])*")
+  | (?P<op>\+=>|->>|\]->|=>|::|->|-\[|\.\.|[-()\[\]{}:+*;,.\#])
+  | (?P<error>.)
+''', re.VERBOSE | re.DOTALL)
+
+# Like the ANTLR lexer, CR-LF, CR and LF all end a line - also inside the
+# annexes and the strings, which can span lines
+g_newlineRE = re.compile(r'\r\n|\r|\n')
+
+
+class AadlSyntaxError(Exception):
+    pass
+
+
+class AadlModel:
+    '''What the actions of the grammar collect from one AADL file (a
+    fragment of the model - see Merge).'''
+    def __init__(self, currentPackage: str = "") -> None:
+        self._signals = {}  # type: Dict[str, Signal]
+        self._apLevelContainers = {}  # type: Dict[str, ApLevelContainer]
+        self._subProgramImplementations = []  # type: List[List[Any]]
+        self._processImplementations = []  # type: List[List[Any]]
+        self._threadImplementations = []  # type: List[List[Any]]
+        self._systems = {}  # type: Dict[str, List[str]]
+        # Like the global of the ANTLR parser, this carries over to the next file
+        self._currentPackage = currentPackage
+        # The implementations of types that are declared in previous files:
+        # the line, the category, the (placeholder) type that collects the
+        # connections, and the index of the implementation in the list of
+        # its category - its language is None until it is inherited from
+        # the type.
+        self._externals = []  # type: List[Tuple[int, str, ApLevelContainer, int]]
+
+    def Implementations(self, category: str) -> Optional[List[List[Any]]]:  # pylint: disable=invalid-sequence-index
+        return {
+            'thread': self._threadImplementations,
+            'process': self._processImplementations,
+            'subprogram': self._subProgramImplementations,
+        }.get(category)
+
+    def AsDict(self) -> Dict[str, Any]:
+        '''The model, in the form that parse_aadl.py pickles it.'''
+        return {
+            'g_signals': self._signals,
+            'g_apLevelContainers': self._apLevelContainers,
+            'g_subProgramImplementations': self._subProgramImplementations,
+            'g_processImplementations': self._processImplementations,
+            'g_threadImplementations': self._threadImplementations,
+            'g_systems': self._systems,
+        }
+
+
+def Tokenize(filename: str, text: str) -> Tuple[List[str], List[str], List[int]]:  # pylint: disable=invalid-sequence-index
+    '''The kinds (keywords in lowercase, 'IDENT', 'NUMBER', 'STRING',
+    'ANNEX', or the operator itself), texts and lines of the tokens.'''
+    kinds = []  # type: List[str]
+    texts = []  # type: List[str]
+    lines = []  # type: List[int]
+    line = 1
+    for match in g_tokenRE.finditer(text):
+        group = match.lastgroup
+        value = match.group()
+        if group in ('ws', 'comment'):
+            continue
+        if group == 'newline':
+            line += 1
+            continue
+        if group == 'ident':
+            lowered = value.lower()
+            kinds.append(lowered if lowered in g_keywords else 'IDENT')
+        elif group == 'op':
+            kinds.append(value)
+        elif group == 'number':
+            kinds.append('NUMBER')
+        elif group == 'string':
+            kinds.append('STRING')
+        elif group == 'annex':
+            kinds.append('ANNEX')
+        else:
+            raise AadlSyntaxError(
+                "Error in file '%s': line %d: unexpected char: '%s'" % (filename, line, value))
+        texts.append(value)
+        lines.append(line)
+        if group in ('annex', 'string'):
+            line += len(g_newlineRE.findall(value))
+    kinds.append('EOF')
+    texts.append('<EOF>')
+    lines.append(line)
+    return kinds, texts, lines
+
+
+class Parser:
+    def __init__(self, model: AadlModel, filename: str, text: str) -> None:
+        self._model = model
+        self._filename = filename
+        self._kinds, self._texts, self._lines = Tokenize(filename, text)
+        self._pos = 0
+
+    # Token helpers
+
+    def LA(self, k: int = 1) -> str:
+        return self._kinds[min(self._pos + k - 1, len(self._kinds) - 1)]
+
+    def Line(self) -> int:
+        return self._lines[self._pos]
+
+    def Error(self, message: str) -> NoReturn:
+        raise AadlSyntaxError("Error in file '%s': line %d: %s" % (self._filename, self.Line(), message))
+
+    def Consume(self) -> str:
+        text = self._texts[self._pos]
+        self._pos += 1
+        return text
+
+    def Match(self, kind: str) -> str:
+        if self._kinds[self._pos] != kind:
+            self.Error("expecting %s, found '%s'" % (kind, self._texts[self._pos]))
+        return self.Consume()
+
+    def Accept(self, kind: str) -> bool:
+        if self._kinds[self._pos] == kind:
+            self._pos += 1
+            return True
+        return False
+
+    def Skip(self) -> None:
+        '''Skips a statement: everything up to the next ';' outside brackets.'''
+        depth = 0
+        while True:
+            kind = self.LA()
+            if kind == 'EOF':
+                self.Error("unexpected end of file")
+            elif kind in ('(', '[', '{'):
+                depth += 1
+            elif kind in (')', ']', '}'):
+                depth -= 1
+                if depth < 0:
+                    self.Error("unexpected '%s'" % kind)
+            elif kind == ';' and depth == 0:
+                self.Consume()
+                return
+            self.Consume()
+
+    def SkipBrackets(self) -> None:
+        '''Skips a bracketed group, e.g. a record value.'''
+        depth = 0
+        while True:
+            kind = self.LA()
+            if kind == 'EOF':
+                self.Error("unexpected end of file")
+            self.Consume()
+            if kind in ('(', '[', '{'):
+                depth += 1
+            elif kind in (')', ']', '}'):
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def SkipSubclause(self) -> None:
+        '''Skips a subclause (e.g. 'subcomponents') up to the next one.'''
+        self.Consume()
+        if self.LA() == 'type':  # refines type
+            self.Consume()
+        while self.LA() not in g_subclauses:
+            self.Skip()
+
+    def SkipDeclaration(self) -> None:
+        '''Skips everything up to (and including) 'end Name[.Impl];'.'''
+        depth = 0
+        while not (self.LA() == 'end' and depth == 0):
+            kind = self.LA()
+            if kind == 'EOF':
+                self.Error("unexpected end of file")
+            elif kind in ('(', '[', '{'):
+                depth += 1
+            elif kind in (')', ']', '}'):
+                depth -= 1
+            self.Consume()
+        self.EndOfDeclaration()
+
+    def EndOfDeclaration(self) -> None:
+        self.Match('end')
+        self.Match('IDENT')
+        if self.Accept('.'):
+            self.Match('IDENT')
+        self.Match(';')
+
+    # Declarations
+
+    def Specification(self) -> None:
+        self.Declaration()
+        while self.LA() != 'EOF':
+            self.Declaration()
+
+    def Declaration(self) -> None:
+        kind = self.LA()
+        if kind == 'package':
+            self.Package()
+        elif kind == 'annex':
+            self.Annex()
+        elif kind in ('property', 'port'):  # property sets, port group types
+            self.Consume()
+            self.SkipDeclaration()
+        elif kind in g_componentCategories:
+            self.ComponentClassifier()
+        else:
+            self.Error("unexpected token: '%s'" % self._texts[self._pos])
+
+    def Package(self) -> None:
+        self.Match('package')
+        self._model._currentPackage = self.PackageName()
+        if self.LA() not in ('public', 'private'):
+            self.Error("expecting public or private, found '%s'" % self._texts[self._pos])
+        while self.Accept('public') or self.Accept('private'):
+            while self.LA() not in ('public', 'private', 'end', 'properties'):
+                if self.LA() == 'annex':
+                    self.Annex()
+                elif self.LA() == 'port':
+                    self.Consume()
+                    self.SkipDeclaration()
+                else:
+                    self.ComponentClassifier()
+            if self.Accept('properties'):
+                while self.LA() not in ('public', 'private', 'end'):
+                    self.Skip()
+        self.Match('end')
+        self.PackageName()
+        self.Match(';')
+
+    def PackageName(self) -> str:
+        name = self.Match('IDENT')
+        while self.Accept('::'):
+            name += "::" + self.Match('IDENT')
+        return name
+
+    def Annex(self) -> None:
+        self.Match('annex')
+        self.Match('IDENT')
+        self.Match('ANNEX')
+        self.Match(';')
+
+    def ComponentClassifier(self) -> None:
+        category = self.LA()
+        if category not in g_componentCategories:
+            self.Error("expecting a component category, found '%s'" % self._texts[self._pos])
+        if category == 'thread' and self.LA(2) == 'group':
+            self.Consume()
+            self.Consume()
+            self.SkipDeclaration()
+        elif category in ('thread', 'process', 'subprogram', 'system', 'data'):
+            if self.LA(2) == 'implementation':
+                self.Implementation(category)
+            else:
+                self.ComponentType(category)
+        else:
+            self.Consume()
+            self.SkipDeclaration()
+
+    def ComponentType(self, category: str) -> None:
+        self.Consume()
+        line = self.Line()
+        name = self.Match('IDENT')
+        if self.Accept('extends'):
+            self.ClassifierReference()
+        sp = None  # type: Optional[ApLevelContainer]
+        if category == 'subprogram' or (category in ('thread', 'process') and not configMT.g_bOnlySubprograms):
+            sp = ApLevelContainer(name)
+            self._model._apLevelContainers[name] = sp
+        while self.LA() != 'end':
+            kind = self.LA()
+            if kind == 'features' and category != 'data':
+                features = self.Features()
+                if category == 'system':
+                    self._model._systems[name] = [
+                        x._sp for _, x in features
+                        if isinstance(x, AadlEventPort) and x._direction == "OUT"]
+                elif sp is not None:
+                    # Subprograms only take parameters, threads and processes ports
+                    self.AddParams(sp, features, AadlParameter if category == 'subprogram' else AadlPort)
+            elif kind == 'properties':
+                properties = self.PropertyAssociations(AadlPropertyAssociationNoModes)
+                if category == 'data':
+                    self.DataSignal(name, line, properties)
+                elif sp is not None:
+                    for prop in properties:
+                        if prop._name[-15:].lower() == "source_language":
+                            sp.SetLanguage(self.StripQuotes(prop._propertyExpressionOrList, prop._name))
+            elif kind == 'annex':
+                self.Annex()
+            elif kind in g_subclauses:
+                self.SkipSubclause()
+            else:
+                self.Error("unexpected token: '%s'" % self._texts[self._pos])
+        self.EndOfDeclaration()
+
+    def Implementation(self, category: str) -> None:
+        self.Consume()
+        self.Consume()
+        line = self.Line()
+        typeName = self.Match('IDENT')
+        self.Match('.')
+        implName = self.Match('IDENT')
+        implementations = self._model.Implementations(category)
+        sp = None  # type: Optional[ApLevelContainer]
+        implementation = None  # type: Optional[List[Any]]
+        if implementations is not None and (category == 'subprogram' or not configMT.g_bOnlySubprograms):
+            sp = self._model._apLevelContainers.get(typeName)
+            if sp is not None:
+                implementation = [typeName, implName, sp._language, ""]
+            else:
+                # Declared in a previous file (or nowhere) - Merge will tell
+                sp = ApLevelContainer(typeName)
+                implementation = [typeName, implName, None, ""]
+                self._model._externals.append((line, category, sp, len(implementations)))
+            implementations.append(implementation)
+        if self.Accept('extends'):
+            self.ClassifierReference()
+        while self.LA() != 'end':
+            kind = self.LA()
+            if kind == 'connections' and sp is not None:
+                for conn in self.Connections():
+                    sp.AddConnection(conn._from, conn._to)
+            elif kind == 'properties' and implementation is not None:
+                for assoc in self.PropertyAssociations(AadlContainedPropertyAssociation):
+                    if assoc._name[-15:].lower() == "source_language":
+                        implementation[2] = self.StripQuotes(assoc._value, assoc._name)
+                    if assoc._name[-15:].lower() == "fv_name":
+                        implementation[3] = self.StripQuotes(assoc._value, assoc._name)
+            elif kind == 'annex':
+                self.Annex()
+            elif kind in g_subclauses:
+                self.SkipSubclause()
+            else:
+                self.Error("unexpected token: '%s'" % self._texts[self._pos])
+        self.EndOfDeclaration()
+
+    # Features
+
+    def Features(self) -> List[Tuple[str, Any]]:  # pylint: disable=invalid-sequence-index
+        '''The ports and parameters of the component, as (name, port/param).'''
+        self.Match('features')
+        features = []  # type: List[Tuple[str, Any]]
+        if self.Accept('none'):
+            self.Match(';')
+            return features
+        while self.LA() not in g_subclauses:
+            name = self.Match('IDENT')
+            self.Match(':')
+            if self.Accept('refined'):
+                self.Match('to')
+            if self.LA() in ('in', 'out'):
+                direction = self.Direction()
+                if self.LA() == 'parameter':
+                    features.append((name, self.Parameter(direction)))
+                else:
+                    features.append((name, self.Port(direction)))
+            else:
+                # port groups, server subprograms and data/bus accesses
+                self.Skip()
+        return features
+
+    def Direction(self) -> str:
+        if self.Accept('in'):
+            return "INOUT" if self.Accept('out') else "IN"
+        self.Match('out')
+        return "OUT"
+
+    def Parameter(self, direction: str) -> Optional[AadlParameter]:
+        self.Match('parameter')
+        param = None
+        if self.LA() == 'IDENT':
+            param = AadlParameter(direction, self.ClassifierReference())
+            param._encoding = "UPER"
+        if self.LA() == '{':
+            properties = self.CurlyPropertyAssociations()
+            if param is not None:
+                encodings = [x._propertyExpressionOrList for x in properties if x._name.lower()[-8:] == "encoding"]
+                if len(encodings) == 1:
+                    param._encoding = self.Capitalize(encodings[0])
+        self.Match(';')
+        return param
+
+    def Port(self, direction: str) -> Optional[AadlPort]:
+        port = None  # type: Any
+        if self.Accept('event'):
+            if self.Accept('data'):
+                self.Match('port')
+                if self.LA() == 'IDENT':
+                    port = AadlEventDataPort("", self.ClassifierReference())
+            else:
+                self.Match('port')
+                port = AadlEventPort("", None)
+        else:
+            self.Match('data')
+            self.Match('port')
+            if self.LA() == 'IDENT':
+                port = AadlPort("", self.ClassifierReference())
+        if port is not None:
+            port._direction = direction
+            port._encoding = "UPER"
+        if self.LA() == '{':
+            properties = self.CurlyPropertyAssociations()
+            if port is not None:
+                encodings = [x._propertyExpressionOrList for x in properties if x._name.lower()[-8:] == "encoding"]
+                if len(encodings) == 1:
+                    port._encoding = self.Capitalize(encodings[0])
+                calledSubprograms = [x._propertyExpressionOrList for x in properties if x._name.lower() == "rcmoperation"]
+                if len(calledSubprograms) == 1:
+                    if not isinstance(port, AadlEventPort) or not isinstance(calledSubprograms[0], str):
+                        panic("Error in file '%s': RCMoperation must be the subprogram of an event port" % self._filename)
+                    port._sp = calledSubprograms[0][2:]
+        self.Match(';')
+        return port
+
+    def AddParams(self, sp: ApLevelContainer, features: List[Tuple[str, Any]], klass: Any) -> None:  # pylint: disable=invalid-sequence-index
+        for name, feature in features:
+            # (event ports carry no data, so they are not parameters)
+            if not isinstance(feature, klass):
+                continue
+            signal = self._model._signals.get(feature._type, feature._type)
+            if feature._direction == "IN":
+                param = InParam(sp._id, name, signal, feature)  # type: Param
+            elif feature._direction == "OUT":
+                param = OutParam(sp._id, name, signal, feature)
+            else:
+                param = InOutParam(sp._id, name, signal, feature)
+            sp.AddParam(param)
+
+    def DataSignal(self, name: str, line: int, properties: List[AadlPropertyAssociationNoModes]) -> None:  # pylint: disable=invalid-sequence-index
+        asnFilename = ""
+        asnNodename = ""
+        asnSize = -1
+        for prop in properties:
+            value = prop._propertyExpressionOrList
+            if prop._name.lower() == "source_text" and isinstance(value, str):
+                asnFilename = value[1:-1]
+            elif prop._name.lower() == "type_source_name" and isinstance(value, str):
+                asnNodename = value[1:-1]
+            elif prop._name.lower() == "source_data_size":
+                try:
+                    asnSize = int(value)
+                except (TypeError, ValueError):
+                    panic("Line %d: DATA (%s) must have source_data_size be declared as [0-9]B (not '%s')" % (line, name, value))
+        if asnFilename != "" and asnNodename != "" and asnSize != -1:
+            signal = Signal(asnFilename, asnNodename, asnSize)
+            self._model._signals[name] = signal
+            self._model._signals[self._model._currentPackage + "::" + name] = signal
+        else:
+            panic("Line %d: DATA (%s) must have Source_Text, Type_Source_Name and Source_Data_Size" % (line, name))
+
+    def ClassifierReference(self) -> str:
+        '''A (package-qualified) type name - the implementation is dropped.'''
+        packageName = None
+        name = self.Match('IDENT')
+        while self.Accept('::'):
+            packageName = name
+            name = self.Match('IDENT')
+        if self.Accept('.'):
+            self.Match('IDENT')
+        if packageName is None:
+            return self._model._currentPackage + "::" + name
+        return packageName + "::" + name
+
+    # Connections
+
+    def Connections(self) -> List[Connection]:  # pylint: disable=invalid-sequence-index
+        self.Match('connections')
+        connections = []  # type: List[Connection]
+        if self.Accept('none'):
+            self.Match(';')
+            return connections
+        while self.LA() not in g_subclauses:
+            if self.LA() == 'IDENT' and self.LA(2) == ':':
+                self.Consume()
+                self.Consume()
+                if self.LA() == 'refined':
+                    # (connection refinements are not supported)
+                    self.Skip()
+                    continue
+            if self.Accept('event'):
+                self.Accept('data')
+                self.Match('port')
+            elif self.Accept('data') or self.Accept('bus'):
+                if not self.Accept('port'):
+                    self.Match('access')
+            elif self.Accept('port'):
+                self.Match('group')
+            else:
+                self.Match('parameter')
+            source = self.UniquePortIdentifier()
+            if not self.Accept('->'):
+                self.Match('->>')
+            destination = self.UniquePortIdentifier()
+            connections.append(Connection(source, destination))
+            self.Skip()  # properties and modes
+        return connections
+
+    def UniquePortIdentifier(self) -> UniquePortIdentifier:
+        name = self.Match('IDENT')
+        if self.Accept('.'):
+            return UniquePortIdentifier(name, self.Match('IDENT'))
+        return UniquePortIdentifier(None, name)
+
+    # Properties
+
+    def PropertyAssociations(self, klass: Any) -> List[Any]:  # pylint: disable=invalid-sequence-index
+        self.Match('properties')
+        properties = []  # type: List[Any]
+        if self.Accept('none'):
+            self.Match(';')
+            return properties
+        while self.LA() not in g_subclauses:
+            properties.append(klass(*self.PropertyAssociation()))
+        return properties
+
+    def CurlyPropertyAssociations(self) -> List[AadlPropertyAssociationNoModes]:  # pylint: disable=invalid-sequence-index
+        self.Match('{')
+        properties = [AadlPropertyAssociationNoModes(*self.PropertyAssociation())]
+        while not self.Accept('}'):
+            properties.append(AadlPropertyAssociationNoModes(*self.PropertyAssociation()))
+        return properties
+
+    def PropertyAssociation(self) -> Tuple[str, Any]:
+        # The property set of the name is dropped
+        name = self.Match('IDENT')
+        if self.Accept('::'):
+            name = self.Match('IDENT')
+        if not self.Accept('=>'):
+            self.Match('+=>')
+        self.Accept('constant')
+        self.Accept('access')
+        value = self.PropertyValue()
+        if self.LA() != ';':
+            self.Skip()  # applies to, in binding, in modes
+        else:
+            self.Consume()
+        return name, value
+
+    def PropertyValue(self) -> Any:
+        '''The value of pe_or_list: the text of strings (with their quotes),
+        enumeration literals, classifiers and numbers (without sign and
+        units, and only the lower bound of ranges); None for the others.'''
+        if self.LA() == '[':
+            self.SkipBrackets()  # records
+            return None
+        if self.LA() != '(':
+            return self.PropertyExpression()
+        self.Consume()
+        if self.Accept(')'):
+            return None
+        value = self.PropertyExpression()
+        if self.LA() == ',':
+            # Lists have no value
+            while self.Accept(','):
+                self.PropertyExpression()
+            value = None
+        self.Match(')')
+        return value
+
+    def PropertyExpression(self) -> Any:
+        value = self.PropertyTerm()
+        while self.LA() in ('and', 'or'):
+            self.Consume()
+            self.PropertyTerm()
+            value = None
+        return value
+
+    def PropertyTerm(self) -> Any:
+        kind = self.LA()
+        if kind in ('STRING', 'IDENT'):
+            return self.Consume()
+        if kind in g_componentCategories:
+            self.Consume()
+            if kind == 'thread':
+                self.Accept('group')
+            if self.LA() == 'IDENT':
+                return self.ClassifierReference()
+            return None
+        if kind in ('NUMBER', '+', '-', 'value'):
+            return self.NumericTerm()
+        if kind == 'reference':
+            self.Consume()
+            self.Match('IDENT')
+            while self.Accept('.'):
+                self.Match('IDENT')
+        elif kind in ('true', 'false'):
+            self.Consume()
+        elif kind == 'not':
+            self.Consume()
+            self.PropertyTerm()
+        elif kind == '(':
+            self.Consume()
+            self.PropertyExpression()
+            self.Match(')')
+        else:
+            self.Error("unexpected token in property value: '%s'" % self._texts[self._pos])
+        return None
+
+    def NumericTerm(self) -> Optional[str]:
+        value = self.Number()
+        if self.Accept('..'):
+            self.Number()
+            if self.Accept('delta'):
+                self.Number()
+        return value
+
+    def Number(self) -> Optional[str]:
+        '''A signed number with its optional unit, or a property constant.'''
+        if not self.Accept('+'):
+            self.Accept('-')
+        if self.Accept('value'):
+            self.Match('(')
+            self.Match('IDENT')
+            if self.Accept('::'):
+                self.Match('IDENT')
+            self.Match(')')
+            return None
+        value = self.Match('NUMBER')
+        self.Accept('IDENT')
+        return value
+
+    def StripQuotes(self, value: Any, name: str) -> str:
+        if not isinstance(value, str):
+            panic("Error in file '%s': the value of %s must be a string or an identifier" % (self._filename, name))
+        return value.replace("\"", "")
+
+    def Capitalize(self, value: Any) -> str:
+        if not isinstance(value, str):
+            panic("Error in file '%s': encodings must be identifiers" % self._filename)
+        return value.capitalize()
+
+
+def ParseAADLfile(filename: str, currentPackage: str = "") -> AadlModel:
+    '''Parses one AADL file, starting in the given package (the one that
+    the previous file ended in). Raises AadlSyntaxError for input that
+    the parser doesn't recognize.'''
+    inform("Parsing %s...", filename)
+    with open(filename, encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    model = AadlModel(currentPackage)
+    Parser(model, filename, text).Specification()
+    return model
+
+
+def Merge(fragments: List[AadlModel]) -> Dict[str, Any]:  # pylint: disable=invalid-sequence-index
+    '''Merges the models of the AADL files (in the order of the files) and
+    resolves all references to AADL data types into the param._signal
+    member of each subprogram param. Returns the model in the form that
+    parse_aadl.py pickles it.'''
+    model = AadlModel()
+    for fragment in fragments:
+        # The types must be declared before they are implemented
+        for line, category, placeholder, index in fragment._externals:
+            sp = model._apLevelContainers.get(placeholder._id)
+            if sp is None:
+                panic("Line %d: %s (%s) must first be declared before it is implemented" % (
+                    line, category.capitalize(), placeholder._id))
+            sp._connections.extend(placeholder._connections)
+            implementation = fragment.Implementations(category)[index]  # type: ignore
+            if implementation[2] is None:
+                implementation[2] = sp._language
+        model._signals.update(fragment._signals)
+        model._apLevelContainers.update(fragment._apLevelContainers)
+        model._subProgramImplementations.extend(fragment._subProgramImplementations)
+        model._processImplementations.extend(fragment._processImplementations)
+        model._threadImplementations.extend(fragment._threadImplementations)
+        model._systems.update(fragment._systems)
+
+    # Resolve signal definitions over all input AADL files
+    for subProgramName, subProgram in model._apLevelContainers.items():
+        inform("Resolving data definitions in subprogram %s...", subProgramName)
+        for param in subProgram._params:
+            if not isinstance(param._signal, Signal):
+                if param._signal not in model._signals:
+                    panic("Unknown data type %s in the definition of %s!\n" % (
+                        param._signal, subProgramName))
+                param._signal = model._signals[param._signal]
+    return model.AsDict()
+
+
+def ParseAADLfiles(listOfFilenames: List[str]) -> Dict[str, Any]:  # pylint: disable=invalid-sequence-index
+    '''Parses the AADL files and merges their models (see Merge).'''
+    fragments = []  # type: List[AadlModel]
+    currentPackage = ""
+    for aadlFilename in listOfFilenames:
+        fragment = ParseAADLfile(aadlFilename, currentPackage)
+        currentPackage = fragment._currentPackage
+        fragments.append(fragment)
+    return Merge(fragments)
@@ -97,7 +97,9 @@
 #     So alwaysPresent is NOT the negative of alwaysPresent:
 #     a field can be optional, OR always present, OR always absent
 
-from typing import List, Union, Dict, Any  # NOQA pylint: disable=unused-import
+import sys
+
+from typing import List, Union, Dict, Any, Iterator  # NOQA pylint: disable=unused-import
 
 from . import utility
 
@@ -106,11 +108,23 @@ AsnSequenceOrSet = Union['AsnSequence', 'AsnSet']
 AsnSequenceOrSetOf = Union['AsnSequenceOf', 'AsnSetOf']
 
 
+def Intern(name: Any) -> Any:
+    '''Returns the interned version of a (type, field or file) name, so that
+    the many nodes referring to the same name share a single string.'''
+    return sys.intern(name) if isinstance(name, str) else name
+
+
+# The AST nodes use __slots__: grammars with tens of thousands of types
+# create hundreds of thousands of nodes, and a per-instance __dict__
+# would dominate their memory footprint. Subclasses must therefore
+# declare (in their __slots__) any new attribute they set.
+
 class AsnNode:
+    __slots__ = ('_name', '_leafType', '_asnFilename', '_lineno', '_isArtificial', 'hasAcnEncDec')
 
     def __init__(self, asnFilename: str) -> None:
         self._leafType = "unknown"
-        self._asnFilename = asnFilename
+        self._asnFilename = Intern(asnFilename)
         self._lineno = -1
         self._isArtificial = False
         self.hasAcnEncDec = True
@@ -126,11 +140,15 @@ class AsnNode:
 
 
 class AsnBasicNode(AsnNode):
+    __slots__ = ()
+
     def __init__(self, asnFilename: str) -> None:
         AsnNode.__init__(self, asnFilename)
 
 
 class AsnComplexNode(AsnNode):
+    __slots__ = ()
+
     def __init__(self, asnFilename: str) -> None:
         AsnNode.__init__(self, asnFilename)
 
@@ -160,6 +178,7 @@ Members:
     _name : the name of the type (or var)
     _bDefaultValue : one of True,False,None.
 '''
+    __slots__ = ('_bDefaultValue',)
     validOptions = ['bDefaultValue', 'lineno', 'asnFilename']
 
     def __init__(self, **args: Any) -> None:
@@ -192,6 +211,7 @@ Members:
     _range : a tuple containing the valid range for the integer or []
     _iDefaultValue : either None, or the default value for this integer
 '''
+    __slots__ = ('_range', '_iDefaultValue')
     validOptions = ['range', 'iDefaultValue', 'lineno', 'asnFilename']
 
     def __init__(self, **args: Any) -> None:
@@ -235,6 +255,7 @@ Members:
                       Or [].
     _dbDefaultValue : either None, or the default value for this real
 '''
+    __slots__ = ('_range', '_mantissaRange', '_baseRange', '_exponentRange', '_dbDefaultValue')
     validOptions = ['range', 'mantissa', 'base', 'exponent', 'defaultValue', 'lineno', 'asnFilename']
 
     def __init__(self, **args: Any) -> None:
@@ -286,6 +307,7 @@ Members:
     _name : the name of the type (or var)
     _range : a tuple containing the allowed string size or []
 '''
+    __slots__ = ('_range', '_pseudoname')
     validOptions = ['range', 'lineno', 'asnFilename']
 
     def __init__(self, **args: Any) -> None:
@@ -322,6 +344,7 @@ Members:
 
 class AsnOctetString(AsnString):
     '''This class stores the semantic content of an ASN.1 OCTET STRING.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)
@@ -338,6 +361,7 @@ class AsnOctetString(AsnString):
 
 class AsnUTF8String(AsnString):
     '''This class stores the semantic content of an ASN.1 UTF8String.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)  # pragma: no cover
@@ -347,6 +371,7 @@ class AsnUTF8String(AsnString):
 
 class AsnAsciiString(AsnString):
     '''This class stores the semantic content of an ASN.1 AsciiString.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)  # pragma: no cover
@@ -356,6 +381,7 @@ class AsnAsciiString(AsnString):
 
 class AsnNumberString(AsnString):
     '''This class stores the semantic content of an ASN.1 NumberString.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)  # pragma: no cover
@@ -365,6 +391,7 @@ class AsnNumberString(AsnString):
 
 class AsnVisibleString(AsnString):
     '''This class stores the semantic content of an ASN.1 VisibleString.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)  # pragma: no cover
@@ -374,6 +401,7 @@ class AsnVisibleString(AsnString):
 
 class AsnPrintableString(AsnString):
     '''This class stores the semantic content of an ASN.1 PrintableString.'''
+    __slots__ = ()
 
     def __init__(self, **args: Any) -> None:
         AsnString.__init__(self, **args)  # pragma: no cover
@@ -397,6 +425,7 @@ Members:
     _default : if one of the values of the enumeration is the default,
                it is contained in this member
 '''
+    __slots__ = ('_members', '_default', '_pseudoname')
     validOptions = ['members', 'default', 'lineno', 'asnFilename']
 
     def __init__(self, **args: Any) -> None:
@@ -440,6 +469,54 @@ Members:
         return 'ENUMERATED {' + ", ".join(ret) + "}"
 
 
+class AsnMember:
+    '''
+A child element of a SEQUENCE, SET or CHOICE - the record stored in their
+_members (see the diagram at the top). It is indexed like the tuple
+    (name, type, enumID, optional, alwaysPresent, alwaysAbsent)
+...but the type (index 1) can be replaced in place, as is done
+when inner types are given names of their own.
+'''
+    __slots__ = ('_varName', '_type', '_enumID', '_optional', '_alwaysPresent', '_alwaysAbsent')
+
+    def __init__(
+            self, varName: str, asnType: AsnNode, enumID: Union[None, str] = None,
+            optional: bool = False, alwaysPresent: bool = False, alwaysAbsent: bool = False) -> None:
+        self._varName = Intern(varName)
+        self._type = asnType
+        self._enumID = Intern(enumID)
+        self._optional = optional
+        self._alwaysPresent = alwaysPresent
+        self._alwaysAbsent = alwaysAbsent
+
+    def __getitem__(self, idx: Union[int, slice]) -> Any:
+        if isinstance(idx, slice):
+            return tuple(self)[idx]
+        return getattr(self, AsnMember.__slots__[idx])
+
+    def __setitem__(self, idx: int, value: Any) -> None:
+        setattr(self, AsnMember.__slots__[idx], value)
+
+    def __len__(self) -> int:
+        return len(AsnMember.__slots__)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (getattr(self, x) for x in AsnMember.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        # ...as the lists that the members used to be (and that the members
+        # built outside the parser still are)
+        if isinstance(other, (AsnMember, list, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return repr(tuple(self))
+
+
 TypeWithMembers = Union['AsnSequence', 'AsnSet', 'AsnChoice']
 
 
@@ -483,14 +560,15 @@ class AsnSequence(AsnComplexNode):
 This class stores the semantic content of an ASN.1 SEQUENCE.
 Members:
     _name : the name of the type
-    _members    : a tuple of all child elements. Each tuple contains
-                  many elements: the name of the variable, the type itself
+    _members    : a list of all child elements. Each one (an AsnMember)
+                  contains many elements: the name of the variable, the type itself
                   (as an AsnInt, AsnReal, ... or an AsnMetaMember),
                   an optionality boolean (true mean OPTIONAL),
                   and two more booleans to indicate alwaysAbsent
                   and alwaysPresent semantics. See comment at the
                   top diagram for more info.
 '''
+    __slots__ = ('_members',)
     validOptions = ['members', 'lineno', 'asnFilename']
 
     def __init__(self, **args: Any) -> None:
@@ -533,6 +611,7 @@ Members:
 
 
 class AsnSet(AsnComplexNode):
+    __slots__ = ('_members',)
 
     def __init__(self, **args: Any) -> None:
         AsnComplexNode.__init__(self, args.get('asnFilename', ''))
@@ -582,6 +661,7 @@ Members:
                   two elements: the name of the variable and the
                   type itself (as an AsnInt, AsnReal, ... or an AsnMetaMember).
 '''
+    __slots__ = ('_members',)
     validOptions = ['members', 'lineno', 'asnFilename']
 
     def __init__(self, **args: Any) -> None:
@@ -660,12 +740,13 @@ Members:
     _containedType : the contained element (either a string or AsnNode)
     _range : [] or a tuple with the allowed size range.
 '''
+    __slots__ = ('_range', '_containedType')
     validOptions = ['range', 'containedType', 'lineno', 'asnFilename']
 
     def __init__(self, **args: Any) -> None:
         AsnComplexNode.__init__(self, args.get('asnFilename', ''))
         self._range = args.get('range', [])
-        self._containedType = args.get('containedType', None)
+        self._containedType = Intern(args.get('containedType', None))
         self._lineno = args.get('lineno', None)
         self._name = "unnamed"  # default in case of SEQUENCE_OF SEQUENCE_OF
         self._leafType = "SEQUENCEOF"
@@ -694,11 +775,12 @@ Members:
 
 
 class AsnSetOf(AsnComplexNode):
+    __slots__ = ('_range', '_containedType')
 
     def __init__(self, **args: Any) -> None:
         AsnComplexNode.__init__(self, args.get('asnFilename', ''))
         self._range = args.get('range', [])
-        self._containedType = args.get('containedType', None)
+        self._containedType = Intern(args.get('containedType', None))
         self._lineno = args.get('lineno', None)
         self._name = "unnamed"  # default in case of SEQUENCE_OF SEQUENCE_OF
         self._leafType = "SETOF"
@@ -733,12 +815,13 @@ CHOICE or SEQUENCE.
 Members:
     _containedType : the contained element as a string (type name)
 '''
+    __slots__ = ('_containedType', '_Min', '_Max')
     validOptions = ['containedType', 'Min', 'Max', 'lineno', 'asnFilename']
 
     def __init__(self, **args: Any) -> None:
         AsnNode.__init__(self, args.get('asnFilename', ''))
-        self._leafType = args.get('containedType', None)
-        self._containedType = args.get('containedType', None)
+        self._leafType = Intern(args.get('containedType', None))
+        self._containedType = self._leafType
         self._lineno = args.get('lineno', None)
         self._Min = args.get('Min', None)
         self._Max = args.get('Max', None)
@@ -765,12 +848,13 @@ e.g.:
     _name contains 'MyNewType'
     _containedType contains 'MyOldType'
 '''
+    __slots__ = ('_containedType', '_Min', '_Max')
     validOptions = ['containedType', 'Min', 'Max', 'lineno', 'asnFilename']
 
     def __init__(self, **args: Any) -> None:
         AsnNode.__init__(self, args.get('asnFilename', ''))
-        self._leafType = args.get('containedType', None)
-        self._containedType = args.get('containedType', None)
+        self._leafType = Intern(args.get('containedType', None))
+        self._containedType = self._leafType
         self._lineno = args.get('lineno', None)
         self._Min = args.get('Min', None)
         self._Max = args.get('Max', None)
@@ -51,27 +51,32 @@ inside configMT.inputCodeAST, for use with the code generators.
 import os
 import sys
 import copy
+import types
+import atexit
 import tempfile
 import re
-from distutils import spawn
-import hashlib
+import shutil
 
 import xml.sax  # type: ignore
-from typing import IO, TypeVar, Type, Optional, Callable, Union, List, Set, Dict, Tuple, Any  # NOQA pylint: disable=W0611
+import xml.sax.saxutils  # type: ignore
+from typing import (  # NOQA pylint: disable=W0611
+    IO, TypeVar, Type, Optional, Callable, Union, List, Set, Dict, Tuple, Any,
+    Mapping, NamedTuple, Sequence)
 
 from . import configMT
 from . import utility
+from . import buildCache
+from . import instrumentation
 
 from .asnAST import (
     AsnBasicNode, AsnEnumerated, AsnSequence, AsnChoice, AsnSequenceOf,
     AsnSet, AsnSetOf, AsnMetaMember, AsnMetaType, AsnInt, AsnReal, AsnNode,
-    AsnComplexNode, AsnBool, AsnOctetString, AsnAsciiString
+    AsnBool, AsnOctetString, AsnAsciiString, AsnMember, Intern
 )
 
 g_asnFilename = ""
 
 g_filename = ''
-g_metatypes = {}
 
 # MyPy type aliases
 Typename = str
@@ -83,14 +88,71 @@ AST_Leaftypes = Dict[Typename, str]
 AST_Modules = Dict[str, List[Typename]]  # pylint: disable=invalid-sequence-index
 AST_AdaUses = Dict[str, Set[Typename]]  # pylint: disable=invalid-sequence-index
 
-g_names = {}         # type: AST_Lookup
-g_typesOfFile = {}   # type: AST_TypenamesOfFile
-g_leafTypeDict = {}  # type: AST_Leaftypes
-g_astOfFile = {}     # type: AST_TypesOfFile
-g_modules = {}       # type: AST_Modules
-g_adaUses = {}       # type: AST_AdaUses
 
-g_checkedSoFarForKeywords = {}  # type: Dict[str, int]
+class AsnModel:
+    '''The parsed (and resolved) contents of a set of ASN.1 files.
+
+    All the parsing functions work on the model they are given, so
+    different grammars can be loaded in parallel - in different threads,
+    or one after the other in a long-lived process. By default they work
+    on g_model, whose maps are also available as the module globals below
+    (g_names, g_leafTypeDict, ...) for the code that still uses them.'''
+    def __init__(self) -> None:
+        self._names = {}         # type: AST_Lookup
+        self._typesOfFile = {}   # type: AST_TypenamesOfFile
+        self._leafTypeDict = {}  # type: AST_Leaftypes
+        self._astOfFile = {}     # type: AST_TypesOfFile
+        self._modules = {}       # type: AST_Modules
+        self._adaUses = {}       # type: AST_AdaUses
+        self._metatypes = {}     # type: Dict[Typename, Typename]
+        self._checkedSoFarForKeywords = {}  # type: Dict[str, int]
+        # A read-only view of _leafTypeDict (which is always updated in place)
+        self._leafTypesView = types.MappingProxyType(self._leafTypeDict)
+        # The ASN1SCC XML AST - which is only parsed on demand (e.g. by
+        # PrintGrammarFromAST) since the Asn* nodes are created while streaming
+        self._xmlASTfilename = None  # type: Optional[str]
+        self._xmlASTrootNode = None  # type: Optional[Element]
+
+    def Reset(self) -> None:
+        '''Forgets the grammar loaded so far. (The maps are cleared in place,
+        since the module globals below refer to those of g_model.)'''
+        for d in [self._names, self._typesOfFile, self._leafTypeDict, self._astOfFile, self._modules,
+                  self._adaUses, self._metatypes, self._checkedSoFarForKeywords]:
+            d.clear()  # type: ignore
+        self._xmlASTfilename = None
+        self._xmlASTrootNode = None
+
+
+g_model = AsnModel()
+
+# Compatibility shim: the maps of the default model, used by the mappers
+g_names = g_model._names
+g_typesOfFile = g_model._typesOfFile
+g_leafTypeDict = g_model._leafTypeDict
+g_astOfFile = g_model._astOfFile
+g_modules = g_model._modules
+g_adaUses = g_model._adaUses
+g_metatypes = g_model._metatypes
+g_checkedSoFarForKeywords = g_model._checkedSoFarForKeywords
+
+# The types of one ASN.1 file (see ViewOfFile)
+AST_FileView = NamedTuple('AST_FileView', [
+    ('names', Mapping[Typename, AsnNode]),  # map Typename to type definition class from asnAST
+    ('nodes', Sequence[AsnNode]),           # list of nameless type definitions
+    ('leafTypes', Mapping[Typename, str]),  # map from Typename to leafType
+])
+
+# The fully resolved state of the globals above is stored in PROJECT_CACHE,
+# next to the ASN1SCC XML dump. Bump this whenever the asnAST classes or
+# the set of persisted globals change, to invalidate older snapshots.
+g_snapshotVersion = 3
+
+# Version of the per-file fragments of the XML AST, used by
+# RecompileChangedFiles to only recompile the files that changed
+g_fragmentVersion = 2
+g_asn1FileRE = re.compile(r'<Asn1File\b[^>]*\bFileName="([^"]*)".*?</Asn1File>', re.S)
+g_asn1ModuleRE = re.compile(r'<Asn1Module\b[^>]*\bID="([^"]*)"')
+g_importedModuleRE = re.compile(r'<ImportedModule\b[^>]*\bID="([^"]*)"')
 
 g_invalidKeywords = [
     "active", "adding", "all", "alternative", "and", "any", "as", "atleast", "axioms", "block", "call", "channel", "comment", "connect", "connection", "constant", "constants", "create", "dcl", "decision", "default", "else", "endalternative", "endblock", "endchannel", "endconnection", "enddecision", "endgenerator", "endmacro", "endnewtype", "endoperator", "endpackage", "endprocedure", "endprocess", "endrefinement", "endselect", "endservice", "endstate", "endsubstructure", "endsyntype", "endsystem", "env", "error", "export", "exported", "external", "fi", "finalized", "for", "fpar", "from", "gate", "generator", "if", "import", "imported", "in", "inherits", "input", "interface", "join", "literal", "literals", "macro", "macrodefinition", "macroid", "map", "mod", "nameclass", "newtype", "nextstate", "nodelay", "noequality", "none", "not", "now", "offspring", "operator", "operators", "or", "ordering", "out", "output", "package", "parent", "priority", "procedure", "process", "provided", "redefined", "referenced", "refinement", "rem", "remote", "reset", "return", "returns", "revealed", "reverse", "save", "select", "self", "sender", "service", "set", "signal", "signallist", "signalroute", "signalset", "spelling", "start", "state", "stop", "struct", "substructure", "synonym", "syntype", "system", "task", "then", "this", "to", "type", "use", "via", "view", "viewed", "virtual", "with", "xor", "end", "i", "j", "auto", "const",
@@ -106,6 +168,9 @@ tokens = (
 
 lotokens = [tkn.lower() for tkn in tokens]
 
+# For O(1) lookups in IsInvalidType
+g_invalidNames = frozenset(g_invalidKeywords + lotokens)
+
 
 # Parsing rules
 
@@ -121,168 +186,138 @@ reserved = {
 }
 
 
-def KnownType(node: AsnNode, names: AST_Lookup) -> bool:
-    retVal = True
-    if isinstance(node, str):
-        utility.panic("Referenced type (%s) does not exist!\n" % node)
-    if isinstance(node, (AsnBasicNode, AsnEnumerated)):
-        pass
-    elif isinstance(node, (AsnSequence, AsnChoice, AsnSet)):
-        for x in node._members:
-            if not KnownType(x[1], names):
-                return False
-    elif isinstance(node, AsnMetaMember):
-        retVal = KnownType(names.get(node._containedType, node._containedType), names)
-    elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
-        containedType = node._containedType
-        while isinstance(containedType, str):
-            containedType = names[containedType]
-        retVal = KnownType(containedType, names)
-    elif isinstance(node, AsnMetaType):
-        retVal = KnownType(names.get(node._containedType, node._containedType), names)
-    else:
-        utility.panic("Unknown node type (%s)!\n" % str(node))
-    return retVal
+def TypeReferences(node: AsnNode) -> List[Tuple[str, AsnNode]]:  # pylint: disable=invalid-sequence-index
+    '''Returns the names of all the types that this node refers to,
+    (including the ones referenced from its inner, nameless types)
+    together with the node that carries each reference.'''
+    refs = []  # type: List[Tuple[str, AsnNode]]
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (AsnBasicNode, AsnEnumerated)):
+            pass
+        elif isinstance(node, (AsnSequence, AsnChoice, AsnSet)):
+            pending.extend(reversed([x[1] for x in node._members]))
+        elif isinstance(node, (AsnMetaMember, AsnMetaType)):
+            refs.append((node._containedType, node))
+        elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
+            if isinstance(node._containedType, str):
+                refs.append((node._containedType, node))
+            else:
+                pending.append(node._containedType)
+        else:
+            utility.panic("Unknown node type (%s)!\n" % str(node))
+    return refs
 
 
 def CleanNameForAST(name: str) -> str:
     return re.sub(r'[^a-zA-Z0-9_]', '_', name)
 
 
-def VerifyAndFixAST() -> Dict[str, str]:
+def ResolutionOrder(model: AsnModel) -> List[str]:  # pylint: disable=invalid-sequence-index
+    '''Sorts the types in model._names so that every type comes after all the
+    types it references. This is a single depth-first traversal of the
+    type dependency graph, so it is linear in the size of the grammar.
+    Undefined types and circular references are reported with their locations.'''
+    def where(node: AsnNode) -> str:
+        return "file %s, line %s" % (node._asnFilename, node._lineno)
+
+    references = {}  # type: Dict[str, List[Tuple[str, AsnNode]]]
+    undefined = []  # type: List[str]
+    for nodeTypename, node in model._names.items():
+        # AsnMetaMembers can only appear inside SEQUENCEs and CHOICEs,
+        # not at the top level!
+        assert not isinstance(node, AsnMetaMember)
+        references[nodeTypename] = TypeReferences(node)
+        for ref, refNode in references[nodeTypename]:
+            if ref not in model._names:
+                undefined.append(
+                    "'%s' (referenced by %s in %s)" % (ref, nodeTypename, where(refNode)))
+    if undefined:
+        utility.panic('AsnParser: Types remain unknown after symbol fixup:\n\t%s\n' % '\n\t'.join(undefined))
+
+    order = []  # type: List[str]
+    # Missing: not visited yet, 1: in the current path, 2: completed
+    state = {}  # type: Dict[str, int]
+    cycles = []  # type: List[str]
+    for root in model._names:
+        if root in state:
+            continue
+        state[root] = 1
+        path = [(root, iter(references[root]))]
+        while path:
+            nodeTypename, pendingRefs = path[-1]
+            for ref, refNode in pendingRefs:
+                if ref not in state:
+                    state[ref] = 1
+                    path.append((ref, iter(references[ref])))
+                    break
+                if state[ref] == 1:
+                    loop = [x for x, _ in path]
+                    loop = loop[loop.index(ref):] + [ref]
+                    cycles.append(
+                        "%s (closed by the reference in %s)" % (" -> ".join(loop), where(refNode)))
+            else:
+                state[nodeTypename] = 2
+                order.append(nodeTypename)
+                path.pop()
+    if cycles:
+        utility.panic('AsnParser: Circular type references are not supported:\n\t%s\n' % '\n\t'.join(cycles))
+    return order
+
+
+def VerifyAndFixAST(model: AsnModel = g_model) -> Dict[str, str]:
     '''Check that all types are defined and are not missing.
     It returns a map providing the leafType of each type.
     '''
-    unknownTypes = {}  # type: Dict[str, int]
-    knownTypes = {}    # type: Dict[str, str]
-    equivalents = {}   # type: Dict[str, List[str]]
-    while True:  # pylint: disable=too-many-nested-blocks
-        lastUnknownTypes = copy.copy(unknownTypes)
-        lastKnownTypes = copy.copy(knownTypes)
-        lastEquivalents = copy.copy(equivalents)
-        for nodeTypename in list(g_names.keys()):
-
-            node = g_names[nodeTypename]  # type: AsnNode
-
-            # AsnMetaMembers can only appear inside SEQUENCEs and CHOICEs,
-            # not at the top level!
-            assert not isinstance(node, AsnMetaMember)
-
-            # Type level typedefs are stored in the equivalents dictionary
-            if isinstance(node, AsnMetaType):
-                # A ::= B
-                # A and B are nodeTypename  and  node._containedType
-                equivalents.setdefault(node._containedType, [])
-                # Add A to the list of types that are equivalent to B
-                equivalents[node._containedType].append(nodeTypename)
-                # and if we know B's leafType, then we also know A's
-                if node._containedType in knownTypes:
-                    knownTypes[nodeTypename] = node._containedType
-                else:
-                    unknownTypes[nodeTypename] = 1
-            # AsnBasicNode type assignments are also equivalents
-            elif isinstance(node, AsnBasicNode):
-                # node._leafType is one of BOOLEAN, OCTET STRING, INTEGER, etc
-                equivalents.setdefault(node._leafType, [])
-                equivalents[node._leafType].append(nodeTypename)
-                knownTypes[nodeTypename] = node._leafType
-            # AsnEnumerated types are known types - they don't have external refs
-            elif isinstance(node, AsnEnumerated):
-                # node._leafType is ENUMERATED
-                knownTypes[nodeTypename] = node._leafType
-            # SEQUENCEs and CHOICEs: check their children for unknown AsnMetaMembers
-            elif isinstance(node, (AsnSequence, AsnChoice, AsnSet)):
-                bFoundUnknown = False
-                for x in node._members:
-                    if isinstance(x[1], AsnMetaMember) and x[1]._containedType not in knownTypes:
-                        bFoundUnknown = True
-                        break
-                if bFoundUnknown:
-                    unknownTypes[nodeTypename] = 1
-                else:
-                    # node._leafType is SEQUENCE or CHOICE
-                    knownTypes[nodeTypename] = node._leafType
-            # SEQUENCE OFs: check their contained type
-            elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
-                if node._containedType in knownTypes or isinstance(node._containedType, AsnBasicNode):
-                    knownTypes[nodeTypename] = node._leafType
-                elif isinstance(node._containedType, AsnComplexNode):
-                    knownTypes[nodeTypename] = node._leafType
-                else:
-                    unknownTypes[nodeTypename] = 1
-
-        # We have completed a sweep over all AST entries.
-        # now check the knownTypes and unknownTypes information
-        # to see if we have figured out (leafType wise) all nodes
-        for known in list(knownTypes.keys()):
-            # for each of the nodes we know (leafType wise)
-
-            # remove it from the unknownTypes dictionary
-            if known in unknownTypes:
-                del unknownTypes[known]
-
-            # remove all it's equivalents, too (from the unknownTypes)
-            if known in equivalents:
-                for alsoKnown in equivalents[known]:
-                    if alsoKnown in unknownTypes:
-                        del unknownTypes[alsoKnown]
-
-                    # Additionally, follow the chain to the last knownType
-                    seed = known
-                    while seed in knownTypes:
-                        if seed != knownTypes[seed]:
-                            seed = knownTypes[seed]
-                        else:
-                            break
-                    # and update knownTypes dictionary to contain leafType
-                    knownTypes[alsoKnown] = seed
-
-        # If this pass has not changed the knownTypes and the unknownTypes and the equivalents, we are done
-        if lastEquivalents == equivalents and lastKnownTypes == knownTypes and lastUnknownTypes == unknownTypes:
-            break
-
-    if unknownTypes:
-        utility.panic('AsnParser: Types remain unknown after symbol fixup:\n%s\n' % list(unknownTypes.keys()))
+    order = ResolutionOrder(model)
+
+    # Since each type comes after the types it references, the leafType
+    # of a typedef (A ::= B) is already known when we reach it.
+    knownTypes = {}  # type: Dict[str, str]
+    for nodeTypename in order:
+        node = model._names[nodeTypename]
+        if isinstance(node, AsnMetaType):
+            knownTypes[nodeTypename] = knownTypes[node._containedType]
+        else:
+            # BOOLEAN, OCTET STRING, INTEGER, ..., ENUMERATED, SEQUENCE, CHOICE, etc
+            knownTypes[nodeTypename] = node._leafType
+
+    # For typedefs, model._metatypes keeps the type that the chain of typedefs
+    # "stops" at when resolved in declaration order: the first type that is
+    # either not a typedef, or is declared before the typedef itself.
+    # Walking the typedefs backwards, we can jump over entire chain segments
+    # via the stops of the (later declared) typedefs we pass through.
+    position = {nodeTypename: i for i, nodeTypename in enumerate(model._names)}
+    stops = {}  # type: Dict[str, str]
+    for nodeTypename in reversed(list(model._names.keys())):
+        node = model._names[nodeTypename]
+        if isinstance(node, AsnMetaType):
+            stop = node._containedType
+            while isinstance(model._names[stop], AsnMetaType) and position[stop] > position[nodeTypename]:
+                stop = stops[stop]
+            stops[nodeTypename] = stop
+    for nodeTypename in model._names:
+        if nodeTypename in stops:
+            model._metatypes[nodeTypename] = stops[nodeTypename]
 
     # Remove all AsnMetaTypes from the ast
-    # by using the g_names lookup on their _containedType
-    for nodeTypename in list(g_names.keys()):
-        # Min, Max: to cope with ReferenceTypes that redefine their
-        # constraints (for now, ASN1SCC provides only INTEGERs)
-        Min = Max = None
-        node = g_names[nodeTypename]
-        if hasattr(node, "_Min") and Min is None:
-            Min = node._Min  # type: ignore
-        if hasattr(node, "_Max") and Max is None:
-            Max = node._Max  # type: ignore
-        originalNode = node
-        while isinstance(node, AsnMetaType):
-            g_metatypes[nodeTypename] = node._containedType
-            node = g_names[node._containedType]
-            if hasattr(node, "_Min") and Min is None:
-                Min = node._Min  # type: ignore
-            if hasattr(node, "_Max") and Max is None:
-                Max = node._Max  # type: ignore
-        # To cope with ReferenceTypes that redefine their
-        # constraints (for now, ASN1SCC provides only INTEGERs)
-        if isinstance(originalNode, AsnMetaType):
-            target = copy.copy(node)  # type: ignore
+    # by using the model._names lookup on their _containedType
+    # (following the same order, each typedef points to an already fixed node)
+    for nodeTypename in order:
+        node = model._names[nodeTypename]
+        if isinstance(node, AsnMetaType):
+            target = copy.copy(model._names[node._containedType])  # type: ignore
             # we need to keep the _asnFilename
-            target._asnFilename = originalNode._asnFilename
-            if isinstance(node, AsnInt) and Min is not None and Max is not None:
-                target._range = [Min, Max]  # type: ignore
-            target._isArtificial = originalNode._isArtificial
-        elif isinstance(node, AsnInt) and Min is not None and Max is not None:
-            target = copy.copy(node)  # we need to keep the Min/Max
-            target._range = [Min, Max]
-            target._isArtificial = originalNode._isArtificial
-        else:
-            target = node
-        g_names[nodeTypename] = target
-
-    for name, node in list(g_names.items()):
-        if not KnownType(node, g_names):
-            utility.panic("Node %s not resolvable (%s)!\n" % (name, node.Location()))
+            target._asnFilename = node._asnFilename
+            # Min, Max: to cope with ReferenceTypes that redefine their
+            # constraints (for now, ASN1SCC provides only INTEGERs)
+            if isinstance(target, AsnInt) and node._Min is not None and node._Max is not None:
+                target._range = [node._Min, node._Max]  # type: ignore
+            target._isArtificial = node._isArtificial
+            model._names[nodeTypename] = target
+
+    for node in model._names.values():
         for i in ["_Min", "_Max"]:
             cast = float if isinstance(node, AsnReal) else int
             if hasattr(node, i) and getattr(node, i) is not None:
@@ -301,13 +336,14 @@ def VerifyAndFixAST() -> Dict[str, str]:
     # Find all the SEQUENCE, CHOICE and SEQUENCE OFs
     # and if the contained type is not one of AsnBasicNode, AsnEnumerated, AsnMetaMember,
     # define a name and use it... (for SEQUENCEOFs/SETOFs, allow also 'str')
+    # Each round only needs to look at the types named in the previous one,
+    # in sorted order - this is what determines the names of the inner types.
     internalNo = 1
-    addedNewPseudoType = True
-    while addedNewPseudoType:  # pylint: disable=too-many-nested-blocks
-        addedNewPseudoType = False
-        listOfTypenames = sorted(g_names.keys())
+    listOfTypenames = sorted(model._names.keys())
+    while listOfTypenames:  # pylint: disable=too-many-nested-blocks
+        newTypenames = []  # type: List[str]
         for nodeTypename in listOfTypenames:
-            node = g_names[nodeTypename]
+            node = model._names[nodeTypename]
             if isinstance(node, (AsnChoice, AsnSequence, AsnSet)):
                 for child in node._members:
                     if not isinstance(child[1], AsnBasicNode) and \
@@ -316,45 +352,44 @@ def VerifyAndFixAST() -> Dict[str, str]:
                         # It will be an internal sequence, choice or sequenceof
                         assert isinstance(child[1], (AsnChoice, AsnSet, AsnSetOf, AsnSequence, AsnSequenceOf))
                         internalName = newname = nodeTypename + '_' + CleanNameForAST(child[0])
-                        while internalName in g_names:
+                        while internalName in model._names:
                             internalName = (newname + "_%d") % internalNo
                             internalNo += 1
-                        g_names[internalName] = child[1]
+                        model._names[internalName] = child[1]
                         child[1]._isArtificial = True
-                        g_leafTypeDict[internalName] = child[1]._leafType
+                        model._leafTypeDict[internalName] = child[1]._leafType
                         child[1] = AsnMetaMember(asnFilename=child[1]._asnFilename, containedType=internalName)
-                        addedNewPseudoType = True
+                        newTypenames.append(internalName)
             elif isinstance(node, (AsnSequenceOf, AsnSetOf)):
                 if not isinstance(node._containedType, str) and \
                         not isinstance(node._containedType, AsnBasicNode) and \
                         not isinstance(node._containedType, AsnEnumerated):
                     internalName = newname = nodeTypename + "_elm"
-                    while internalName in g_names:
+                    while internalName in model._names:
                         internalName = (newname + "_%d") % internalNo
                         internalNo += 1
-                    g_names[internalName] = node._containedType
+                    model._names[internalName] = node._containedType
                     node._containedType._isArtificial = True
-                    g_leafTypeDict[internalName] = node._containedType._leafType
+                    model._leafTypeDict[internalName] = node._containedType._leafType
                     node._containedType = internalName
-                    addedNewPseudoType = True
+                    newTypenames.append(internalName)
+        listOfTypenames = sorted(newTypenames)
 
     # return the leafType dictionary
     return knownTypes
 
 
 def IsInvalidType(name: str) -> bool:
-    return \
-        (name.lower() in g_invalidKeywords) or \
-        (name.lower() in lotokens) or \
-        any([name.lower().endswith(x) for x in ["-buffer", "-buffer-max"]])
+    name = name.lower()
+    return name in g_invalidNames or name.endswith(("-buffer", "-buffer-max"))
 
 
-def CheckForInvalidKeywords(node_or_str: Union[str, AsnNode]) -> None:
+def CheckForInvalidKeywords(node_or_str: Union[str, AsnNode], model: AsnModel = g_model) -> None:
     if isinstance(node_or_str, str):
         if IsInvalidType(node_or_str):
             utility.panic(
                 "TASTE disallows certain type names for various reasons.\n'%s' is not allowed" % node_or_str)
-        node = g_names[node_or_str]  # type: AsnNode
+        node = model._names[node_or_str]  # type: AsnNode
     else:
         node = node_or_str
 
@@ -362,18 +397,18 @@ def CheckForInvalidKeywords(node_or_str: Union[str, AsnNode]) -> None:
         pass
     elif isinstance(node, (AsnSequence, AsnChoice, AsnSet)):
         for child in node._members:
-            if child[0].lower() in g_invalidKeywords or child[0].lower() in lotokens:
+            if child[0].lower() in g_invalidNames:
                 utility.panic(
                     "TASTE disallows certain field names because they are used in various modelling tools.\n" +
                     "Invalid field name '%s' used in type defined in %s" % (child[0], node.Location()))
-            if isinstance(child[1], AsnMetaMember) and child[1]._containedType not in g_checkedSoFarForKeywords:
+            if isinstance(child[1], AsnMetaMember) and child[1]._containedType not in model._checkedSoFarForKeywords:
                 if IsInvalidType(child[1]._containedType.lower()):
                     utility.panic(
                         "TASTE disallows certain type names for various reasons.\n" +
                         "Invalid type name '%s' used in type defined in %s" % (child[1]._containedType, node.Location()))
-                if child[1]._containedType not in g_checkedSoFarForKeywords:
-                    g_checkedSoFarForKeywords[child[1]._containedType] = 1
-                    CheckForInvalidKeywords(g_names[child[1]._containedType])
+                if child[1]._containedType not in model._checkedSoFarForKeywords:
+                    model._checkedSoFarForKeywords[child[1]._containedType] = 1
+                    CheckForInvalidKeywords(model._names[child[1]._containedType], model)
             if isinstance(child[1], AsnMetaMember) and child[1]._containedType.lower() == child[0].lower():
                 utility.panic(
                     "Ada mappers won't allow SEQUENCE/CHOICE fields with same names as their types.\n" +
@@ -384,82 +419,298 @@ def CheckForInvalidKeywords(node_or_str: Union[str, AsnNode]) -> None:
                 utility.panic(
                     "TASTE disallows certain type names for various reasons.\n" +
                     "Invalid type name '%s' used in type defined in %s" % (node._containedType, node.Location()))
-            if node._containedType not in g_checkedSoFarForKeywords:
-                g_checkedSoFarForKeywords[node._containedType] = 1
-                CheckForInvalidKeywords(g_names[node._containedType])
+            if node._containedType not in model._checkedSoFarForKeywords:
+                model._checkedSoFarForKeywords[node._containedType] = 1
+                CheckForInvalidKeywords(model._names[node._containedType], model)
+
+
+def SnapshotSuffix() -> str:
+    return "ast_v4_resolved_v%d.pickle" % g_snapshotVersion
+
+
+def SaveResolvedSnapshot(cache: buildCache.BuildCache, key: str, model: AsnModel) -> None:
+    '''Store the resolved parser state, so that subsequent invocations
+    on the same inputs skip both ASN1SCC and the XML parsing.'''
+    state = {
+        'version': g_snapshotVersion,
+        'names': model._names,
+        'leafTypeDict': model._leafTypeDict,
+        'typesOfFile': model._typesOfFile,
+        'astOfFile': model._astOfFile,
+        'modules': model._modules,
+        'metatypes': model._metatypes,
+        'adaUses': model._adaUses,
+        'checkedSoFarForKeywords': model._checkedSoFarForKeywords,
+    }
+    with instrumentation.Phase("Save the resolved AST", "cache"):
+        cache.StorePickle(key, SnapshotSuffix(), state, "the resolved ASN.1 AST")
+
+
+def LoadResolvedSnapshot(cache: buildCache.BuildCache, key: str, model: AsnModel) -> bool:
+    '''Restore the parser state stored by SaveResolvedSnapshot.
+    Returns False if the snapshot is missing, unreadable or stale.'''
+    with instrumentation.Phase("Load the resolved AST", "cache"):
+        state = cache.LoadPickle(key, SnapshotSuffix())
+    if not isinstance(state, dict) or state.get('version') != g_snapshotVersion:
+        return False
+    model.Reset()
+    model._names.update(state['names'])
+    model._leafTypeDict.update(state['leafTypeDict'])
+    model._typesOfFile.update(state['typesOfFile'])
+    model._astOfFile.update(state['astOfFile'])
+    model._modules.update(state['modules'])
+    model._metatypes.update(state['metatypes'])
+    model._adaUses.update(state['adaUses'])
+    model._checkedSoFarForKeywords.update(state['checkedSoFarForKeywords'])
+    return True
+
+
+def FragmentKey(cache: buildCache.BuildCache, asnFilename: str) -> str:
+    return cache.Key("asn1-file-v%d" % g_fragmentVersion, [asnFilename])
+
+
+def LoadFragment(cache: buildCache.BuildCache, asnFilename: str) -> Optional[Dict[str, Any]]:
+    fragment = cache.LoadPickle(FragmentKey(cache, asnFilename), "ast_v4_file.pickle")
+    if not isinstance(fragment, dict) or fragment.get('version') != g_fragmentVersion:
+        return None
+    return fragment
+
+
+def StoreFragment(cache: buildCache.BuildCache, asnFilename: str, fragment: Dict[str, Any]) -> None:
+    cache.StorePickle(
+        FragmentKey(cache, asnFilename), "ast_v4_file.pickle", fragment, "the XML AST of " + asnFilename)
+
+
+def InvokeASN1SCC(listOfFilenames: List[str], xmlAST: str) -> int:  # pylint: disable=invalid-sequence-index
+    asn1SccPath = shutil.which('asn1.exe', mode=os.F_OK)
+    if asn1SccPath is None:
+        utility.panic("ASN1SCC seems not installed on your system (asn1.exe not found in PATH).\n")
+    asn1SccDir = os.path.dirname(os.path.abspath(asn1SccPath))
+    with instrumentation.Phase("ASN1SCC", "spawn", files=listOfFilenames):
+        return os.system("mono \"" + asn1SccPath + "\" -customStg \"" + asn1SccDir + "/xml.stg:" + xmlAST + "\" -typePrefix asn1Scc -fp AUTO -customStgAstVersion 4 \"" + "\" \"".join(listOfFilenames) + "\"")
+
+
+def SplitASTByFile(
+        xmlAST: str,
+        listOfFilenames: List[str]) -> Tuple[str, str, Dict[str, Dict[str, Any]]]:  # pylint: disable=invalid-sequence-index
+    '''Splits the XML AST dumped by ASN1SCC into the text that precedes
+    the first Asn1File node, the text that follows the last one, and
+    one fragment per input file - holding the XML text of its Asn1File
+    node, the modules it defines and the modules it imports (and the
+    text around the Asn1File nodes, to merge fragments without ASN1SCC).'''
+    with open(xmlAST, "r", encoding="utf-8") as f:
+        content = f.read()
+    matches = list(g_asn1FileRE.finditer(content))
+    if not matches:
+        return "", "", {}
+    header, footer = content[:matches[0].start()], content[matches[-1].end():]
+    # ASN1SCC may report the filenames with a different path prefix
+    byPath = {os.path.abspath(x): x for x in listOfFilenames}
+    byBasename = {}  # type: Dict[str, List[str]]
+    for x in listOfFilenames:
+        byBasename.setdefault(os.path.basename(x), []).append(x)
+    fragments = {}  # type: Dict[str, Dict[str, Any]]
+    for m in matches:
+        reportedName = xml.sax.saxutils.unescape(m.group(1), {"&quot;": '"'})
+        inputFile = byPath.get(os.path.abspath(reportedName))
+        if inputFile is None and len(byBasename.get(os.path.basename(reportedName), [])) == 1:
+            inputFile = byBasename[os.path.basename(reportedName)][0]
+        if inputFile is None:
+            continue
+        fragments[inputFile] = {
+            'version': g_fragmentVersion,
+            'xml': m.group(0),
+            'modules': g_asn1ModuleRE.findall(m.group(0)),
+            'imports': sorted(set(g_importedModuleRE.findall(m.group(0)))),
+            'header': header,
+            'footer': footer,
+        }
+    return header, footer, fragments
+
+
+def ImportsOfASNFile(asnFilename: str) -> List[str]:  # pylint: disable=invalid-sequence-index
+    '''A lightweight scan of the module names in the IMPORTS clauses of an
+    ASN.1 file - used to pass the necessary context files to ASN1SCC.'''
+    with open(asnFilename, "r", encoding="utf-8") as f:
+        content = f.read()
+    content = re.sub(r'/\*.*?\*/', ' ', content, flags=re.S)
+    content = re.sub(r'--.*?(--|$)', ' ', content, flags=re.M)
+    result = []  # type: List[str]
+    for imports in re.findall(r'\bIMPORTS\b(.*?);', content, flags=re.S):
+        result.extend(re.findall(r'\bFROM\s+([A-Za-z][A-Za-z0-9-]*)', imports))
+    return result
+
+
+def RecompileChangedFiles(
+        cache: buildCache.BuildCache,
+        listOfFilenames: List[str],
+        key: str) -> Optional[str]:  # pylint: disable=invalid-sequence-index
+    '''Re-creates the XML AST of the input files by invoking ASN1SCC only
+    on the files that changed since their last compilation, and on the
+    files whose modules (directly or indirectly) import their modules.
+    The XML of all other files is reused from their cached fragments.
+
+    Returns the path of the complete XML AST, now stored in the cache
+    under the given key - or None if there is nothing to reuse (or if
+    anything goes wrong), in which case the caller must compile everything.'''
+    fragments = {}  # type: Dict[str, Dict[str, Any]]
+    changed = []  # type: List[str]
+    for each in listOfFilenames:
+        fragment = LoadFragment(cache, each)
+        if fragment is None:
+            changed.append(each)
+        else:
+            fragments[each] = fragment
+    if not fragments:
+        return None
 
+    # The module import graph, as recorded in the cached fragments
+    definedBy = {}  # type: Dict[str, str]
+    importers = {}  # type: Dict[str, List[str]]
+    for each, fragment in fragments.items():
+        for moduleName in fragment['modules']:
+            definedBy[moduleName] = each
+        for moduleName in fragment['imports']:
+            importers.setdefault(moduleName, []).append(each)
+
+    # Modules no longer defined by an unchanged file used to live in
+    # the changed ones - so their importers must be recompiled, too.
+    dirty = set()  # type: Set[str]
+    pending = list(changed)
+    for moduleName, files in importers.items():
+        if moduleName not in definedBy:
+            pending.extend(files)
+    while pending:
+        each = pending.pop()
+        if each in dirty:
+            continue
+        dirty.add(each)
+        if each in fragments:
+            for moduleName in fragments[each]['modules']:
+                pending.extend(importers.get(moduleName, []))
+    if len(dirty) == len(listOfFilenames):
+        return None
 
-def ParseAsnFileList(listOfFilenames: List[str]) -> None:  # pylint: disable=invalid-sequence-index
-    # Add basic ASN.1 caching to avoid calling the ASN.1 compiler over and over
-    projectCache = os.getenv("PROJECT_CACHE")
-    if projectCache is not None and not os.path.isdir(projectCache):
+    # ASN1SCC also needs the files defining the modules imported by the
+    # ones we recompile.
+    compileSet = set(dirty)
+    neededModules = []  # type: List[str]
+    for each in dirty:
+        neededModules.extend(
+            fragments[each]['imports'] if each in fragments else ImportsOfASNFile(each))
+    while neededModules:
+        moduleName = neededModules.pop()
+        definer = definedBy.get(moduleName)
+        if definer is not None and definer not in compileSet:
+            compileSet.add(definer)
+            neededModules.extend(fragments[definer]['imports'])
+
+    if dirty:
+        print("[DMT] Recompiling", len(dirty), "of", len(listOfFilenames), "ASN.1 files:", ",".join(
+            x for x in listOfFilenames if x in dirty))
+        partialAST = cache.TemporaryFilename()
         try:
-            os.mkdir(projectCache)
-        except:
-            utility.panic(
-                "The configured cache folder:\n\n\t" + projectCache + "\n\n...is not there!\n")
-    xmlAST = None
-    someFilesHaveChanged = False
-    if projectCache is not None:
-        filehash = hashlib.md5()
-        for each in sorted(listOfFilenames):
-            filehash.update(
-                open(each, "r", encoding="utf-8").read().encode('utf-8'))
-            # also hash the file path: it is used in the AST in XML, so it is
-            # not enough to hash the content of the ASN.1 files, as two sets
-            # of files may have the same hash, that would lead to different XML
-            # content.
-            filehash.update(each.encode('utf-8'))
-        newHash = filehash.hexdigest()
-        # set the name of the XML files containing the dumped ASTs
-        xmlAST = projectCache + os.sep + newHash + "_ast_v4.xml"
-        if not os.path.exists(xmlAST):
-            someFilesHaveChanged = True
-            print("[DMT] No cached model found for", ",".join(listOfFilenames))
+            if InvokeASN1SCC([x for x in listOfFilenames if x in compileSet], partialAST) != 0:
+                # Let the complete compilation report the errors
+                return None
+            header, footer, newFragments = SplitASTByFile(partialAST, listOfFilenames)
+        finally:
+            os.unlink(partialAST)
+        if any(x not in newFragments for x in dirty):
+            return None
+        for each in dirty:
+            StoreFragment(cache, each, newFragments[each])
+            fragments[each] = newFragments[each]
     else:
-        # no projectCache set, so xmlAST is set to None
-        someFilesHaveChanged = True
-    if not someFilesHaveChanged:
-        print("[DMT] Reusing cached ASN.1 AST for ", ",".join(listOfFilenames))
+        # All the files were compiled before (e.g. in another order, or
+        # along with other files) - so there is nothing to recompile.
+        print("[DMT] Reusing the cached XML AST of all the ASN.1 files")
+        header, footer = fragments[listOfFilenames[0]]['header'], fragments[listOfFilenames[0]]['footer']
+
+    mergedAST = cache.TemporaryFilename()
+    with open(mergedAST, 'w', encoding="utf-8") as f:
+        f.write(header)
+        f.write("\n".join(fragments[x]['xml'] for x in listOfFilenames))
+        f.write(footer)
+    return cache.PublishFile(key, "ast_v4.xml", mergedAST)
+
+
+def CompileASN1(listOfFilenames: List[str], xmlAST: str) -> None:  # pylint: disable=invalid-sequence-index
+    spawnResult = InvokeASN1SCC(listOfFilenames, xmlAST)
+    if spawnResult != 0:
+        errCode = spawnResult / 256
+        if errCode == 1:
+            utility.panic("ASN1SCC reported syntax errors. Aborting...")
+        elif errCode == 2:
+            utility.panic("ASN1SCC reported semantic errors (or mono failed). Aborting...")
+        elif errCode == 3:
+            utility.panic("ASN1SCC reported internal error. Contact ESA with this input. Aborting...")
+        elif errCode == 4:
+            utility.panic("ASN1SCC reported usage error. Aborting...")
+        else:
+            utility.panic("ASN1SCC generic error. Contact ESA with this input. Aborting...")
 
-    if not xmlAST:
+
+def ParseAsnFileList(listOfFilenames: List[str], model: AsnModel = g_model) -> AsnModel:  # pylint: disable=invalid-sequence-index
+    '''Compiles the ASN.1 files with ASN1SCC, and loads the resulting AST
+    in the given model (by default, the one behind the module globals).'''
+    # Add basic ASN.1 caching to avoid calling the ASN.1 compiler over and over
+    cache = buildCache.ProjectCache()
+    if cache is None:
         (dummy, xmlAST) = tempfile.mkstemp()
         os.fdopen(dummy).close()
-
-    if someFilesHaveChanged:
-        asn1SccPath = spawn.find_executable('asn1.exe')
-        if asn1SccPath is None:
-            utility.panic("ASN1SCC seems not installed on your system (asn1.exe not found in PATH).\n")
-        asn1SccDir = os.path.dirname(os.path.abspath(asn1SccPath))
-        spawnResult = os.system("mono \"" + asn1SccPath + "\" -customStg \"" + asn1SccDir + "/xml.stg:" + xmlAST + "\" -typePrefix asn1Scc -fp AUTO -customStgAstVersion 4 \"" + "\" \"".join(listOfFilenames) + "\"")
-        if spawnResult != 0:
-            errCode = spawnResult / 256
-            if errCode == 1:
-                utility.panic("ASN1SCC reported syntax errors. Aborting...")
-            elif errCode == 2:
-                utility.panic("ASN1SCC reported semantic errors (or mono failed). Aborting...")
-            elif errCode == 3:
-                utility.panic("ASN1SCC reported internal error. Contact ESA with this input. Aborting...")
-            elif errCode == 4:
-                utility.panic("ASN1SCC reported usage error. Aborting...")
+        CompileASN1(listOfFilenames, xmlAST)
+        ParseASN1SCC_AST(xmlAST, model)
+        # PrintGrammarFromAST may need to re-read the XML later on
+        atexit.register(os.unlink, xmlAST)
+    else:
+        key = cache.Key("asn1", sorted(listOfFilenames))
+        # Parallel invocations on the same inputs wait for the first one
+        with cache.Producer(key):
+            cachedAST = cache.Lookup(key, "ast_v4.xml")
+            if cachedAST is not None:
+                print("[DMT] Reusing cached ASN.1 AST for ", ",".join(listOfFilenames))
+                if LoadResolvedSnapshot(cache, key, model):
+                    model._xmlASTrootNode = None
+                    model._xmlASTfilename = cachedAST
+                    return model
             else:
-                utility.panic("ASN1SCC generic error. Contact ESA with this input. Aborting...")
-    ParseASN1SCC_AST(xmlAST)
-    if projectCache is None:
-        os.unlink(xmlAST)
-    g_names.update(g_names)
-    g_leafTypeDict.update(g_leafTypeDict)
-    g_checkedSoFarForKeywords.update(g_checkedSoFarForKeywords)
-    g_typesOfFile.update(g_typesOfFile)
-
-
-def Dump() -> None:
-    for nodeTypename in sorted(g_names.keys()):
-        if g_names[nodeTypename]._isArtificial:
+                print("[DMT] No cached model found for", ",".join(listOfFilenames))
+                # Only recompile the files that changed (and their importers)
+                cachedAST = RecompileChangedFiles(cache, listOfFilenames, key)
+                if cachedAST is None:
+                    xmlAST = cache.TemporaryFilename()
+                    try:
+                        CompileASN1(listOfFilenames, xmlAST)
+                        for each, fragment in SplitASTByFile(xmlAST, listOfFilenames)[2].items():
+                            StoreFragment(cache, each, fragment)
+                        cachedAST = cache.PublishFile(key, "ast_v4.xml", xmlAST)
+                    finally:
+                        if os.path.exists(xmlAST):
+                            os.unlink(xmlAST)
+            ParseASN1SCC_AST(cachedAST, model)
+            SaveResolvedSnapshot(cache, key, model)
+    return model
+
+
+def ViewOfFile(asnFile: Filename, model: AsnModel = g_model) -> AST_FileView:
+    '''A read-only view of the types defined in one ASN.1 file.
+    The leaf types are looked up in the shared leaf type map - so unlike
+    per-file copies of the global maps, the memory used by the views of
+    all files is proportional to the number of types, not to files x types.'''
+    return AST_FileView(
+        types.MappingProxyType({name: model._names[name] for name in model._typesOfFile[asnFile]}),
+        tuple(model._astOfFile[asnFile]),
+        model._leafTypesView)
+
+
+def Dump(model: AsnModel = g_model) -> None:
+    for nodeTypename in sorted(model._names.keys()):
+        if model._names[nodeTypename]._isArtificial:
             continue
-        print("\n===== From", g_names[nodeTypename]._asnFilename)
+        print("\n===== From", model._names[nodeTypename]._asnFilename)
         print(nodeTypename)
-        print("::", g_names[nodeTypename], g_leafTypeDict[nodeTypename])
+        print("::", model._names[nodeTypename], model._leafTypeDict[nodeTypename])
 
 
 def test_asn1() -> None:
@@ -478,15 +729,16 @@ def test_asn1() -> None:
     Dump()
 
 
-g_xmlASTrootNode = None
-
 g_lineno = -1
 
 
 class Element:
+    __slots__ = ('_name', '_attrs', '_children')
+
     def __init__(self, name: str, attrs: Dict[str, Any]) -> None:
         self._name = name
-        self._attrs = attrs
+        # a plain dict, for O(1) lookups in GetAttr
+        self._attrs = dict(attrs.items())
         self._children = []  # type: List[Element]
 
 
@@ -527,19 +779,18 @@ Action = Callable[[Element], Any]
 
 def VisitAll(node: Element, expectedType: str, action: Action) -> List[Any]:  # pylint: disable=invalid-sequence-index
     results = []  # type: List[Any]
-    if node is not None:
+    # Pre-order traversal, via an explicit stack (no list concatenations)
+    pending = [node] if node is not None else []
+    while pending:
+        node = pending.pop()
         if node._name == expectedType:
-            results = [action(node)]
-        for child in node._children:
-            results += VisitAll(child, expectedType, action)
+            results.append(action(node))
+        pending.extend(reversed(node._children))
     return results
 
 
 def GetAttr(node: Element, attrName: str) -> Optional[Any]:
-    if attrName not in list(node._attrs.keys()):
-        return None
-    else:
-        return node._attrs[attrName]
+    return node._attrs.get(attrName)
 
 
 def GetChild(node: Element, childName: str) -> Optional[Element]:
@@ -627,7 +878,7 @@ def CreateEnumerated(newModule: Module, lineNo: int, xmlEnumeratedNode: Element)
             # lambda x: [GetAttr(x, "StringValue"), GetAttr(x, "IntValue"), GetAttr(x, "EnumID")]))
             #  old code: used to check the ValuesAutoCalculated and use None for the integer values
             # lambda x: [GetAttr(x, "StringValue"), bSetIntValue and GetAttr(x, "IntValue") or None]))
-            lambda x: [GetAttr(x, "StringValue"), GetAttr(x, "IntValue")]))
+            lambda x: (Intern(GetAttr(x, "StringValue")), Intern(GetAttr(x, "IntValue")))))
 
 
 # def CreateBitString(newModule, lineNo, xmlBitString):
@@ -723,7 +974,7 @@ def CommonSeqSetChoice(
     #     utility.panic("CommonSeqSetChoice: No children under Sequence/Choice/SetType (%s, %s)" %  # pragma: no cover
     #           (newModule._asnFilename, lineNo))  # pragma: no cover
 
-    myMembers = []
+    myMembers = []  # type: List[AsnMember]
     for x in xmlSequenceNode._children:
         if x._name == childTypeName:
             opti = GetAttr(x, "Optional")
@@ -732,10 +983,9 @@ def CommonSeqSetChoice(
             if opti and opti == "True":
                 utility.warn("OPTIONAL attribute ignored by A/B mappers (for field contained in %s,%s)" % (newModule._asnFilename, lineNo))
             enumID = GetAttr(x, "EnumID")
-            myMembers.append([GetAttr(x, "VarName"), GenericFactory(newModule, GetChild(x, "Type"))])
-            myMembers[-1].append(enumID)
-            for flag in [opti, bAlwaysPresent, bAlwaysAbsent]:
-                myMembers[-1].append(flag == "True")
+            myMembers.append(AsnMember(
+                GetAttr(x, "VarName"), GenericFactory(newModule, GetChild(x, "Type")), enumID,
+                opti == "True", bAlwaysPresent == "True", bAlwaysAbsent == "True"))
     for tup in myMembers:
         if isinstance(tup[1], AsnMetaType):
             asnMetaMember = AsnMetaMember(
@@ -787,7 +1037,7 @@ def GenericFactory(newModule: Module, xmlType: Element) -> AsnNode:
         "SetType": CreateSet,
         "ChoiceType": CreateChoice
     }  # type: Dict[str, Callable[[Module, int, Element], AsnNode]]
-    lineNo = GetAttr(xmlType, "Line")
+    lineNo = Intern(GetAttr(xmlType, "Line"))
     global g_lineno
     g_lineno = lineNo
     if len(xmlType._children) == 0:  # pylint: disable=len-as-condition
@@ -801,7 +1051,7 @@ def GenericFactory(newModule: Module, xmlType: Element) -> AsnNode:
     return maker(newModule, lineNo, xmlContainedType)
 
 
-def VisitTypeAssignment(newModule: Module, xmlTypeAssignment: Element) -> Tuple[str, AsnNode]:
+def VisitTypeAssignment(newModule: Module, xmlTypeAssignment: Element, model: AsnModel) -> Tuple[str, AsnNode]:
     xmlType = GetChild(xmlTypeAssignment, "Type")
     if xmlType is None:
         utility.panic("VisitTypeAssignment: No child under TypeAssignment")  # pragma: no cover
@@ -810,52 +1060,112 @@ def VisitTypeAssignment(newModule: Module, xmlTypeAssignment: Element) -> Tuple[
     if isArtificial is None:
         utility.panic("You are using an older version of ASN1SCC - please upgrade.")
     newNode._isArtificial = isArtificial == "True"
-    name = GetAttr(xmlTypeAssignment, "Name")
-    g_adaUses.setdefault(newModule._id, set()).add(name)
+    name = Intern(GetAttr(xmlTypeAssignment, "Name"))
+    model._adaUses.setdefault(newModule._id, set()).add(name)
     hasAcnEncDec = GetAttr(xmlType, "HasAcnEncDecFunction") or "False"
     newNode.hasAcnEncDec = hasAcnEncDec != "False"
     return (name, newNode)
 
 
-def VisitAsn1Module(xmlAsn1File: Element, xmlModule: Element, modules: List[Module]) -> None:  # pylint: disable=invalid-sequence-index
-    newModule = Module()
-    newModule._id = GetAttr(xmlModule, "ID")
-    newModule._asnFilename = GetAttr(xmlAsn1File, "FileName")
-    newModule._exportedTypes = VisitAll(
-        GetChild(xmlModule, "ExportedTypes"), "ExportedType",
-        lambda x: GetAttr(x, "Name"))
-
-    newModule._exportedVariables = VisitAll(
-        GetChild(xmlModule, "ExportedVariables"), "ExportedVariable",
-        lambda x: GetAttr(x, "Name"))
-
-    newModule._importedModules = VisitAll(
-        GetChild(xmlModule, "ImportedModules"), "ImportedModule",
-        lambda x: (
-            GetAttr(x, "ID"),
-            VisitAll(GetChild(x, "ImportedTypes"), "ImportedType",
-                     lambda y: GetAttr(y, "Name")),
-            VisitAll(GetChild(x, "ImportedVariables"), "ImportedVariable",
-                     lambda y: GetAttr(y, "Name")),
+def VisitModuleSection(newModule: Module, xmlSection: Element) -> None:
+    '''Fills the exports/imports of a module, from the corresponding
+    child of its Asn1Module XML node.'''
+    if xmlSection._name == "ExportedTypes":
+        newModule._exportedTypes = VisitAll(
+            xmlSection, "ExportedType",
+            lambda x: GetAttr(x, "Name"))
+    elif xmlSection._name == "ExportedVariables":
+        newModule._exportedVariables = VisitAll(
+            xmlSection, "ExportedVariable",
+            lambda x: GetAttr(x, "Name"))
+    elif xmlSection._name == "ImportedModules":
+        newModule._importedModules = VisitAll(
+            xmlSection, "ImportedModule",
+            lambda x: (
+                GetAttr(x, "ID"),
+                VisitAll(GetChild(x, "ImportedTypes"), "ImportedType",
+                         lambda y: GetAttr(y, "Name")),
+                VisitAll(GetChild(x, "ImportedVariables"), "ImportedVariable",
+                         lambda y: GetAttr(y, "Name")),
+            )
         )
-    )
 
-    newModule._typeAssignments = VisitAll(
-        GetChild(xmlModule, "TypeAssignments"), "TypeAssignment",
-        lambda x: VisitTypeAssignment(newModule, x))
 
-    g_typesOfFile.setdefault(newModule._asnFilename, [])
-    g_typesOfFile[newModule._asnFilename].extend(
+def RegisterModule(newModule: Module, modules: List[Module], model: AsnModel) -> None:  # pylint: disable=invalid-sequence-index
+    model._typesOfFile.setdefault(newModule._asnFilename, [])
+    model._typesOfFile[newModule._asnFilename].extend(
         [x for x, _ in newModule._typeAssignments])
 
-    g_astOfFile.setdefault(newModule._asnFilename, [])
-    g_astOfFile[newModule._asnFilename].extend(
+    model._astOfFile.setdefault(newModule._asnFilename, [])
+    model._astOfFile[newModule._asnFilename].extend(
         [y for _, y in newModule._typeAssignments])
 
     modules.append(newModule)
 
 
-def ParseASN1SCC_AST(filename: str) -> None:
+class StreamingASTHandler(xml.sax.ContentHandler):  # type: ignore
+    '''Creates the Asn* nodes while the ASN1SCC XML AST is being parsed.
+
+    Element trees are only built for the children of Asn1Module nodes,
+    and each TypeAssignment is visited and dropped as soon as it ends.
+    Memory use is therefore bounded by the largest TypeAssignment,
+    not by the size of the XML file.'''
+    def __init__(self, modules: List[Module], model: AsnModel) -> None:  # pylint: disable=invalid-sequence-index
+        xml.sax.ContentHandler.__init__(self)  # type: ignore
+        self._modules = modules
+        self._model = model
+        self._depth = 0
+        self._asnFilename = None  # type: Optional[str]
+        self._module = None  # type: Optional[Module]
+        self._moduleDepth = 0
+        # The open XML nodes below the current Asn1Module
+        self._roots = []  # type: List[Element]
+
+    def startElement(self, name: str, attrs: Dict[str, Any]) -> None:
+        self._depth += 1
+        if self._module is not None:
+            newElement = Element(name, attrs)
+            if self._roots:
+                self._roots[-1]._children.append(newElement)
+            self._roots.append(newElement)
+        elif self._depth == 1:
+            if name != "ASN1AST":
+                utility.panic("You must use an XML file that contains one ASN1AST node")  # pragma: no cover
+        elif name == "Asn1File":
+            self._asnFilename = Intern(attrs.get("FileName"))
+        elif name == "Asn1Module":
+            newModule = Module()
+            newModule._id = Intern(attrs.get("ID"))
+            newModule._asnFilename = self._asnFilename
+            newModule._exportedTypes = []
+            newModule._exportedVariables = []
+            newModule._importedModules = []
+            newModule._typeAssignments = []
+            self._module = newModule
+            self._moduleDepth = self._depth
+
+    # def endElement(self, name):
+    def endElement(self, _: Any) -> None:
+        self._depth -= 1
+        if self._module is None:
+            return
+        if self._depth < self._moduleDepth:
+            # The Asn1Module node itself is closing
+            RegisterModule(self._module, self._modules, self._model)
+            self._module = None
+            return
+        element = self._roots.pop()
+        if not self._roots:
+            # A child of Asn1Module (e.g. ExportedTypes) is complete
+            VisitModuleSection(self._module, element)
+        elif element._name == "TypeAssignment" and self._roots[-1]._name == "TypeAssignments":
+            self._module._typeAssignments.append(
+                VisitTypeAssignment(self._module, element, self._model))
+            # ...and the XML of this TypeAssignment is no longer needed
+            self._roots[-1]._children.pop()
+
+
+def ParseXMLTree(filename: str) -> Element:
     parser = xml.sax.make_parser([])
     handler = InputFormatXMLHandler()
     parser.setContentHandler(handler)
@@ -864,33 +1174,38 @@ def ParseASN1SCC_AST(filename: str) -> None:
 
     if len(handler._root._children) != 1 or handler._root._children[0]._name != "ASN1AST":
         utility.panic("You must use an XML file that contains one ASN1AST node")  # pragma: no cover
+    return handler._root
 
-    # Travel("", handler._roots[0])
-    modules = []  # type: List[Module]
-    VisitAll(
-        handler._root._children[0], "Asn1File",
-        lambda x: VisitAll(x, "Asn1Module",
-                           lambda y: VisitAsn1Module(x, y, modules)))
 
-    global g_xmlASTrootNode
-    g_xmlASTrootNode = handler._root
+def ParseASN1SCC_AST(filename: str, model: AsnModel = g_model) -> AsnModel:
+    model.Reset()
+    modules = []  # type: List[Module]
+    parser = xml.sax.make_parser([])
+    parser.setContentHandler(StreamingASTHandler(modules, model))
+    # parser.setFeature("http://xml.org/sax/features/validation", True)
+    with instrumentation.Phase("XML ingestion", "asn1", filename=filename):
+        parser.parse(filename)
 
-    g_names.clear()
-    g_checkedSoFarForKeywords.clear()
-    g_leafTypeDict.clear()
+    # The complete XML tree is only needed by PrintGrammarFromAST,
+    # which will (re)read it on demand.
+    model._xmlASTrootNode = None
+    model._xmlASTfilename = filename
 
     for m in modules:
         # print "Module", m._id
         for typeName, typeData in m._typeAssignments:
             # print "Type:", typeName
-            g_names[typeName] = typeData
-            g_modules.setdefault(m._id, []).append(typeName)
-    g_leafTypeDict.update(VerifyAndFixAST())
+            model._names[typeName] = typeData
+            model._modules.setdefault(m._id, []).append(typeName)
+    with instrumentation.Phase("VerifyAndFixAST", "asn1"):
+        model._leafTypeDict.update(VerifyAndFixAST(model))
 
-    for nodeTypename in list(g_names.keys()):
-        if nodeTypename not in g_checkedSoFarForKeywords:
-            g_checkedSoFarForKeywords[nodeTypename] = 1
-            CheckForInvalidKeywords(nodeTypename)
+    with instrumentation.Phase("CheckForInvalidKeywords", "asn1"):
+        for nodeTypename in list(model._names.keys()):
+            if nodeTypename not in model._checkedSoFarForKeywords:
+                model._checkedSoFarForKeywords[nodeTypename] = 1
+                CheckForInvalidKeywords(nodeTypename, model)
+    return model
 
 
 def SimpleCleaner(x: str) -> str:
@@ -995,10 +1310,17 @@ def PrintType(f: IO[Any], xmlType: Element, indent: str, nameCleaner: Callable[[
         utility.panic("AST inconsistency: Unknown type (%s)\nContact ESA" % realType._name)  # pragma: no cover
 
 
-def PrintGrammarFromAST(f: IO[Any], nameCleaner: Callable[[str], str] = SimpleCleaner) -> None:
+def PrintGrammarFromAST(
+        f: IO[Any],
+        nameCleaner: Callable[[str], str] = SimpleCleaner,
+        model: AsnModel = g_model) -> None:
+    if model._xmlASTrootNode is None and model._xmlASTfilename is not None:
+        # The Asn* nodes were created while streaming (or loaded from a
+        # cached snapshot) - only now do we need the XML tree
+        model._xmlASTrootNode = ParseXMLTree(model._xmlASTfilename)
     ourtypeAssignments = []
     VisitAll(
-        g_xmlASTrootNode._children[0], "Asn1File",
+        model._xmlASTrootNode._children[0], "Asn1File",
         lambda x: VisitAll(x, "TypeAssignment",
                            lambda y: ourtypeAssignments.append((x, y))))
 
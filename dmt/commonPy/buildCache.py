@@ -0,0 +1,243 @@
+# (C)  Semantix Information Technologies,
+#      Neuropublic,
+#      European Space Agency
+#
+# The license of the Data Modelling Tools (DMT) is GPL with Runtime Exception
+
+'''
+The PROJECT_CACHE store, shared by all the tools that cache their work.
+
+Entries are files named "<key>_<suffix>", where the key is a hash of the
+inputs and of the tools that process them (ASN1SCC version and flags).
+Entries are published atomically (written to a temporary file, then
+renamed), only one process at a time produces the entries of a key
+(see Producer), and once the cache grows beyond PROJECT_CACHE_MAXSIZE
+megabytes (default: 512) the least recently used keys are evicted.
+'''
+
+import os
+import re
+import fcntl
+import pickle
+import time
+import hashlib
+import tempfile
+import contextlib
+import shutil
+
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Tuple  # NOQA pylint: disable=unused-import
+
+from . import utility
+
+# Default size cap, in megabytes
+g_defaultMaxSize = 512
+
+g_entryRE = re.compile(r'^([0-9a-f]{32})_.')
+
+# The temporary files (of Publish and TemporaryFilename) that were not
+# modified for this long (in seconds) are left over from killed processes
+g_staleTemporaryAge = 3600
+
+g_cache = None  # type: Optional[BuildCache]
+
+
+def ToolchainIdentity() -> bytes:
+    '''The part of every key that identifies the tools: the ASN1SCC
+    executable (path, size and timestamp - so an upgrade invalidates
+    the cache) and the ASN1SCC_FLAGS.'''
+    identity = []  # type: List[str]
+    asn1SccPath = shutil.which('asn1.exe', mode=os.F_OK)
+    if asn1SccPath is not None:
+        st = os.stat(asn1SccPath)
+        identity.append("%s:%d:%d" % (os.path.abspath(asn1SccPath), st.st_size, st.st_mtime_ns))
+    identity.append(os.getenv("ASN1SCC_FLAGS") or "")
+    return "\n".join(identity).encode('utf-8')
+
+
+class BuildCache:
+    def __init__(self, folder: str, maxSize: int) -> None:
+        self._folder = folder
+        self._maxSize = maxSize
+        self._toolchain = None  # type: Optional[bytes]
+
+    def Key(self, kind: str, filenames: List[str]) -> str:  # pylint: disable=invalid-sequence-index
+        '''A key for the given kind of work over the given files - based on
+        their paths, their contents, and the toolchain identity.'''
+        if self._toolchain is None:
+            self._toolchain = ToolchainIdentity()
+        filehash = hashlib.md5()
+        filehash.update(kind.encode('utf-8'))
+        filehash.update(self._toolchain)
+        for each in filenames:
+            with open(each, "rb") as f:
+                filehash.update(f.read())
+            # the file paths are also part of the generated ASTs
+            filehash.update(each.encode('utf-8'))
+        return filehash.hexdigest()
+
+    def Path(self, key: str, suffix: str) -> str:
+        return self._folder + os.sep + key + "_" + suffix
+
+    def Lookup(self, key: str, suffix: str) -> Optional[str]:
+        '''Returns the path of the entry, or None if it is not cached.'''
+        path = self.Path(key, suffix)
+        try:
+            # Mark it as recently used, for the eviction policy
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def Publish(self, key: str, suffix: str, writer: Callable[[IO[Any]], None], description: str) -> bool:
+        '''Atomically creates (or replaces) an entry, whose content is
+        written in the (binary) file object passed to the writer.'''
+        (fd, tmpFilename) = tempfile.mkstemp(dir=self._folder, prefix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                writer(f)
+            # Readers must never see a partially written entry
+            os.replace(tmpFilename, self.Path(key, suffix))
+        except (OSError, pickle.PicklingError) as e:
+            utility.warn("Failed to store %s in the cache (%s)", description, str(e))
+            if os.path.exists(tmpFilename):
+                os.unlink(tmpFilename)
+            return False
+        return True
+
+    def TemporaryFilename(self) -> str:
+        '''A new temporary file, to be moved into the cache via PublishFile.'''
+        (fd, tmpFilename) = tempfile.mkstemp(dir=self._folder, prefix=".tmp")
+        os.close(fd)
+        return tmpFilename
+
+    def PublishFile(self, key: str, suffix: str, filename: str) -> str:
+        '''Atomically moves a file created by TemporaryFilename into the cache.'''
+        path = self.Path(key, suffix)
+        os.replace(filename, path)
+        return path
+
+    def StorePickle(self, key: str, suffix: str, data: Any, description: str) -> bool:
+        return self.Publish(
+            key, suffix, lambda f: pickle.dump(data, f, pickle.HIGHEST_PROTOCOL), description)
+
+    def LoadPickle(self, key: str, suffix: str) -> Optional[Any]:
+        '''Returns the unpickled entry, or None if it is missing or unreadable.'''
+        path = self.Lookup(key, suffix)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f, fix_imports=False)
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+    def _Lock(self, key: str, blocking: bool = True) -> Optional[int]:
+        lockFilename = self.Path(key, "lock")
+        while True:
+            fd = os.open(lockFilename, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return None
+            # The evictor may have removed the lock file while we were
+            # waiting for it - in which case we must lock the new one.
+            try:
+                if os.fstat(fd).st_ino == os.stat(lockFilename).st_ino:
+                    return fd
+            except OSError:
+                pass
+            os.close(fd)
+
+    @contextlib.contextmanager
+    def Producer(self, key: str) -> Iterator[None]:
+        '''Serializes the processes working on the same key: the first one
+        produces the entries, the others wait for it and then (re-)check
+        the cache - instead of duplicating the work.'''
+        fd = self._Lock(key)
+        try:
+            yield
+        finally:
+            os.close(fd)  # type: ignore
+        self.Evict(keep=key)
+
+    def Evict(self, keep: Optional[str] = None) -> None:
+        '''Removes the least recently used keys, until the cache fits
+        within its size cap. Keys that are being produced are skipped,
+        and so is the "keep" one (e.g. the one that was just produced).
+        Stale temporary files are removed, and the others count towards
+        the size cap.'''
+        sizes = {}  # type: Dict[str, int]
+        lastUsed = {}  # type: Dict[str, float]
+        total = 0
+        try:
+            direntries = list(os.scandir(self._folder))
+        except OSError:
+            return
+        now = time.time()
+        for dirent in direntries:
+            if dirent.name.startswith(".tmp"):
+                try:
+                    st = dirent.stat()
+                    if now - st.st_mtime > g_staleTemporaryAge:
+                        os.unlink(dirent.path)
+                    else:
+                        total += st.st_size
+                except OSError:
+                    pass
+                continue
+            m = g_entryRE.match(dirent.name)
+            if not m or dirent.name.endswith("_lock"):
+                continue
+            try:
+                st = dirent.stat()
+            except OSError:
+                continue
+            key = m.group(1)
+            sizes[key] = sizes.get(key, 0) + st.st_size
+            lastUsed[key] = max(lastUsed.get(key, 0.0), st.st_mtime)
+            total += st.st_size
+        if total <= self._maxSize:
+            return
+        for key in sorted(sizes, key=lambda k: lastUsed[k]):
+            if key == keep:
+                continue
+            fd = self._Lock(key, blocking=False)
+            if fd is None:
+                continue
+            try:
+                for dirent in direntries:
+                    if dirent.name.startswith(key + "_") and dirent.name != key + "_lock":
+                        try:
+                            os.unlink(dirent.path)
+                        except OSError:
+                            pass
+                os.unlink(self.Path(key, "lock"))
+            finally:
+                os.close(fd)
+            total -= sizes[key]
+            if total <= self._maxSize:
+                break
+
+
+def ProjectCache() -> Optional[BuildCache]:
+    '''Returns the cache configured via PROJECT_CACHE (or None).'''
+    global g_cache
+    projectCache = os.getenv("PROJECT_CACHE")
+    if projectCache is None:
+        return None
+    if g_cache is not None and g_cache._folder == projectCache:
+        return g_cache
+    if not os.path.isdir(projectCache):
+        try:
+            os.mkdir(projectCache)
+        except OSError:
+            if not os.path.isdir(projectCache):
+                utility.panic(
+                    "The configured cache folder:\n\n\t" + projectCache + "\n\n...is not there!\n")
+    try:
+        maxSize = int(os.getenv("PROJECT_CACHE_MAXSIZE") or g_defaultMaxSize)
+    except ValueError:
+        utility.panic("PROJECT_CACHE_MAXSIZE must be a number of megabytes.")
+    g_cache = BuildCache(projectCache, maxSize * 1024 * 1024)
+    return g_cache
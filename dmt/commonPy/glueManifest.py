@@ -0,0 +1,168 @@
+# (C)  Semantix Information Technologies,
+#      Neuropublic,
+#      European Space Agency
+#
+# The license of the Data Modelling Tools (DMT) is GPL with Runtime Exception
+
+'''
+The manifest of the glue code that aadl2glueC generated in a folder.
+
+aadl2glueC splits its work in units: the glue of each subprogram of a
+synchronous backend, the encoders/decoders of each asynchronous backend,
+and the custom (GUI) backends. For each unit, the manifest records a
+fingerprint of everything that its code depends on - the structure of
+the ASN.1 types and of the AADL parameters it uses, the options, and
+DMT itself - and the files it generated. In the next run, the units
+whose fingerprint is the same (and whose files are still there) are
+skipped.
+'''
+
+import os
+import json
+import hashlib
+import tempfile
+
+from typing import Any, Dict, List, Optional, Set  # NOQA pylint: disable=unused-import
+
+from . import utility, outputFiles
+from .asnAST import AsnNode, AsnMember
+from .asnParser import AST_Lookup
+from .aadlAST import ApLevelContainer
+
+g_manifestFilename = ".aadl2glueC.manifest"
+
+# Increase this when the contents of the fingerprints (or of the manifest) change
+g_manifestVersion = 2
+
+# The AST attributes that never affect the generated code
+g_ignoredAttributes = frozenset(['_asnFilename', '_lineno'])
+
+g_generatorIdentity = None  # type: Optional[str]
+
+
+def GeneratorIdentity() -> str:
+    '''The part of every fingerprint that identifies DMT itself: the paths,
+    sizes and timestamps of its Python sources (so that updating DMT
+    invalidates all the manifests).'''
+    global g_generatorIdentity
+    if g_generatorIdentity is None:
+        identity = hashlib.md5()
+        dmtFolder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for folder, dirnames, filenames in os.walk(dmtFolder):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(".py"):
+                    path = os.path.join(folder, filename)
+                    st = os.stat(path)
+                    identity.update(("%s:%d:%d\n" % (path, st.st_size, st.st_mtime_ns)).encode('utf-8'))
+        g_generatorIdentity = identity.hexdigest()
+    return g_generatorIdentity
+
+
+class TypeFingerprints:
+    '''Structural fingerprints of the ASN.1 types: the hash of the classes
+    and the attributes of their AST nodes (except the source locations),
+    including those of the types they refer to.'''
+    def __init__(self, names: AST_Lookup) -> None:
+        self._names = names
+        self._fingerprints = {}  # type: Dict[str, str]
+
+    def Of(self, typename: str) -> str:
+        fingerprint = self._fingerprints.get(typename)
+        if fingerprint is None:
+            # (recursive types are not supported by DMT, so this terminates)
+            fingerprint = hashlib.md5(
+                (typename + "=" + self._Describe(self._names[typename])).encode('utf-8')).hexdigest()
+            self._fingerprints[typename] = fingerprint
+        return fingerprint
+
+    def _Describe(self, value: Any, attribute: str = "") -> str:
+        if isinstance(value, (AsnNode, AsnMember)):
+            fields = []
+            for klass in type(value).__mro__:
+                for slot in getattr(klass, '__slots__', ()):
+                    if slot not in g_ignoredAttributes:
+                        fields.append(slot + ":" + self._Describe(getattr(value, slot, None), slot))
+            return type(value).__name__ + "(" + ",".join(fields) + ")"
+        if isinstance(value, (list, tuple)):
+            return "[" + ",".join(self._Describe(x, attribute) for x in value) + "]"
+        if isinstance(value, str) and attribute == '_containedType' and value in self._names:
+            # A reference to another type
+            return "<" + value + ":" + self.Of(value) + ">"
+        return repr(value)
+
+    def OfAll(self, skipped: Set[str]) -> str:  # pylint: disable=invalid-sequence-index
+        '''The fingerprint of all the types (except the skipped ones).'''
+        allTypes = hashlib.md5()
+        for typename in sorted(self._names):
+            if typename not in skipped:
+                allTypes.update((typename + ":" + self.Of(typename) + "\n").encode('utf-8'))
+        return allTypes.hexdigest()
+
+
+def ParamsFingerprint(sp: ApLevelContainer, types: TypeFingerprints) -> List[Any]:  # pylint: disable=invalid-sequence-index
+    '''What the glue of a subprogram needs from its AADL parameters.'''
+    return [
+        [type(param).__name__,
+         param._id,
+         param._signal._asnFilename,
+         param._signal._asnNodename,
+         param._sourceElement._encoding,
+         types.Of(param._signal._asnNodename)]
+        for param in sp._params]
+
+
+def Fingerprint(*parts: Any) -> str:
+    description = json.dumps([g_manifestVersion, GeneratorIdentity(), parts], sort_keys=True)
+    return hashlib.md5(description.encode('utf-8')).hexdigest()
+
+
+class Manifest:
+    def __init__(self, outputDir: str, loadPrevious: bool = True) -> None:
+        # The files are recorded relative to this folder, so that the
+        # manifest stays valid when the folder is copied or moved.
+        self._folder = os.path.abspath(outputDir)
+        self._filename = os.path.join(self._folder, g_manifestFilename)
+        self._previous = {}  # type: Dict[str, Dict[str, Any]]
+        self._units = {}  # type: Dict[str, Dict[str, Any]]
+        if not loadPrevious:
+            return
+        try:
+            with open(self._filename, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == g_manifestVersion:
+                self._previous = data["units"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def IsUpToDate(self, unit: str, fingerprint: Optional[str]) -> bool:
+        '''Whether the unit was already generated from the same inputs (in
+        which case it is kept in the manifest as it is).'''
+        previous = self._previous.get(unit)
+        if fingerprint is None or previous is None or previous["fingerprint"] != fingerprint:
+            return False
+        if not all(os.path.exists(os.path.join(self._folder, x)) for x in previous["files"]):
+            return False
+        self._units[unit] = previous
+        return True
+
+    def Record(self, unit: str, fingerprint: Optional[str], files: List[str]) -> None:  # pylint: disable=invalid-sequence-index
+        '''Records the files that the unit generated (a None fingerprint
+        means that the unit must always be regenerated).'''
+        if fingerprint is not None:
+            self._units[unit] = {
+                "fingerprint": fingerprint,
+                "files": sorted(set(os.path.relpath(os.path.abspath(x), self._folder) for x in files))}
+
+    def Save(self) -> None:
+        '''Atomically replaces the manifest with the units of this run.'''
+        (fd, tmpFilename) = tempfile.mkstemp(dir=os.path.dirname(self._filename), prefix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding="utf-8") as f:
+                json.dump({"version": g_manifestVersion, "units": self._units}, f, indent=1, sort_keys=True)
+            os.chmod(tmpFilename, outputFiles.FileMode(self._filename))
+            os.replace(tmpFilename, self._filename)
+        except OSError as e:
+            utility.warn("Failed to save the manifest of the generated glue (%s)", str(e))
+            if os.path.exists(tmpFilename):
+                os.unlink(tmpFilename)
@@ -0,0 +1,206 @@
+# (C)  Semantix Information Technologies,
+#      Neuropublic,
+#      European Space Agency
+#
+# The license of the Data Modelling Tools (DMT) is GPL with Runtime Exception
+
+'''
+Phase timing and memory instrumentation, shared by all the DMT tools.
+
+When DMT_INSTRUMENT is set to a folder, the tools record the named phases
+of their work - the ASN1SCC invocations, the XML ingestion, VerifyAndFixAST,
+the validation, each backend and each type - with their wall-clock time,
+the growth of the peak RSS of the process, and the memory they allocated
+(as per tracemalloc: the delta, and the peak above the start). At exit,
+each tool invocation writes into the folder:
+
+    <tool>-<pid>.json        the phases, aggregated per name
+    <tool>-<pid>.trace.json  every phase, in the Chrome trace format
+                             (for chrome://tracing or ui.perfetto.dev)
+
+tracemalloc slows down the allocations; DMT_INSTRUMENT_TRACEMALLOC=0
+leaves it off (and only records the times and the RSS).
+
+The phases of the forked workers (-j) are sent back to the parent - see
+TakeEvents and AddEvents.
+'''
+
+import os
+import sys
+import json
+import time
+import atexit
+import resource
+import tracemalloc
+import contextlib
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple  # NOQA pylint: disable=unused-import
+
+from . import utility
+
+# The name of the instrumented tool (None when the instrumentation is off)
+g_tool = None  # type: Optional[str]
+g_pid = 0
+g_traceMemory = False
+
+# The time of Start (perf_counter), and its offset to the epoch - so that
+# the timestamps of forked workers line up with those of their parent.
+g_start = 0.0
+g_epoch = 0.0
+
+# The finished phases (Chrome trace events), and the open ones:
+# [name, category, args, start time, peak RSS, allocated memory, allocated peak]
+g_events = []  # type: List[Dict[str, Any]]
+g_stack = []  # type: List[List[Any]]
+
+
+def Start(tool: str) -> None:
+    '''Turns the instrumentation on (if DMT_INSTRUMENT is set).'''
+    global g_tool, g_pid, g_traceMemory, g_start, g_epoch
+    folder = os.getenv("DMT_INSTRUMENT")
+    if not folder or g_tool is not None:
+        return
+    g_tool = tool
+    g_pid = os.getpid()
+    g_start = time.perf_counter()
+    g_epoch = time.time() - g_start
+    if os.getenv("DMT_INSTRUMENT_TRACEMALLOC") != "0":
+        tracemalloc.start()
+        g_traceMemory = True
+    atexit.register(Save, folder)
+
+
+def Enabled() -> bool:
+    return g_tool is not None
+
+
+def PeakRSS() -> int:
+    '''The peak resident set size of the process so far, in KB.'''
+    maxRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # (Linux reports it in KB, macOS in bytes)
+    return maxRSS // 1024 if sys.platform == 'darwin' else maxRSS
+
+
+def TracedMemory() -> int:
+    '''The memory allocated so far (as per tracemalloc) - after accounting
+    for the peak since the previous call in all the open phases.'''
+    if not g_traceMemory:
+        return 0
+    current, peak = tracemalloc.get_traced_memory()
+    for phase in g_stack:
+        phase[6] = max(phase[6], peak)
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+    return current
+
+
+def Begin(name: str, category: str, args: Optional[Dict[str, Any]] = None) -> None:
+    memory = TracedMemory()
+    g_stack.append([name, category, args or {}, time.perf_counter(), PeakRSS(), memory, memory])
+
+
+def End() -> None:
+    memory = TracedMemory()
+    end = time.perf_counter()
+    name, category, args, start, peakRSS, memoryAtStart, memoryPeak = g_stack.pop()
+    newPeakRSS = PeakRSS()
+    args = dict(args)
+    args.update({
+        'peakRSS_KB': newPeakRSS,
+        'peakRSSGrowth_KB': newPeakRSS - peakRSS,
+    })
+    if g_traceMemory:
+        args.update({
+            'allocatedDelta': memory - memoryAtStart,
+            'allocatedPeak': memoryPeak - memoryAtStart,
+        })
+    g_events.append({
+        'name': name,
+        'cat': category,
+        'ph': 'X',
+        'ts': (g_epoch + start) * 1e6,
+        'dur': (end - start) * 1e6,
+        'pid': os.getpid(),
+        'tid': 0,
+        'args': args,
+    })
+
+
+@contextlib.contextmanager
+def Phase(name: str, category: str = "phase", **args: Any) -> Iterator[None]:
+    '''Records the work done inside the 'with' block as a phase.'''
+    if g_tool is None:
+        yield
+        return
+    Begin(name, category, args)
+    try:
+        yield
+    finally:
+        End()
+
+
+def TakeEvents() -> List[Dict[str, Any]]:  # pylint: disable=invalid-sequence-index
+    '''The phases recorded by this process so far (i.e. not the ones that
+    a forked worker inherited), which are then forgotten - for workers,
+    that return them to the parent.'''
+    pid = os.getpid()
+    events = [x for x in g_events if x['pid'] == pid]
+    del g_events[:]
+    return events
+
+
+def AddEvents(events: List[Dict[str, Any]]) -> None:  # pylint: disable=invalid-sequence-index
+    '''Adds the phases recorded by a worker process.'''
+    g_events.extend(events)
+
+
+def Summary() -> List[Dict[str, Any]]:  # pylint: disable=invalid-sequence-index
+    '''The phases aggregated per category and name, slowest first.'''
+    phases = {}  # type: Dict[Tuple[str, str], Dict[str, Any]]
+    for event in g_events:
+        args = event['args']
+        phase = phases.setdefault((event['cat'], event['name']), {
+            'category': event['cat'],
+            'name': event['name'],
+            'count': 0,
+            'seconds': 0.0,
+            'maxSeconds': 0.0,
+            'peakRSSGrowth_KB': 0,
+            'allocatedDelta': 0,
+            'allocatedPeak': 0,
+        })
+        seconds = event['dur'] / 1e6
+        phase['count'] += 1
+        phase['seconds'] += seconds
+        phase['maxSeconds'] = max(phase['maxSeconds'], seconds)
+        phase['peakRSSGrowth_KB'] += args['peakRSSGrowth_KB']
+        phase['allocatedDelta'] += args.get('allocatedDelta', 0)
+        phase['allocatedPeak'] = max(phase['allocatedPeak'], args.get('allocatedPeak', 0))
+    return sorted(phases.values(), key=lambda x: -x['seconds'])
+
+
+def Save(folder: str) -> None:
+    '''Writes the JSON report and the Chrome trace of this invocation.'''
+    # (forked workers that exit normally must not overwrite the parent's files)
+    if os.getpid() != g_pid:
+        return
+    while g_stack:
+        End()
+    report = {
+        'tool': g_tool,
+        'argv': sys.argv,
+        'pid': g_pid,
+        'seconds': time.perf_counter() - g_start,
+        'peakRSS_KB': PeakRSS(),
+        'tracemalloc': g_traceMemory,
+        'phases': Summary(),
+    }
+    base = os.path.join(folder, "%s-%d" % (g_tool, g_pid))
+    try:
+        os.makedirs(folder, exist_ok=True)
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+        with open(base + ".trace.json", "w", encoding="utf-8") as f:
+            json.dump({'traceEvents': g_events, 'displayTimeUnit': 'ms'}, f)
+    except OSError as e:
+        utility.warn("Failed to save the instrumentation report (%s)", str(e))
@@ -0,0 +1,172 @@
+# (C)  Semantix Information Technologies,
+#      Neuropublic,
+#      European Space Agency
+#
+# The license of the Data Modelling Tools (DMT) is GPL with Runtime Exception
+
+'''
+The files generated by the mappers.
+
+Rewriting a generated file moves its timestamp even if its content is the
+same - and make/gprbuild then rebuild everything that depends on it. So
+the mappers open their outputs via Open: the content is kept in memory,
+and when the file is closed it only replaces the existing file (atomically,
+via a rename) if the content actually changed.
+
+The files that the mappers never close are committed by CloseAll, which
+the tools call before their Report (and which also runs at exit).
+'''
+
+import io
+import os
+import stat
+import atexit
+import locale
+import hashlib
+import tempfile
+
+from typing import IO, Any, List, Optional, Tuple, Union  # NOQA pylint: disable=unused-import
+
+from .utility import panic, inform
+
+# How many generated files were (re)written, and how many were left untouched
+g_written = 0
+g_untouched = 0
+
+# The generated files that are still open
+g_openFiles = []  # type: List[Union[GeneratedTextFile, GeneratedBinaryFile]]
+
+# The (absolute) paths of all the generated files, in the order they were opened
+g_opened = []  # type: List[str]
+
+g_umask = None  # type: Optional[int]
+
+
+def SameContent(filename: str, data: bytes) -> bool:
+    '''Whether the file already contains exactly this data.'''
+    try:
+        if os.stat(filename).st_size != len(data):
+            return False
+        filehash = hashlib.md5()
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                filehash.update(chunk)
+    except OSError:
+        return False
+    return filehash.digest() == hashlib.md5(data).digest()
+
+
+def FileMode(filename: str) -> int:
+    '''The permissions of the existing file - or, for new files, the ones
+    that open() would use.'''
+    global g_umask
+    try:
+        return stat.S_IMODE(os.stat(filename).st_mode)
+    except OSError:
+        pass
+    if g_umask is None:
+        g_umask = os.umask(0)
+        os.umask(g_umask)
+    return 0o666 & ~g_umask
+
+
+def Commit(filename: str, data: bytes) -> bool:
+    '''Replaces the file with the data, unless it already contains it.
+    Returns whether the file was written.'''
+    global g_written, g_untouched
+    if SameContent(filename, data):
+        g_untouched += 1
+        return False
+    (fd, tmpFilename) = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), prefix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmpFilename, FileMode(filename))
+        # Readers (e.g. a parallel make) must never see a partial file
+        os.replace(tmpFilename, filename)
+    except OSError as e:
+        if os.path.exists(tmpFilename):
+            os.unlink(tmpFilename)
+        panic("Failed to write '%s' (%s)" % (filename, str(e)))
+    g_written += 1
+    return True
+
+
+def Copy(source: str, target: str) -> bool:
+    '''The replacement of "cp source target" for the files that are copied
+    into the output folder (target can be a folder).'''
+    if os.path.isdir(target):
+        target = os.path.join(target, os.path.basename(source))
+    g_opened.append(os.path.abspath(target))
+    with open(source, "rb") as f:
+        return Commit(target, f.read())
+
+
+class GeneratedTextFile(io.StringIO):
+    def __init__(self, filename: str) -> None:
+        super().__init__()
+        self._filename = filename
+        g_openFiles.append(self)
+
+    def close(self) -> None:
+        if not self.closed:
+            data = self.getvalue().encode(locale.getpreferredencoding(False))
+            super().close()
+            g_openFiles.remove(self)
+            Commit(self._filename, data)
+
+
+class GeneratedBinaryFile(io.BytesIO):
+    def __init__(self, filename: str) -> None:
+        super().__init__()
+        self._filename = filename
+        g_openFiles.append(self)
+
+    def close(self) -> None:
+        if not self.closed:
+            data = self.getvalue()
+            super().close()
+            g_openFiles.remove(self)
+            Commit(self._filename, data)
+
+
+def Open(filename: str, mode: str = 'w') -> IO[Any]:
+    '''The replacement of open(filename, mode) for generated files.'''
+    g_opened.append(os.path.abspath(filename))
+    if mode == 'w':
+        return GeneratedTextFile(filename)
+    if mode == 'wb':
+        return GeneratedBinaryFile(filename)
+    panic("Generated files can only be opened with mode 'w' or 'wb', not '%s'" % mode)
+
+
+def Opened() -> List[str]:  # pylint: disable=invalid-sequence-index
+    '''The paths of the files generated so far (see Open and Copy).'''
+    return g_opened
+
+
+def CloseAll() -> None:
+    '''Commits the generated files that are still open.'''
+    for f in g_openFiles[:]:
+        f.close()
+
+
+def Counts() -> Tuple[int, int]:
+    '''How many generated files were written, and how many were untouched.'''
+    return g_written, g_untouched
+
+
+def AddCounts(written: int, untouched: int) -> None:
+    '''Accounts for the files generated by another (worker) process.'''
+    global g_written, g_untouched
+    g_written += written
+    g_untouched += untouched
+
+
+def Report() -> None:
+    CloseAll()
+    if g_written or g_untouched:
+        inform("Generated files: %d written, %d unchanged (left untouched).", g_written, g_untouched)
+
+
+atexit.register(CloseAll)
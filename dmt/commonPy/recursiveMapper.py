@@ -19,7 +19,8 @@
 # generated code.
 #
 import re
-from typing import Union, List, Dict, TypeVar, Generic
+import contextlib
+from typing import Union, List, Dict, Optional, Set, IO, Any, Iterable, Iterator, TypeVar, Generic  # NOQA pylint: disable=unused-import
 
 from .utility import panicWithCallStack
 from .asnAST import (
@@ -32,8 +33,50 @@ TSrc = TypeVar('TSrc')
 TDest = TypeVar('TDest')
 
 
+class Emitter:
+    '''Where the mappers write the code they generate (see Emit): the lines
+    are buffered, and indented as per the current nesting (see Indented) -
+    instead of being copied and re-indented at every level.'''
+    def __init__(self) -> None:
+        self._lines = []  # type: List[str]
+        self._indent = ""
+        self._indents = []  # type: List[str]
+
+    def Line(self, line: str) -> None:
+        self._lines.append(self._indent + line)
+
+    def Lines(self, lines: Iterable[str]) -> None:
+        if self._indent:
+            indent = self._indent
+            self._lines.extend(indent + x for x in lines)
+        else:
+            self._lines.extend(lines)
+
+    @contextlib.contextmanager
+    def Indented(self, indent: str = "    ") -> Iterator[None]:
+        self._indents.append(self._indent)
+        self._indent += indent
+        try:
+            yield
+        finally:
+            self._indent = self._indents.pop()
+
+    def GetLines(self) -> List[str]:  # pylint: disable=invalid-sequence-index
+        return self._lines
+
+    def WriteTo(self, f: IO[Any]) -> None:
+        '''Writes (and drops) the lines emitted so far.'''
+        f.write("".join(self._lines))
+        self._lines = []
+
+
 # noinspection PyMethodMayBeStatic
 class RecursiveMapperGeneric(Generic[TSrc, TDest]):
+    # When outlining is enabled (see EnableOutlining), the named types whose
+    # conversion routines were called since the last OutlinedRoutines, and
+    # the ones whose routines were already emitted.
+    _outlinedCalls = None  # type: Optional[List[str]]
+    _outlinedDone = None  # type: Optional[Set[str]]
 
     def maybeElse(self, childNo: int) -> str:  # pylint: disable=no-self-use
         if childNo == 1:
@@ -77,46 +120,144 @@ class RecursiveMapperGeneric(Generic[TSrc, TDest]):
     def MapSetOf(self, unused_srcVar: TSrc, unused_destVar: TDest, unused_node: AsnSetOf, unused_leafTypeDict: AST_Leaftypes, unused_names: AST_Lookup) -> List[str]:  # pylint: disable=no-self-use,invalid-sequence-index
         panicWithCallStack("Method undefined in a RecursiveMapper...")
 
-    def Map(self,
-            srcVar: TSrc,
-            destVar: TDest,
-            node_or_str: Union[str, AsnNode],
-            leafTypeDict: Dict[str, str],
-            names: Dict[str, AsnNode]) -> List[str]:  # pylint: disable=invalid-sequence-index
+    # The Emit* methods are what Emit dispatches to. By default they are
+    # adapters over the Map* methods of the mappers that return lists;
+    # the mappers that write directly into the emitter override them.
+    def EmitInteger(self, emitter: Emitter, srcVar: TSrc, destVar: TDest, node: AsnInt, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Lines(self.MapInteger(srcVar, destVar, node, leafTypeDict, names))
+
+    def EmitReal(self, emitter: Emitter, srcVar: TSrc, destVar: TDest, node: AsnReal, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Lines(self.MapReal(srcVar, destVar, node, leafTypeDict, names))
+
+    def EmitBoolean(self, emitter: Emitter, srcVar: TSrc, destVar: TDest, node: AsnBool, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Lines(self.MapBoolean(srcVar, destVar, node, leafTypeDict, names))
+
+    def EmitOctetString(self, emitter: Emitter, srcVar: TSrc, destVar: TDest, node: AsnOctetString, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Lines(self.MapOctetString(srcVar, destVar, node, leafTypeDict, names))
+
+    def EmitEnumerated(self, emitter: Emitter, srcVar: TSrc, destVar: TDest, node: AsnEnumerated, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Lines(self.MapEnumerated(srcVar, destVar, node, leafTypeDict, names))
+
+    def EmitSequence(self, emitter: Emitter, srcVar: TSrc, destVar: TDest, node: AsnSequence, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Lines(self.MapSequence(srcVar, destVar, node, leafTypeDict, names))
+
+    def EmitSet(self, emitter: Emitter, srcVar: TSrc, destVar: TDest, node: AsnSet, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Lines(self.MapSet(srcVar, destVar, node, leafTypeDict, names))
+
+    def EmitChoice(self, emitter: Emitter, srcVar: TSrc, destVar: TDest, node: AsnChoice, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Lines(self.MapChoice(srcVar, destVar, node, leafTypeDict, names))
+
+    def EmitSequenceOf(self, emitter: Emitter, srcVar: TSrc, destVar: TDest, node: AsnSequenceOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Lines(self.MapSequenceOf(srcVar, destVar, node, leafTypeDict, names))
+
+    def EmitSetOf(self, emitter: Emitter, srcVar: TSrc, destVar: TDest, node: AsnSetOf, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> None:
+        emitter.Lines(self.MapSetOf(srcVar, destVar, node, leafTypeDict, names))
+
+    def EnableOutlining(self) -> None:
+        '''Map the named (non-artificial) SEQUENCE, SET, CHOICE, SEQUENCE OF
+        and SET OF types that are reached via members and arrays with calls
+        to a conversion routine (see OutlinedCall), instead of expanding
+        them inline every time. The mappers supporting this also implement
+        OutlinedRoutine, and their users must emit the OutlinedRoutines.'''
+        self._outlinedCalls = []
+        self._outlinedDone = set()
+
+    def OutlinedCall(self, unused_srcVar: TSrc, unused_destVar: TDest, unused_typename: str) -> List[str]:  # pylint: disable=no-self-use,invalid-sequence-index
+        panicWithCallStack("Method undefined in a RecursiveMapper that supports outlining...")
+
+    def OutlinedRoutine(self, unused_typename: str, unused_node: AsnNode, unused_leafTypeDict: AST_Leaftypes, unused_names: AST_Lookup) -> List[str]:  # pylint: disable=no-self-use,invalid-sequence-index
+        panicWithCallStack("Method undefined in a RecursiveMapper that supports outlining...")
+
+    def OutlinedRoutines(self, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+        '''The definitions of the conversion routines called since the last
+        invocation (and of the ones they call, which come first) - each
+        routine is only emitted once.'''
+        lines = []  # type: List[str]
+        if self._outlinedCalls is None:
+            return lines
+        pending, self._outlinedCalls = self._outlinedCalls, []
+        for typename in pending:
+            self._EmitOutlined(typename, leafTypeDict, names, lines)
+        return lines
+
+    def _EmitOutlined(self, typename: str, leafTypeDict: AST_Leaftypes, names: AST_Lookup, lines: List[str]) -> None:  # pylint: disable=invalid-sequence-index
+        assert self._outlinedCalls is not None and self._outlinedDone is not None
+        if typename in self._outlinedDone:
+            return
+        self._outlinedDone.add(typename)
+        routine = self.OutlinedRoutine(typename, names[typename], leafTypeDict, names)  # pylint: disable=assignment-from-no-return
+        callees, self._outlinedCalls = self._outlinedCalls, []
+        for callee in callees:
+            self._EmitOutlined(callee, leafTypeDict, names, lines)
+        lines.extend(routine)
+
+    def Emit(self,
+             emitter: Emitter,
+             srcVar: TSrc,
+             destVar: TDest,
+             node_or_str: Union[str, AsnNode],
+             leafTypeDict: AST_Leaftypes,
+             names: AST_Lookup) -> None:
         if isinstance(node_or_str, str):
             node = names[node_or_str]  # type: AsnNode
+            if self._outlinedCalls is not None \
+                    and isinstance(node, (AsnSequence, AsnSet, AsnChoice, AsnSequenceOf, AsnSetOf)) \
+                    and not node._isArtificial:
+                self._outlinedCalls.append(node_or_str)
+                emitter.Lines(self.OutlinedCall(srcVar, destVar, node_or_str))
+                return
         else:
             node = node_or_str
-        lines = []  # type: List[str]
         if isinstance(node, AsnInt):
-            lines.extend(self.MapInteger(srcVar, destVar, node, leafTypeDict, names))
+            self.EmitInteger(emitter, srcVar, destVar, node, leafTypeDict, names)
         elif isinstance(node, AsnReal):
-            lines.extend(self.MapReal(srcVar, destVar, node, leafTypeDict, names))
+            self.EmitReal(emitter, srcVar, destVar, node, leafTypeDict, names)
         elif isinstance(node, AsnBool):
-            lines.extend(self.MapBoolean(srcVar, destVar, node, leafTypeDict, names))
+            self.EmitBoolean(emitter, srcVar, destVar, node, leafTypeDict, names)
         elif isinstance(node, AsnOctetString):
-            lines.extend(self.MapOctetString(srcVar, destVar, node, leafTypeDict, names))
+            self.EmitOctetString(emitter, srcVar, destVar, node, leafTypeDict, names)
         elif isinstance(node, AsnSequence):
-            lines.extend(self.MapSequence(srcVar, destVar, node, leafTypeDict, names))
+            self.EmitSequence(emitter, srcVar, destVar, node, leafTypeDict, names)
         elif isinstance(node, AsnSet):
-            lines.extend(self.MapSet(srcVar, destVar, node, leafTypeDict, names))
+            self.EmitSet(emitter, srcVar, destVar, node, leafTypeDict, names)
         elif isinstance(node, AsnChoice):
-            lines.extend(self.MapChoice(srcVar, destVar, node, leafTypeDict, names))
+            self.EmitChoice(emitter, srcVar, destVar, node, leafTypeDict, names)
         elif isinstance(node, AsnSequenceOf):
-            lines.extend(self.MapSequenceOf(srcVar, destVar, node, leafTypeDict, names))
+            self.EmitSequenceOf(emitter, srcVar, destVar, node, leafTypeDict, names)
         elif isinstance(node, AsnSetOf):
-            lines.extend(self.MapSetOf(srcVar, destVar, node, leafTypeDict, names))
+            self.EmitSetOf(emitter, srcVar, destVar, node, leafTypeDict, names)
         elif isinstance(node, AsnEnumerated):
-            lines.extend(self.MapEnumerated(srcVar, destVar, node, leafTypeDict, names))
+            self.EmitEnumerated(emitter, srcVar, destVar, node, leafTypeDict, names)
         elif isinstance(node, AsnMetaMember):
-            lines.extend(self.Map(srcVar, destVar, names[node._containedType], leafTypeDict, names))
+            self.Emit(emitter, srcVar, destVar, node._containedType, leafTypeDict, names)
         else:
             panicWithCallStack("unsupported %s (%s)" % (str(node.__class__), node.Location()))
-        return lines
+
+    def Map(self,
+            srcVar: TSrc,
+            destVar: TDest,
+            node_or_str: Union[str, AsnNode],
+            leafTypeDict: Dict[str, str],
+            names: Dict[str, AsnNode]) -> List[str]:  # pylint: disable=invalid-sequence-index
+        '''The lines that Emit generates (for the users of the mappers that
+        want a list).'''
+        emitter = Emitter()
+        self.Emit(emitter, srcVar, destVar, node_or_str, leafTypeDict, names)
+        return emitter.GetLines()
 
 
 # pylint: disable=no-self-use
 RecursiveMapper = RecursiveMapperGeneric[str, str]
 
 
+def OutlinedCRoutine(mapper: RecursiveMapper, routine: str, srcType: str, destType: str, node: AsnNode, leafTypeDict: AST_Leaftypes, names: AST_Lookup) -> List[str]:  # pylint: disable=invalid-sequence-index
+    '''The OutlinedRoutine of the mappers that generate C code.'''
+    emitter = Emitter()
+    emitter.Line("static void %s(const %s *pSrc, %s *pDst)\n{\n" % (routine, srcType, destType))
+    with emitter.Indented():
+        mapper.Emit(emitter, "(*pSrc)", "(*pDst)", node, leafTypeDict, names)
+    emitter.Line("}\n\n")
+    return emitter.GetLines()
+
+
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
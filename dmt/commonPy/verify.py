@@ -23,7 +23,7 @@ This module checks that all ASN.1 types are using the appropriate
 constraint (ASSERT-wise).
 '''
 
-from typing import Dict, Union  # NOQA
+from typing import Dict, List, Set, Union  # NOQA
 
 from .utility import panic
 
@@ -101,4 +101,77 @@ calling VerifyNodeRange for each Node.'''
     else:
         panic("VerifyRanges: Unexpected %s\n" % str(node))
 
+
+class ASTValidator:
+    '''Validates the named types of an AST, visiting each of them once.
+
+Verdicts are cached by type name, so the same validator can be used
+for the checks of all the input files - but a new one must be created
+if the AST changes.'''
+    def __init__(self, names: Dict[str, AsnNode]) -> None:
+        self._names = names
+        self._verified = set()  # type: Set[str]
+        self._badTypes = None  # type: Union[None, Set[str]]
+
+    def VerifyRanges(self, node_or_str: Union[str, AsnNode]) -> None:
+        '''Same checks as VerifyRanges - but types that were already
+verified (directly, or as descendants of others) are skipped.'''
+        pending = [node_or_str]
+        while pending:
+            node_or_str = pending.pop()
+            if isinstance(node_or_str, asnAST.AsnMetaMember):
+                node_or_str = node_or_str._containedType
+            if isinstance(node_or_str, str):
+                if node_or_str in self._verified:
+                    continue
+                self._verified.add(node_or_str)
+                node = self._names[node_or_str]  # type: AsnNode
+            else:
+                node = node_or_str
+
+            if isinstance(node, asnAST.AsnBasicNode):
+                VerifyNodeRange(node)
+            elif isinstance(node, (asnAST.AsnSequence, asnAST.AsnChoice, asnAST.AsnSet)):
+                pending.extend(reversed([child[1] for child in node._members]))
+            elif isinstance(node, (asnAST.AsnSequenceOf, asnAST.AsnSetOf)):
+                VerifyNodeRange(node)
+                pending.append(node._containedType)
+            elif isinstance(node, asnAST.AsnEnumerated):
+                VerifyNodeRange(node)
+            else:
+                panic("VerifyRanges: Unexpected %s\n" % str(node))
+
+    def BadTypes(self) -> Set[str]:
+        '''The names of the types that are (or contain) IA5Strings.
+
+The types that directly contain one are found in a single scan, and
+the "taint" is then propagated to the types that use them, through
+the reverse dependencies.'''
+        if self._badTypes is not None:
+            return self._badTypes
+        usedBy = {}  # type: Dict[str, List[str]]
+        pending = []  # type: List[str]
+        for name, node in self._names.items():
+            if isinstance(node, (asnAST.AsnChoice, asnAST.AsnSequence, asnAST.AsnSet)):
+                children = [child[1] for child in node._members]
+            elif isinstance(node, (asnAST.AsnSequenceOf, asnAST.AsnSetOf)):
+                children = [node._containedType]
+            else:
+                children = [node]
+            for child in children:
+                if isinstance(child, asnAST.AsnAsciiString):
+                    pending.append(name)
+                elif isinstance(child, asnAST.AsnMetaMember):
+                    usedBy.setdefault(child._containedType, []).append(name)
+                elif isinstance(child, str):
+                    usedBy.setdefault(child, []).append(name)
+        badTypes = set()  # type: Set[str]
+        while pending:
+            name = pending.pop()
+            if name not in badTypes:
+                badTypes.add(name)
+                pending.extend(usedBy.get(name, []))
+        self._badTypes = badTypes
+        return badTypes
+
 # vim: tabstop=8 expandtab shiftwidth=4 softtabstop=4
@@ -29,18 +29,17 @@ generates printer-functions for their content.
 #
 import os
 import sys
-import copy
 
-from typing import Tuple, List
+from typing import Dict, List  # NOQA pylint: disable=unused-import
 
+from .commonPy import outputFiles
 from .commonPy import configMT
 from .commonPy.asnAST import sourceSequenceLimit, AsnNode  # NOQA pylint: disable=unused-import
 from .commonPy import asnParser
 from .commonPy.asnParser import (  # NOQA pylint: disable=unused-import
-    AST_Lookup, AST_Leaftypes,
+    AST_Lookup, AST_Leaftypes, AST_FileView,
     Typename, Filename, ParseAsnFileList)
 from .commonPy.utility import inform, panic
-from .commonPy import cleanupNodes
 from .commonPy.recursiveMapper import RecursiveMapper
 
 from .commonPy import verify
@@ -187,39 +186,31 @@ def main():
         if not os.path.isfile(f):
             panic("'%s' is not a file!\n" % f)  # pragma: no cover
 
-    ParseAsnFileList(sys.argv[1:])
+    model = ParseAsnFileList(sys.argv[1:])
 
-    Triples = Tuple[AST_Lookup, List[AsnNode], AST_Leaftypes]  # NOQA pylint: disable=unused-variable,invalid-sequence-index
-    uniqueASNfiles = {}  # type: Dict[Filename, Triples]
+    uniqueASNfiles = {}  # type: Dict[Filename, AST_FileView]
     for grammar in sys.argv[1:]:
-        uniqueASNfiles[grammar] = None
+        uniqueASNfiles[grammar] = None  # type: ignore
 
+    validator = verify.ASTValidator(model._names)
     for asnFile in uniqueASNfiles:
-        tmpNames = {}  # Dict[Typename, AsnNode]
-        for name in asnParser.g_typesOfFile[asnFile]:
-            tmpNames[name] = asnParser.g_names[name]
-
-        uniqueASNfiles[asnFile] = (
-            copy.copy(tmpNames),                            # map Typename to type definition class from asnAST
-            copy.copy(asnParser.g_astOfFile[asnFile]),    # list of nameless type definitions
-            copy.copy(asnParser.g_leafTypeDict)    # map from Typename to leafType
-        )
+        uniqueASNfiles[asnFile] = asnParser.ViewOfFile(asnFile, model)
 
         inform("Checking that all base nodes have mandatory ranges set in %s..." % asnFile)
-        for node in list(tmpNames.values()):
-            verify.VerifyRanges(node, asnParser.g_names)
+        for name in uniqueASNfiles[asnFile].names:
+            validator.VerifyRanges(name)
 
     # If some AST nodes must be skipped (for any reason), go learn about them
-    badTypes = cleanupNodes.DiscoverBadTypes()
+    badTypes = validator.BadTypes()
 
-    C_HeaderFile = open(configMT.outputDir + os.sep + "PrintTypesAsASN1.h", "w")
+    C_HeaderFile = outputFiles.Open(configMT.outputDir + os.sep + "PrintTypesAsASN1.h", "w")
     C_HeaderFile.write('#ifndef __PRINTTYPESASASN1_H__\n')
     C_HeaderFile.write('#define __PRINTTYPESASASN1_H__\n\n')
     C_HeaderFile.write('#ifdef __cplusplus\n')
     C_HeaderFile.write('extern "C" {\n')
     C_HeaderFile.write('#endif\n\n')
 
-    C_SourceFile = open(configMT.outputDir + os.sep + "PrintTypesAsASN1.c", "w")
+    C_SourceFile = outputFiles.Open(configMT.outputDir + os.sep + "PrintTypesAsASN1.c", "w")
     C_SourceFile.write('#ifdef __unix__\n')
     C_SourceFile.write('#include <stdio.h>\n')
     C_SourceFile.write('#endif\n\n')
@@ -234,9 +225,9 @@ def main():
         asn_name = os.path.basename(os.path.splitext(asnFile)[0])
         C_HeaderFile.write("#include \"%s.h\" // Generated by ASN1SCC\n\n" % asn_name)
 
-        leafTypeDict = uniqueASNfiles[asnFile][2]
+        leafTypeDict = uniqueASNfiles[asnFile].leafTypes
         inform("Executing mappings for types inside %s...", asnFile)
-        names = uniqueASNfiles[asnFile][0]
+        names = uniqueASNfiles[asnFile].names
 
         printer = Printer()
 
@@ -263,8 +254,8 @@ def main():
             C_SourceFile.write('#ifdef __unix__\n')
             C_SourceFile.write('    //printf("%%s %s ::= ", paramName);\n' % nodeTypename)
             C_SourceFile.write('    printf("%s ", paramName);\n')
-            # C_SourceFile.write('\n'.join(printer.Map('(*pData)', '', node, leafTypeDict, asnParser.g_names)))
-            lines = ["    " + x for x in printer.Map('(*pData)', '', node, leafTypeDict, asnParser.g_names)]
+            # C_SourceFile.write('\n'.join(printer.Map('(*pData)', '', node, leafTypeDict, model._names)))
+            lines = ["    " + x for x in printer.Map('(*pData)', '', node, leafTypeDict, model._names)]
             C_SourceFile.write("\n".join(lines))
             C_SourceFile.write('\n#endif\n')
             C_SourceFile.write('#ifdef __linux__\n')
@@ -276,6 +267,9 @@ def main():
     C_HeaderFile.write('}\n')
     C_HeaderFile.write('#endif\n')
     C_HeaderFile.write('\n#endif\n')
+    C_HeaderFile.close()
+    C_SourceFile.close()
+    outputFiles.Report()
 
 if __name__ == "__main__":
     if "-pdb" in sys.argv:
@@ -35,6 +35,7 @@ import getopt
 from typing import Dict, List  # NOQA
 
 from .commonPy import asnParser
+from .commonPy import instrumentation
 from .commonPy.createInternalTypes import ScanChildren
 from .commonPy.asnParser import AST_Lookup  # NOQA pylint: disable=unused-import
 from .commonPy.commonSMP2 import (
@@ -133,6 +134,7 @@ def SaveASN_AST(bPruneUnnamedInnerTASTEtypes: bool, outputAsn1Grammar: str, iden
 
 
 def main() -> int:
+    instrumentation.Start("smp2asn")
     try:
         optlist, args = getopt.gnu_getopt(
             sys.argv[1:],
@@ -170,11 +172,14 @@ def main() -> int:
     if inputAsn1Grammar:
         CheckFileExists(inputAsn1Grammar)
 
-    smp2AsnAST, unused_idToTypeDict = ConvertCatalogueToASN_AST(inputSmp2Files)
+    with instrumentation.Phase("SMP2 catalogues", "smp2", files=inputSmp2Files):
+        smp2AsnAST, unused_idToTypeDict = ConvertCatalogueToASN_AST(inputSmp2Files)
     if inputAsn1Grammar:
         asnParser.ParseAsnFileList([inputAsn1Grammar])
-    identicals = MergeASN1_AST(smp2AsnAST)
-    SaveASN_AST(bPrune, outputAsn1Grammar, identicals)
+    with instrumentation.Phase("Merge", "smp2"):
+        identicals = MergeASN1_AST(smp2AsnAST)
+    with instrumentation.Phase("Save", "smp2"):
+        SaveASN_AST(bPrune, outputAsn1Grammar, identicals)
     return 0
 
 
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+'''
+Measures the time that aadl2glueC needs to load the AADL models of
+tests-coverage: with the in-process parser, and (if python2 and its
+antlr module are installed) with parse_aadl.py under python2 - which
+includes the interpreter startup, the pickle round-trip and the patching
+of the classes of the unpickled objects.
+
+When both parsers are available, the report also says whether they
+built the same model.
+
+To compare with another version of DMT, point -root to its checkout
+(the folder that contains 'dmt', with a configured dmt/commonPy/__init__.py)
+
+Usage: benchAADLParser.py [-root folder] [-repeats N]
+'''
+import os
+import sys
+import time
+import subprocess
+
+from typing import Any, List, Optional  # NOQA pylint: disable=unused-import
+
+g_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+if '-root' in sys.argv:
+    g_idx = sys.argv.index('-root')
+    g_root = sys.argv[g_idx + 1]
+    del sys.argv[g_idx:g_idx + 2]
+sys.path.insert(0, g_root)
+
+from dmt import aadl2glueC  # NOQA pylint: disable=wrong-import-position
+from dmt.commonPy import aadlAST  # NOQA pylint: disable=wrong-import-position
+
+g_repeats = 5
+if '-repeats' in sys.argv:
+    g_idx = sys.argv.index('-repeats')
+    g_repeats = int(sys.argv[g_idx + 1])
+    del sys.argv[g_idx:g_idx + 2]
+
+g_models = [
+    ['mini_cv.aadl', 'DataView.aadl'],
+    ['mini_cv_vhdl.aadl', 'DataViewVHDL.aadl'],
+    ['model.aadl', 'DD_view.aadl'],
+    ['gnc.aadl', 'NoenumInt.aadl'],
+    ['D_view.aadl'],
+]
+
+# The attributes that only the classes of commonPy2.aadlAST have
+g_python2Attributes = frozenset(['_calls', '_fpgaModes'])
+
+
+def Python2ParserAvailable() -> bool:
+    try:
+        return subprocess.call(['python2', '-c', 'import antlr'], stderr=subprocess.DEVNULL) == 0
+    except OSError:
+        return False
+
+
+def Describe(o: Any) -> str:
+    '''A canonical description of the AADL model (or part of it).'''
+    if isinstance(o, dict):
+        return "{" + ",".join(repr(k) + ":" + Describe(o[k]) for k in sorted(o)) + "}"
+    if isinstance(o, (list, tuple)):
+        return "[" + ",".join(Describe(x) for x in o) + "]"
+    if hasattr(o, '__dict__'):
+        return type(o).__name__ + Describe({
+            k: v for k, v in vars(o).items() if k not in g_python2Attributes})
+    return repr(o)
+
+
+def Load(files: List[str], usePython2: bool) -> Any:  # pylint: disable=invalid-sequence-index
+    '''The best time (over g_repeats runs) and the model.'''
+    best = None
+    sys.argv = ['aadl2glueC'] + files
+    for _ in range(g_repeats):
+        start = time.perf_counter()
+        aadl2glueC.ParseAADLfilesAndResolveSignals(usePython2)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    model = Describe([aadlAST.g_apLevelContainers, aadlAST.g_subProgramImplementations,
+                      aadlAST.g_processImplementations, aadlAST.g_threadImplementations])
+    return best, model
+
+
+def main() -> None:
+    # The cache would hide the parsing
+    os.environ.pop('PROJECT_CACHE', None)
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests-coverage'))
+    python2 = Python2ParserAvailable()
+    print("DMT from:", os.path.abspath(g_root))
+    if not python2:
+        print("(python2 with antlr is not installed - only the in-process parser is measured)")
+    print("%-36s %14s %14s %8s" % ("model", "in-process ms", "python2 ms", "same"))
+    for files in g_models:
+        inProcessTime, inProcessModel = Load(files, False)
+        if python2:
+            python2Time, python2Model = Load(files, True)
+            print("%-36s %14.2f %14.2f %8s" % (
+                "+".join(files), inProcessTime * 1000.0, python2Time * 1000.0,
+                "yes" if inProcessModel == python2Model else "NO"))
+        else:
+            print("%-36s %14.2f %14s %8s" % ("+".join(files), inProcessTime * 1000.0, "-", "-"))
+
+
+if __name__ == "__main__":
+    main()
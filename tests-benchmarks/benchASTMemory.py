@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+'''
+Measures the memory used by the ASN.1 AST of a large synthetic grammar.
+
+The grammar is written as an ASN1SCC XML AST (no ASN1SCC needed) and is
+loaded via asnParser.ParseASN1SCC_AST; the report is the memory that is
+still allocated afterwards (the resolved g_names, g_leafTypeDict, etc)
+divided by the number of types. Each "unit" of the grammar contains an
+INTEGER, a REAL, an ENUMERATED, an OCTET STRING, a typedef, a SEQUENCE
+with inline fields (including a SEQUENCE OF) and a CHOICE.
+
+To compare with another version of DMT, point -root to its checkout
+(the folder that contains 'dmt', with a configured dmt/commonPy/__init__.py)
+
+Usage: benchASTMemory.py [-root folder] [numberOfTypes ...]
+'''
+import os
+import gc
+import sys
+import tempfile
+import tracemalloc
+
+from typing import IO, Any, List  # NOQA pylint: disable=unused-import
+
+g_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+if '-root' in sys.argv:
+    g_idx = sys.argv.index('-root')
+    g_root = sys.argv[g_idx + 1]
+    del sys.argv[g_idx:g_idx + 2]
+sys.path.insert(0, g_root)
+
+from dmt.commonPy import asnParser  # NOQA pylint: disable=wrong-import-position
+
+g_typesPerUnit = 8
+g_unitsPerModule = 200
+
+
+def WriteUnit(f: IO[Any], unit: int) -> None:
+    u = '%d' % unit
+    f.write('''\
+<TypeAssignment Name="T-Int-{u}" Line="1" AddedType="False">
+  <Type Line="1" HasAcnEncDecFunction="False"><IntegerType Min="0" Max="1000"/></Type></TypeAssignment>
+<TypeAssignment Name="T-Real-{u}" Line="2" AddedType="False">
+  <Type Line="2"><RealType Min="-1.0" Max="1.0"/></Type></TypeAssignment>
+<TypeAssignment Name="T-Enum-{u}" Line="3" AddedType="False">
+  <Type Line="3"><EnumeratedType><EnumValues>
+    <EnumValue StringValue="idle" IntValue="0" EnumID="idle"/>
+    <EnumValue StringValue="busy" IntValue="1" EnumID="busy"/>
+    <EnumValue StringValue="failed" IntValue="2" EnumID="failed"/>
+  </EnumValues></EnumeratedType></Type></TypeAssignment>
+<TypeAssignment Name="T-Buf-{u}" Line="4" AddedType="False">
+  <Type Line="4"><OctetStringType Min="1" Max="64"/></Type></TypeAssignment>
+<TypeAssignment Name="T-Alias-{u}" Line="5" AddedType="False">
+  <Type Line="5"><ReferenceType ReferencedTypeName="T-Int-{u}" Min="0" Max="100"/></Type></TypeAssignment>
+<TypeAssignment Name="T-Seq-{u}" Line="6" AddedType="False">
+  <Type Line="6"><SequenceType>
+    <SequenceOrSetChild VarName="id" Optional="False"><Type Line="7"><ReferenceType ReferencedTypeName="T-Alias-{u}"/></Type></SequenceOrSetChild>
+    <SequenceOrSetChild VarName="mode" Optional="False"><Type Line="8"><ReferenceType ReferencedTypeName="T-Enum-{u}"/></Type></SequenceOrSetChild>
+    <SequenceOrSetChild VarName="valid" Optional="False"><Type Line="9"><BooleanType/></Type></SequenceOrSetChild>
+    <SequenceOrSetChild VarName="gain" Optional="False"><Type Line="10"><RealType Min="0.0" Max="10.0"/></Type></SequenceOrSetChild>
+    <SequenceOrSetChild VarName="samples" Optional="False"><Type Line="11"><SequenceOfType Min="1" Max="16">
+      <Type Line="11"><ReferenceType ReferencedTypeName="T-Real-{u}"/></Type></SequenceOfType></Type></SequenceOrSetChild>
+  </SequenceType></Type></TypeAssignment>
+<TypeAssignment Name="T-Choice-{u}" Line="12" AddedType="False">
+  <Type Line="12"><ChoiceType>
+    <ChoiceChild VarName="seq" EnumID="seq_PRESENT"><Type Line="13"><ReferenceType ReferencedTypeName="T-Seq-{u}"/></Type></ChoiceChild>
+    <ChoiceChild VarName="buf" EnumID="buf_PRESENT"><Type Line="14"><ReferenceType ReferencedTypeName="T-Buf-{u}"/></Type></ChoiceChild>
+  </ChoiceType></Type></TypeAssignment>
+'''.format(u=u))
+
+
+def WriteGrammar(f: IO[Any], numberOfTypes: int) -> None:
+    '''Writes an XML AST with (approximately) numberOfTypes types
+    (the inline SEQUENCE OF of each SEQUENCE is named by VerifyAndFixAST).'''
+    units = max(1, numberOfTypes // g_typesPerUnit)
+    f.write('<?xml version="1.0" encoding="utf-8"?>\n<ASN1AST>\n')
+    for first in range(0, units, g_unitsPerModule):
+        f.write('<Asn1File FileName="synthetic-%d.asn">\n' % first)
+        f.write('<Asn1Module ID="Synthetic-%d"><ExportedTypes/><ExportedVariables/><ImportedModules/>\n' % first)
+        f.write('<TypeAssignments>\n')
+        for unit in range(first, min(units, first + g_unitsPerModule)):
+            WriteUnit(f, unit)
+        f.write('</TypeAssignments></Asn1Module></Asn1File>\n')
+    f.write('</ASN1AST>\n')
+
+
+def ClearGlobals() -> None:
+    for d in [asnParser.g_names, asnParser.g_leafTypeDict, asnParser.g_metatypes,
+              asnParser.g_typesOfFile, asnParser.g_astOfFile, asnParser.g_modules,
+              asnParser.g_adaUses, asnParser.g_checkedSoFarForKeywords]:
+        d.clear()
+    gc.collect()
+
+
+def main() -> None:
+    sizes = [int(x) for x in sys.argv[1:]] or [10000, 50000, 100000]
+    print("DMT from:", os.path.abspath(g_root))
+    print("%10s %14s %14s" % ("types", "MB", "bytes/type"))
+    for size in sizes:
+        (fd, xmlAST) = tempfile.mkstemp(suffix=".xml")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                WriteGrammar(f, size)
+            ClearGlobals()
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            asnParser.ParseASN1SCC_AST(xmlAST)
+            gc.collect()
+            used = tracemalloc.get_traced_memory()[0] - before
+            tracemalloc.stop()
+        finally:
+            os.unlink(xmlAST)
+        numberOfTypes = len(asnParser.g_names)
+        print("%10d %14.1f %14.1f" % (numberOfTypes, used / 1048576.0, float(used) / numberOfTypes))
+        ClearGlobals()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+'''
+Measures the time the recursive mappers need for deeply nested types.
+
+The grammar is written as an ASN1SCC XML AST (no ASN1SCC needed) and is
+loaded via asnParser.ParseASN1SCC_AST; it contains one type per depth,
+made of alternating levels of inline SEQUENCEs and CHOICEs (each level
+also has an INTEGER field). The report is the time that the Simulink
+and the OSS mappers take to generate the conversion code of each type,
+and the number of lines they generate.
+
+To compare with another version of DMT, point -root to its checkout
+(the folder that contains 'dmt', with a configured dmt/commonPy/__init__.py)
+
+Usage: benchMapperNesting.py [-root folder] [depth ...]
+'''
+import os
+import sys
+import time
+import tempfile
+
+from typing import IO, Any, List  # NOQA pylint: disable=unused-import
+
+g_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+if '-root' in sys.argv:
+    g_idx = sys.argv.index('-root')
+    g_root = sys.argv[g_idx + 1]
+    del sys.argv[g_idx:g_idx + 2]
+sys.path.insert(0, g_root)
+
+from dmt.commonPy import asnParser  # NOQA pylint: disable=wrong-import-position
+from dmt.B_mappers import simulink_B_mapper, c_B_mapper  # NOQA pylint: disable=wrong-import-position
+
+g_repeats = 5
+
+
+def WriteLevel(f: IO[Any], level: int, depth: int) -> None:
+    '''Writes the inline type of the given level (and the ones below it).'''
+    f.write('<Type Line="%d">' % (level + 1))
+    if level == depth:
+        f.write('<IntegerType Min="0" Max="255"/></Type>')
+        return
+    if level % 2 == 0:
+        f.write('<SequenceType>\n')
+        f.write('<SequenceOrSetChild VarName="v%d" Optional="False">' % level)
+        f.write('<Type Line="%d"><IntegerType Min="0" Max="1000"/></Type></SequenceOrSetChild>\n' % (level + 1))
+        f.write('<SequenceOrSetChild VarName="l%d" Optional="False">' % level)
+        WriteLevel(f, level + 1, depth)
+        f.write('</SequenceOrSetChild>\n</SequenceType></Type>')
+    else:
+        f.write('<ChoiceType>\n')
+        f.write('<ChoiceChild VarName="v%d" EnumID="v%d_PRESENT">' % (level, level))
+        f.write('<Type Line="%d"><IntegerType Min="0" Max="1000"/></Type></ChoiceChild>\n' % (level + 1))
+        f.write('<ChoiceChild VarName="l%d" EnumID="l%d_PRESENT">' % (level, level))
+        WriteLevel(f, level + 1, depth)
+        f.write('</ChoiceChild>\n</ChoiceType></Type>')
+
+
+def WriteGrammar(f: IO[Any], depths: List[int]) -> None:  # pylint: disable=invalid-sequence-index
+    f.write('<?xml version="1.0" encoding="utf-8"?>\n<ASN1AST>\n')
+    f.write('<Asn1File FileName="nesting.asn">\n')
+    f.write('<Asn1Module ID="Nesting"><ExportedTypes/><ExportedVariables/><ImportedModules/>\n')
+    f.write('<TypeAssignments>\n')
+    for depth in depths:
+        f.write('<TypeAssignment Name="T-Depth-%d" Line="1" AddedType="False">\n' % depth)
+        WriteLevel(f, 0, depth)
+        f.write('</TypeAssignment>\n')
+    f.write('</TypeAssignments></Asn1Module></Asn1File>\n')
+    f.write('</ASN1AST>\n')
+
+
+def TimeMap(mapper: Any, typename: str) -> Any:
+    '''The best time (over g_repeats runs) and the lines of the mapping.'''
+    node = asnParser.g_names[typename]
+    best = None
+    for _ in range(g_repeats):
+        start = time.perf_counter()
+        lines = mapper.Map("var_X", "(*pY)", node, asnParser.g_leafTypeDict, asnParser.g_names)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len("".join(lines).splitlines())
+
+
+def main() -> None:
+    depths = [int(x) for x in sys.argv[1:]] or [32, 64, 128, 200]
+    (fd, xmlAST) = tempfile.mkstemp(suffix=".xml")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            WriteGrammar(f, depths)
+        asnParser.ParseASN1SCC_AST(xmlAST)
+    finally:
+        os.unlink(xmlAST)
+    print("DMT from:", os.path.abspath(g_root))
+    print("%8s %12s %10s %12s %10s" % ("depth", "Simulink ms", "lines", "OSS ms", "lines"))
+    for depth in depths:
+        typename = "T-Depth-%d" % depth
+        simulinkTime, simulinkLines = TimeMap(simulink_B_mapper.FromASN1SCCtoSimulink(), typename)
+        ossTime, ossLines = TimeMap(c_B_mapper.FromCtoOSS(), typename)
+        print("%8d %12.2f %10d %12.2f %10d" % (
+            depth, simulinkTime * 1000.0, simulinkLines, ossTime * 1000.0, ossLines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+'''
+Measures the throughput of the Python API that asn2dataModel -toPython
+generates (i.e. of A_mappers/Stubs.py and of the generated _getset.so):
+the cost of Get/Set calls on fields, nested fields and SEQUENCE OF
+elements of a telemetry-like grammar (g_grammar).
+
+The grammar is compiled in a temporary folder, via asn2dataModel and
+Makefile.python (so ASN1SCC, mono and gcc are needed) - or, with -built,
+an existing build of g_grammar is used.
+
+To compare with another version of DMT (e.g. before and after a change
+in Stubs.py), point -root to its checkout: the build is then also
+measured with the Stubs.py of that checkout.
+
+Usage: benchPythonMapper.py [-root folder] [-built folder] [-repeats N]
+'''
+import os
+import sys
+import json
+import shutil
+import timeit
+import tempfile
+import importlib
+import subprocess
+
+from typing import Any, Dict, List, Optional  # NOQA pylint: disable=unused-import
+
+g_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+g_grammarBase = 'bench'
+
+g_grammar = '''\
+TASTE-Dataview DEFINITIONS AUTOMATIC TAGS ::= BEGIN
+T-INT ::= INTEGER (0 .. 1000000)
+T-REAL ::= REAL (-1000.0 .. 1000.0)
+T-BOOL ::= BOOLEAN
+T-ENUM ::= ENUMERATED { red(0), green(1), blue(2) }
+T-OCT ::= OCTET STRING (SIZE(0 .. 4096))
+T-FIXOCT ::= OCTET STRING (SIZE(8))
+T-STR ::= IA5String (SIZE(1 .. 64))
+T-SEQ ::= SEQUENCE {
+    a INTEGER (0 .. 1000000),
+    b REAL (-1000.0 .. 1000.0),
+    c T-OCT,
+    d SEQUENCE (SIZE(1 .. 4096)) OF REAL (-1000.0 .. 1000.0),
+    e SEQUENCE (SIZE(1 .. 16)) OF T-INT,
+    f SEQUENCE (SIZE(4)) OF T-BOOL,
+    g T-ENUM,
+    opt T-BOOL OPTIONAL,
+    inner SEQUENCE { x T-INT, y T-STR }
+}
+T-CHOICE ::= CHOICE { num T-INT, s T-SEQ }
+T-ARR ::= SEQUENCE (SIZE(1 .. 8)) OF T-SEQ
+END
+'''
+
+# The measured operations (with 's' a T_SEQ, 'a' a T_ARR, 'payload' a
+# 4 KB string, 'ds' a DataStream with the encoding of 's', 'message' that
+# encoding, 'buf' a receive buffer, 'ints' 100 T_INTs, 'intMessages'
+# their encodings, 'intsData' the same back to back, 'x' a T_INT and
+# 'dsInt' a DataStream for them, and 'samples' 4096 REALs - a NumPy
+# array, if NumPy is available)
+g_operations = [
+    ('Get INTEGER field', 's.a.Get()'),
+    ('Set INTEGER field', 's.a.Set(42)'),
+    ('Set REAL field', 's.b.Set(1.5)'),
+    ('Get nested field', 's.inner.x.Get()'),
+    ('Get SEQUENCE OF element', 's.d[17].Get()'),
+    ('Set SEQUENCE OF element', 's.d[17].Set(2.5)'),
+    ('Get SEQUENCE OF length', 's.d.GetLength()'),
+    ('Get element of SEQUENCE OF SEQUENCE', 'a[3].d[5].Get()'),
+    ('SetFromPyString (4 KB OCTET STRING)', 's.c.SetFromPyString(payload)'),
+    ('GetPyString (4 KB OCTET STRING)', 's.c.GetPyString()'),
+    ('DataStream.GetPyString (T-SEQ encoding)', 'ds.GetPyString()'),
+    ('DataStream.SetFromPyString (T-SEQ encoding)', 'ds.SetFromPyString(message)'),
+    ('DataStream.ReadInto (T-SEQ encoding)', 'ds.ReadInto(buf)'),
+    ('Encode 100 T-INT one by one', '[(y.Encode(dsInt), dsInt.GetPyString()) for y in ints]'),
+    ('EncodeMany 100 T-INT', 'T_INT.EncodeMany(ints)'),
+    ('Decode 100 T-INT one by one', '[(dsInt.SetFromPyString(m), dsInt.Reset(), x.Decode(dsInt)) for m in intMessages]'),
+    ('DecodeMany 100 T-INT', 'T_INT.DecodeMany(intsData)'),
+    ('DecodeMany 100 T-INT (callback)', 'T_INT.DecodeMany(intsData, lambda y: None)'),
+    ('Get 4096 REALs one by one', '[s.d[i].Get() for i in range(4096)]'),
+    ('AsArray (4096 REALs)', 's.d.AsArray()'),
+    ('SetFromArray (4096 REALs)', 's.d.SetFromArray(samples)'),
+]
+
+g_repeats = 5
+
+
+def Build(folder: str) -> None:
+    '''Compiles g_grammar (with the Python mapper of g_root) in folder.'''
+    with open(os.path.join(folder, g_grammarBase + '.asn'), 'w') as f:
+        f.write(g_grammar)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.path.abspath(g_root) + os.pathsep + env.get('PYTHONPATH', '')
+    subprocess.check_call(
+        [sys.executable, '-m', 'dmt.asn2dataModel', '-toPython', '-o', '.', g_grammarBase + '.asn'],
+        cwd=folder, env=env)
+    subprocess.check_call(['make', '-f', 'Makefile.python'], cwd=folder, env=env)
+
+
+def Measure(folder: str) -> Dict[str, Optional[float]]:
+    '''The time (in usec) of each operation, with the build in folder
+    (None for the ones that this Stubs.py doesn't support).'''
+    sys.path.insert(0, folder)
+    module = importlib.import_module(g_grammarBase + '_asn')
+    stubs = importlib.import_module('Stubs')
+    dv = importlib.import_module('DV')
+    s = module.T_SEQ()
+    s.d.SetLength(4096)
+    a = module.T_ARR()
+    a.SetLength(8)
+    a[3].d.SetLength(10)
+    payload = 'x' * 4096
+    s.c.SetFromPyString(payload)
+    ds = stubs.DataStream(dv.T_SEQ_REQUIRED_BYTES_FOR_ENCODING)
+    s.Encode(ds)
+    message = ds.GetPyString()
+    buf = bytearray(len(message))
+    ints = []
+    intMessages = []
+    dsInt = stubs.DataStream(dv.T_INT_REQUIRED_BYTES_FOR_ENCODING)
+    for i in range(100):
+        x = module.T_INT()
+        x.Set(i)
+        x.Encode(dsInt)
+        ints.append(x)
+        intMessages.append(dsInt.GetPyString())
+    variables = {
+        's': s, 'a': a, 'payload': payload, 'ds': ds, 'message': message, 'buf': buf,
+        'T_INT': module.T_INT, 'ints': ints, 'intMessages': intMessages, 'intsData': b''.join(intMessages),
+        'x': x, 'dsInt': dsInt, 'samples': [i / 4096.0 for i in range(4096)],
+    }
+    try:
+        import numpy
+        variables['samples'] = numpy.array(variables['samples'])
+    except ImportError:
+        pass
+    results = {}  # type: Dict[str, Optional[float]]
+    for name, statement in g_operations:
+        timer = timeit.Timer(statement, globals=variables)
+        try:
+            timer.timeit(1)
+        except (AttributeError, TypeError):
+            # (with older Stubs, unknown methods are taken as fields - so
+            # the access paths must be reset)
+            for value in (s, a, x):
+                value.Reset()
+            results[name] = None
+            continue
+        number, _ = timer.autorange()
+        best = min(timer.repeat(g_repeats, number))
+        results[name] = 1e6 * best / number
+    return results
+
+
+def MeasureWithStubs(folder: str, stubs: str) -> Dict[str, Optional[float]]:
+    '''Measure, in a new process, with a copy of the build that uses the
+    given Stubs.py.'''
+    copy = tempfile.mkdtemp(prefix='dmtBench')
+    try:
+        for filename in os.listdir(folder):
+            if filename.endswith('.py') or filename.endswith('.so'):
+                shutil.copy(os.path.join(folder, filename), copy)
+        shutil.copy(stubs, os.path.join(copy, 'Stubs.py'))
+        output = subprocess.check_output(
+            [sys.executable, os.path.abspath(__file__), '-measure', copy, '-repeats', str(g_repeats)])
+        return json.loads(output.decode('utf-8').splitlines()[-1])
+    finally:
+        shutil.rmtree(copy)
+
+
+def ToolsAvailable() -> bool:
+    return all(shutil.which(x) for x in ['asn1.exe', 'mono', 'gcc', 'make'])
+
+
+def main() -> None:
+    global g_repeats
+    args = sys.argv[1:]
+    other = None
+    built = None
+    while args:
+        if args[0] == '-measure' and len(args) > 1:
+            if '-repeats' in args:
+                g_repeats = int(args[args.index('-repeats') + 1])
+            print(json.dumps(Measure(args[1])))
+            return
+        if args[0] == '-root' and len(args) > 1:
+            other = args[1]
+        elif args[0] == '-built' and len(args) > 1:
+            built = os.path.abspath(args[1])
+        elif args[0] == '-repeats' and len(args) > 1:
+            g_repeats = int(args[1])
+        else:
+            print("Usage: %s [-root folder] [-built folder] [-repeats N]" % sys.argv[0])
+            sys.exit(1)
+        args = args[2:]
+
+    folder = built
+    if folder is None:
+        if not ToolsAvailable():
+            print("(ASN1SCC, mono, gcc and make are needed to build the Python API - use -built otherwise)")
+            return
+        folder = tempfile.mkdtemp(prefix='dmtBench')
+    try:
+        if built is None:
+            Build(folder)
+        variants = [('this DMT', os.path.join(g_root, 'dmt', 'A_mappers', 'Stubs.py'))]
+        if other is not None:
+            variants.insert(0, (os.path.basename(os.path.abspath(other)) or other,
+                                os.path.join(other, 'dmt', 'A_mappers', 'Stubs.py')))
+        results = [MeasureWithStubs(folder, stubs) for _, stubs in variants]
+    finally:
+        if built is None:
+            shutil.rmtree(folder)
+
+    print("%-46s" % "usec per operation" + "".join("%14s" % label[:13] for label, _ in variants) +
+          ("%10s" % "speedup" if len(variants) > 1 else ""))
+    for name, _ in g_operations:
+        line = "%-46s" % name + "".join("%14s" % ("-" if r[name] is None else "%.3f" % r[name]) for r in results)
+        if len(variants) > 1 and None not in (results[0][name], results[-1][name]):
+            line += "%9.1fx" % (results[0][name] / results[-1][name])
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
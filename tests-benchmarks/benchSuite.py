@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+'''
+Times the ASN.1 front end and the mappers on synthetic grammars (see
+syntheticGrammar.py), and compares the results with stored baselines.
+
+For each grammar shape of g_configurations, the suite measures:
+
+- ParseASN1SCC_AST (the whole load of the XML AST), and separately
+  the XML ingestion and VerifyAndFixAST
+- DiscoverBadTypes
+- each A mapper that works per type (the ones that need ASN1SCC are
+  skipped), via asn2dataModel.RunBackend
+- each recursive B mapper, mapping every type of the grammar
+
+Each time is the best of N runs. Since the baselines are recorded on
+some machine and checked on another, the suite also times a fixed
+pure-Python workload, and scales the baseline times by the ratio of
+the two calibration times before comparing. A time that exceeds its
+(scaled) baseline by more than the tolerance is a regression, and
+makes the suite exit with status 1.
+
+Usage: benchSuite.py [-repeats N] [-tolerance percent] [-baselines file]
+                     [-update] [-only config[,config...]]
+
+    -update     store the results as the new baselines (instead of
+                comparing them)
+'''
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import tempfile
+import importlib
+import xml.sax
+
+from typing import Any, Callable, Dict, List, Optional, Tuple  # NOQA pylint: disable=unused-import
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import syntheticGrammar  # NOQA pylint: disable=wrong-import-position
+from syntheticGrammar import Shape  # NOQA pylint: disable=wrong-import-position
+
+from dmt import asn2dataModel  # NOQA pylint: disable=wrong-import-position
+from dmt.commonPy import asnParser, cleanupNodes, configMT, createInternalTypes, outputFiles  # NOQA pylint: disable=wrong-import-position
+from dmt.commonPy.recursiveMapper import RecursiveMapperGeneric  # NOQA pylint: disable=wrong-import-position
+from dmt.B_mappers import (  # NOQA pylint: disable=wrong-import-position
+    c_B_mapper, og_B_mapper, qgenc_B_mapper, rtds_B_mapper, scade6_B_mapper, simulink_B_mapper)
+
+g_configurations = [
+    ('flat', Shape(types=4000, depth=1, fanout=4, chain=2, seqOfSize=16)),
+    ('deep', Shape(types=300, depth=16, fanout=3, chain=2, seqOfSize=16)),
+    ('wide', Shape(types=300, depth=2, fanout=48, chain=2, seqOfSize=16)),
+    ('chains', Shape(types=2000, depth=1, fanout=2, chain=32, seqOfSize=16)),
+    ('arrays', Shape(types=300, depth=2, fanout=6, chain=4, seqOfSize=128)),
+]
+
+# The A mappers that work per type, without invoking ASN1SCC
+g_aMappers = ['OG', 'RTDS', 'SCADE6', 'Simulink', 'python', 'sql', 'sqlalchemy']
+
+# The modules whose recursive mappers (the ones that map between
+# variables, so they can be invoked with just two names) are timed
+g_bMapperModules = [c_B_mapper, og_B_mapper, qgenc_B_mapper, rtds_B_mapper, scade6_B_mapper, simulink_B_mapper]
+
+g_baselinesFilename = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+# Differences smaller than this are noise, whatever the tolerance
+g_minimumDifferenceMs = 5.0
+
+g_repeats = 5
+
+
+def Best(action: Callable[[], Any], repeats: int = 0, setup: Optional[Callable[[], Any]] = None) -> Tuple[float, Any]:  # pylint: disable=invalid-sequence-index
+    '''The best time (in ms, over g_repeats runs by default) of the action,
+    and the result of its last run - with setup (untimed) before each run.'''
+    best = None
+    result = None
+    for _ in range(repeats or g_repeats):
+        result = None
+        if setup is not None:
+            setup()
+        # (as in timeit: the collector would add the cost of the garbage
+        # of the previous measurements to this one)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = action()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000.0, result
+
+
+def Calibration() -> float:
+    '''The time (in ms) of a fixed pure-Python workload, similar in nature
+    to the AST processing (dict lookups, small objects, string building).'''
+    def Workload() -> int:
+        total = 0
+        for i in range(20):
+            d = {'T-%d-%d' % (i, j): [j, str(j)] for j in range(20000)}
+            total += sum(len(v[1]) for k, v in sorted(d.items()) if k[-1] != '7')
+        return total
+    return Best(Workload)[0]
+
+
+def LoadWithoutResolving(xmlFilename: str, model: asnParser.AsnModel) -> None:
+    '''The XML ingestion part of ParseASN1SCC_AST.'''
+    modules = []  # type: List[asnParser.Module]
+    parser = xml.sax.make_parser([])
+    parser.setContentHandler(asnParser.StreamingASTHandler(modules, model))
+    parser.parse(xmlFilename)
+    for m in modules:
+        for typeName, typeData in m._typeAssignments:
+            model._names[typeName] = typeData
+
+
+def ClearDefaultModel() -> None:
+    for d in [asnParser.g_names, asnParser.g_leafTypeDict, asnParser.g_metatypes,
+              asnParser.g_typesOfFile, asnParser.g_astOfFile, asnParser.g_modules,
+              asnParser.g_adaUses, asnParser.g_checkedSoFarForKeywords]:
+        d.clear()
+
+
+def BMappers() -> List[Tuple[str, Any]]:  # pylint: disable=invalid-sequence-index
+    mappers = []  # type: List[Tuple[str, Any]]
+    for module in g_bMapperModules:
+        for name, klass in sorted(vars(module).items()):
+            if isinstance(klass, type) and issubclass(klass, RecursiveMapperGeneric) \
+                    and klass.__module__ == module.__name__:
+                mappers.append((module.__name__.split('.')[-1] + '.' + name, klass))
+    return mappers
+
+
+def RunConfiguration(shape: Shape, workDir: str) -> Dict[str, Dict[str, Any]]:  # pylint: disable=invalid-sequence-index
+    '''The measurements of one grammar shape: name -> {"ms": ..., ...}.'''
+    results = {}  # type: Dict[str, Dict[str, Any]]
+    asnFilename = 'synthetic.asn'
+    xmlFilename = os.path.join(workDir, 'synthetic.xml')
+    syntheticGrammar.Generate(shape, os.path.join(workDir, asnFilename), xmlFilename)
+    # (the XML AST refers to the grammar by the path it was given)
+    asnFilename = os.path.join(workDir, asnFilename)
+
+    ms, model = Best(lambda: asnParser.ParseASN1SCC_AST(xmlFilename, asnParser.AsnModel()))
+    results['ParseASN1SCC_AST'] = {'ms': ms, 'types': len(model._names)}
+
+    def Ingest() -> asnParser.AsnModel:
+        model = asnParser.AsnModel()
+        LoadWithoutResolving(xmlFilename, model)
+        return model
+    ms, _ = Best(Ingest)
+    results['XML ingestion'] = {'ms': ms}
+
+    # VerifyAndFixAST modifies the AST, so each run gets a fresh one
+    best = None
+    for _ in range(g_repeats):
+        model = Ingest()
+        ms, _ = Best(lambda: asnParser.VerifyAndFixAST(model), 1)  # pylint: disable=cell-var-from-loop
+        best = ms if best is None else min(best, ms)
+    results['VerifyAndFixAST'] = {'ms': best}
+
+    # The mappers work on the default model
+    ClearDefaultModel()
+    model = asnParser.ParseASN1SCC_AST(xmlFilename)
+    ms, badTypes = Best(cleanupNodes.DiscoverBadTypes)
+    results['DiscoverBadTypes'] = {'ms': ms}
+
+    views = {asnFilename: asnParser.ViewOfFile(asnFilename, model)}
+    outputDir = os.path.join(workDir, 'output')
+    os.mkdir(outputDir)
+    configMT.outputDir = outputDir + os.sep
+    for language in g_aMappers:
+        # Some mappers only work on their first run in the process (see e.g.
+        # g_bHasStartupRunOnce), and some add types to the model - so each
+        # run gets a freshly loaded module and a freshly parsed model (and
+        # ScanChildren's cache, which is kept per names dictionary, is reset).
+        backend = asn2dataModel.getBackend(language)
+
+        def Fresh() -> None:
+            importlib.reload(backend)  # pylint: disable=cell-var-from-loop
+            createInternalTypes.g_ScanChildrenCache.clear()
+            views[asnFilename] = asnParser.ViewOfFile(asnFilename, asnParser.ParseASN1SCC_AST(xmlFilename))
+        ms, _ = Best(
+            lambda: asn2dataModel.RunBackend(language, [asnFilename], views, badTypes),  # pylint: disable=cell-var-from-loop
+            setup=Fresh)
+        outputFiles.CloseAll()
+        results['A:' + language] = {'ms': ms}
+
+    typenames = sorted(x for x in model._names if x not in badTypes)
+
+    def MapAll(mapper: Any) -> int:
+        return sum(
+            len(mapper.Map('src', 'dst', model._names[x], model._leafTypeDict, model._names))
+            for x in typenames)
+    for name, klass in BMappers():
+        ms, lines = Best(lambda: MapAll(klass()))  # pylint: disable=cell-var-from-loop
+        results['B:' + name] = {'ms': ms, 'lines': lines}
+    return results
+
+
+def Compare(results: Dict[str, Any], baselines: Dict[str, Any], tolerance: float) -> int:
+    '''Prints the results next to their baselines, and returns the number
+    of regressions.'''
+    scale = results['calibrationMs'] / baselines['calibrationMs']
+    print("Calibration: %.1f ms (baseline: %.1f ms) - the baselines are scaled by %.2f" % (
+        results['calibrationMs'], baselines['calibrationMs'], scale))
+    regressions = 0
+    for config, measurements in results['configurations'].items():
+        print("\n%s %s" % (config, dict(results['shapes'][config])))
+        print("%-48s %12s %12s %8s" % ("", "ms", "baseline", ""))
+        baseline = baselines['configurations'].get(config, {})
+        if results['shapes'][config] != baselines['shapes'].get(config):
+            print("(the shape of this grammar differs from that of the baselines - not compared)")
+            baseline = {}
+        for name, measurement in measurements.items():
+            if name not in baseline:
+                print("%-48s %12.2f %12s %8s" % (name, measurement['ms'], "-", "new"))
+                continue
+            expected = baseline[name]['ms'] * scale
+            verdict = ""
+            if measurement['ms'] > expected * (1.0 + tolerance) \
+                    and measurement['ms'] - expected > g_minimumDifferenceMs:
+                verdict = "SLOWER"
+                regressions += 1
+            elif measurement['ms'] < expected / (1.0 + tolerance) \
+                    and expected - measurement['ms'] > g_minimumDifferenceMs:
+                verdict = "faster"
+            for k in measurement:
+                if k != 'ms' and measurement[k] != baseline[name].get(k):
+                    verdict += " (%s: %s, was %s)" % (k, measurement[k], baseline[name].get(k))
+            print("%-48s %12.2f %12.2f %8s" % (name, measurement['ms'], expected, verdict))
+    return regressions
+
+
+def main() -> None:
+    global g_repeats
+    args = sys.argv[1:]
+    tolerance = 50.0
+    baselinesFilename = g_baselinesFilename
+    only = None
+    update = False
+    while args:
+        if args[0] == '-repeats' and len(args) > 1:
+            g_repeats = int(args[1])
+        elif args[0] == '-tolerance' and len(args) > 1:
+            tolerance = float(args[1])
+        elif args[0] == '-baselines' and len(args) > 1:
+            baselinesFilename = args[1]
+        elif args[0] == '-only' and len(args) > 1:
+            only = args[1].split(',')
+        elif args[0] == '-update':
+            update = True
+            args = args[1:]
+            continue
+        else:
+            print("Usage: %s [-repeats N] [-tolerance percent] [-baselines file] [-update] [-only config,...]" % sys.argv[0])
+            sys.exit(1)
+        args = args[2:]
+
+    results = {
+        'calibrationMs': Calibration(),
+        'repeats': g_repeats,
+        'shapes': {},
+        'configurations': {},
+    }  # type: Dict[str, Any]
+    cwd = os.getcwd()
+    for config, shape in g_configurations:
+        if only is not None and config not in only:
+            continue
+        workDir = tempfile.mkdtemp(prefix='dmtBench')
+        # (some mappers also write in the current folder)
+        os.chdir(workDir)
+        try:
+            print("Running '%s'..." % config)
+            results['shapes'][config] = shape._asdict()
+            results['configurations'][config] = RunConfiguration(shape, workDir)
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(workDir)
+
+    if update:
+        with open(baselinesFilename, 'w') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print("Stored the baselines in", baselinesFilename)
+        return
+    if not os.path.exists(baselinesFilename):
+        print("No baselines in %s - run with -update to store them." % baselinesFilename)
+        sys.exit(1)
+    with open(baselinesFilename) as f:
+        baselines = json.load(f)
+    regressions = Compare(results, baselines, tolerance / 100.0)
+    if regressions:
+        print("\n%d measurement(s) are more than %g%% slower than their baselines." % (regressions, tolerance))
+        sys.exit(1)
+    print("\nNo regressions (tolerance: %g%%)." % tolerance)
+
+
+if __name__ == "__main__":
+    main()
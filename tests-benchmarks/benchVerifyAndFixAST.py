@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+'''
+Measures how VerifyAndFixAST scales on synthetic grammars.
+
+The grammars are built directly as asnAST nodes (no ASN1SCC needed).
+Each "unit" of the grammar contains an INTEGER, a typedef chain of
+configurable depth on top of it (declared in reverse order, which is
+the worst case for a fixed-point resolver), and a SEQUENCE that uses
+the chain and carries an inline SEQUENCE OF SEQUENCE (so that the
+artificial type naming is exercised as well).
+
+Usage: benchVerifyAndFixAST.py [-depth N] [numberOfTypes ...]
+'''
+import os
+import sys
+import time
+
+from typing import List  # NOQA pylint: disable=unused-import
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from dmt.commonPy import asnParser  # NOQA pylint: disable=wrong-import-position
+from dmt.commonPy.asnAST import (  # NOQA pylint: disable=wrong-import-position
+    AsnInt, AsnBool, AsnSequence, AsnSequenceOf, AsnMetaType, AsnMetaMember)
+
+
+def BuildGrammar(numberOfTypes: int, chainDepth: int) -> None:
+    '''Fill asnParser.g_names with (approximately) numberOfTypes types.'''
+    asnParser.g_names.clear()
+    asnParser.g_leafTypeDict.clear()
+    asnParser.g_metatypes.clear()
+    typesPerUnit = chainDepth + 2
+    f = 'synthetic.asn'
+    for unit in range(max(1, numberOfTypes // typesPerUnit)):
+        base = 'T-Int-%d' % unit
+        asnParser.g_names[base] = AsnInt(asnFilename=f, lineno=1, range=(0, 1000))
+        # declare the chain from its end, so no link is resolvable on first sight
+        for link in range(chainDepth, 0, -1):
+            target = base if link == 1 else 'T-Alias-%d-%d' % (unit, link - 1)
+            asnParser.g_names['T-Alias-%d-%d' % (unit, link)] = AsnMetaType(
+                asnFilename=f, lineno=2, containedType=target,
+                Min=None if link % 2 else 10, Max=None if link % 2 else 20)
+        inner = AsnSequence(asnFilename=f, lineno=3, members=[
+            ['flag', AsnBool(asnFilename=f, lineno=3), None, False, False, False]])
+        lastLink = 'T-Alias-%d-%d' % (unit, chainDepth) if chainDepth else base
+        asnParser.g_names['T-Seq-%d' % unit] = AsnSequence(asnFilename=f, lineno=4, members=[
+            ['value', AsnMetaMember(asnFilename=f, lineno=4, containedType=lastLink), None, False, False, False],
+            ['items', AsnSequenceOf(asnFilename=f, lineno=5, range=(1, 4), containedType=inner), None, False, False, False]])
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    chainDepth = 8
+    if '-depth' in args:
+        idx = args.index('-depth')
+        chainDepth = int(args[idx + 1])
+        del args[idx:idx + 2]
+    sizes = [int(x) for x in args] or [10000, 20000, 50000, 100000]
+    print("%10s %10s %12s %14s" % ("types", "depth", "seconds", "usec/type"))
+    for size in sizes:
+        BuildGrammar(size, chainDepth)
+        numberOfTypes = len(asnParser.g_names)
+        start = time.perf_counter()
+        asnParser.g_leafTypeDict.update(asnParser.VerifyAndFixAST())
+        elapsed = time.perf_counter() - start
+        print("%10d %10d %12.3f %14.2f" % (numberOfTypes, chainDepth, elapsed, 1e6 * elapsed / numberOfTypes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+'''
+Generates synthetic ASN.1 grammars for the benchmarks: the ASN.1 text,
+and the matching ASN1SCC XML AST (so that the benchmarks can load the
+grammar via asnParser.ParseASN1SCC_AST, without mono and ASN1SCC).
+
+The grammar is made of "units", each of which contains:
+
+- the basic types: an INTEGER, a REAL, a BOOLEAN, an ENUMERATED and an
+  OCTET STRING (of up to 'seqOfSize' bytes)
+- a typedef chain of length 'chain' on top of the INTEGER (declared in
+  reverse order, and with every other link narrowing the range)
+- a SEQUENCE with 'fanout' fields, whose first field is an inline type
+  nested 'depth' levels deep (alternating SEQUENCEs and CHOICEs with
+  'fanout' fields each); the other fields refer to the basic types, to
+  the end of the chain, and to a SEQUENCE OF of up to 'seqOfSize' REALs
+- a SEQUENCE OF (up to 'seqOfSize' elements) of the SEQUENCE of the
+  previous unit
+
+The number of units is chosen so that the grammar has (approximately)
+'types' type assignments.
+
+Usage: syntheticGrammar.py [-types N] [-depth N] [-fanout N] [-chain N]
+                           [-seqOfSize N] output.asn output.xml
+'''
+import sys
+
+from typing import IO, Any, List, NamedTuple, Tuple  # NOQA pylint: disable=unused-import
+
+Shape = NamedTuple('Shape', [
+    ('types', int),      # the (approximate) number of type assignments
+    ('depth', int),      # the nesting levels of the inline types
+    ('fanout', int),     # the fields of each SEQUENCE/CHOICE
+    ('chain', int),      # the length of the typedef chains
+    ('seqOfSize', int),  # the maximum size of the SEQUENCE OFs and OCTET STRINGs
+])
+
+g_defaultShape = Shape(types=1000, depth=3, fanout=4, chain=4, seqOfSize=16)
+
+g_moduleName = "Synthetic"
+
+# A type is one of:
+#   ('INTEGER', min, max), ('REAL', min, max), ('BOOLEAN',),
+#   ('ENUMERATED', [options]), ('OCTET STRING', min, max),
+#   ('REF', typename, min, max) (with None min/max when unconstrained),
+#   ('SEQUENCE', [(field, type)]), ('CHOICE', [(field, type)]),
+#   ('SEQUENCEOF', min, max, type)
+TypeSpec = Tuple[Any, ...]
+
+
+def TypesPerUnit(shape: Shape) -> int:
+    return 5 + shape.chain + 2
+
+
+def NestedType(shape: Shape, unit: int, level: int) -> TypeSpec:
+    '''The inline type of the given nesting level (and of the ones below it).'''
+    u = str(unit)
+    if level == shape.depth:
+        return ('INTEGER', 0, 255)
+    references = [
+        ('REF', 'T-Alias-%s-%d' % (u, shape.chain) if shape.chain else 'T-Int-' + u, None, None),
+        ('REF', 'T-Real-' + u, None, None),
+        ('REF', 'T-Enum-' + u, None, None),
+        ('REF', 'T-Bool-' + u, None, None),
+        ('REF', 'T-Oct-' + u, None, None),
+        ('SEQUENCEOF', 1, shape.seqOfSize, ('REF', 'T-Real-' + u, None, None)),
+    ]
+    fields = [('l%d' % level, NestedType(shape, unit, level + 1))]
+    for i in range(1, max(1, shape.fanout)):
+        fields.append(('f%d-%d' % (level, i), references[(i - 1) % len(references)]))
+    return ('SEQUENCE' if level % 2 == 0 else 'CHOICE', fields)
+
+
+def Assignments(shape: Shape) -> List[Tuple[str, TypeSpec]]:  # pylint: disable=invalid-sequence-index
+    '''The type assignments of the grammar, in declaration order.'''
+    assignments = []  # type: List[Tuple[str, TypeSpec]]
+    for unit in range(max(1, shape.types // TypesPerUnit(shape))):
+        u = str(unit)
+        assignments.extend([
+            ('T-Int-' + u, ('INTEGER', 0, 1000)),
+            ('T-Real-' + u, ('REAL', -1.0, 1.0)),
+            ('T-Bool-' + u, ('BOOLEAN',)),
+            ('T-Enum-' + u, ('ENUMERATED', ['idle', 'busy', 'failed'])),
+            ('T-Oct-' + u, ('OCTET STRING', 1, shape.seqOfSize)),
+        ])
+        # declare the chain from its end, so no link is resolvable on first sight
+        for link in range(shape.chain, 0, -1):
+            target = 'T-Int-' + u if link == 1 else 'T-Alias-%s-%d' % (u, link - 1)
+            if link % 2:
+                assignments.append(('T-Alias-%s-%d' % (u, link), ('REF', target, None, None)))
+            else:
+                assignments.append(('T-Alias-%s-%d' % (u, link), ('REF', target, 0, 1000 - link)))
+        assignments.append(('T-Rec-' + u, NestedType(shape, unit, 0)))
+        element = 'T-Rec-%d' % (unit - 1) if unit else 'T-Int-0'
+        assignments.append(('T-Arr-' + u, ('SEQUENCEOF', 1, shape.seqOfSize, ('REF', element, None, None))))
+    return assignments
+
+
+def AsnText(spec: TypeSpec, indent: str) -> str:  # pylint: disable=too-many-return-statements
+    kind = spec[0]
+    if kind in ('INTEGER', 'REAL'):
+        return '%s (%s .. %s)' % (kind, spec[1], spec[2])
+    if kind == 'BOOLEAN':
+        return kind
+    if kind == 'ENUMERATED':
+        return 'ENUMERATED { %s }' % ', '.join('%s(%d)' % (x, i) for i, x in enumerate(spec[1]))
+    if kind == 'OCTET STRING':
+        return 'OCTET STRING (SIZE(%d .. %d))' % (spec[1], spec[2])
+    if kind == 'REF':
+        if spec[2] is None:
+            return spec[1]
+        return '%s (%s .. %s)' % (spec[1], spec[2], spec[3])
+    if kind == 'SEQUENCEOF':
+        return 'SEQUENCE (SIZE(%d .. %d)) OF %s' % (spec[1], spec[2], AsnText(spec[3], indent))
+    fields = [
+        indent + '    ' + field + ' ' + AsnText(fieldSpec, indent + '    ')
+        for field, fieldSpec in spec[1]]
+    return kind + ' {\n' + ',\n'.join(fields) + '\n' + indent + '}'
+
+
+def WriteASN1(f: IO[Any], shape: Shape) -> List[int]:  # pylint: disable=invalid-sequence-index
+    '''Writes the grammar, and returns the line of each type assignment.'''
+    f.write('%s DEFINITIONS AUTOMATIC TAGS ::= BEGIN\n\n' % g_moduleName)
+    lines = []  # type: List[int]
+    lineNo = 3
+    for typename, spec in Assignments(shape):
+        text = '%s ::= %s\n' % (typename, AsnText(spec, ''))
+        f.write(text)
+        lines.append(lineNo)
+        lineNo += text.count('\n')
+    f.write('\nEND\n')
+    return lines
+
+
+def WriteXMLType(f: IO[Any], spec: TypeSpec, lineNo: int) -> None:
+    kind = spec[0]
+    f.write('<Type Line="%d">' % lineNo)
+    if kind == 'INTEGER':
+        f.write('<IntegerType Min="%s" Max="%s"/>' % (spec[1], spec[2]))
+    elif kind == 'REAL':
+        f.write('<RealType Min="%s" Max="%s"/>' % (spec[1], spec[2]))
+    elif kind == 'BOOLEAN':
+        f.write('<BooleanType/>')
+    elif kind == 'ENUMERATED':
+        f.write('<EnumeratedType><EnumValues>')
+        for i, option in enumerate(spec[1]):
+            f.write('<EnumValue StringValue="%s" IntValue="%d" EnumID="%s"/>' % (option, i, option))
+        f.write('</EnumValues></EnumeratedType>')
+    elif kind == 'OCTET STRING':
+        f.write('<OctetStringType Min="%d" Max="%d"/>' % (spec[1], spec[2]))
+    elif kind == 'REF':
+        if spec[2] is None:
+            f.write('<ReferenceType ReferencedTypeName="%s"/>' % spec[1])
+        else:
+            f.write('<ReferenceType ReferencedTypeName="%s" Min="%s" Max="%s"/>' % spec[1:])
+    elif kind == 'SEQUENCEOF':
+        f.write('<SequenceOfType Min="%d" Max="%d">' % (spec[1], spec[2]))
+        WriteXMLType(f, spec[3], lineNo)
+        f.write('</SequenceOfType>')
+    elif kind == 'SEQUENCE':
+        f.write('<SequenceType>\n')
+        for field, fieldSpec in spec[1]:
+            f.write('<SequenceOrSetChild VarName="%s" Optional="False">' % field)
+            WriteXMLType(f, fieldSpec, lineNo)
+            f.write('</SequenceOrSetChild>\n')
+        f.write('</SequenceType>')
+    else:
+        f.write('<ChoiceType>\n')
+        for field, fieldSpec in spec[1]:
+            f.write('<ChoiceChild VarName="%s" EnumID="%s_PRESENT">' % (field, field.replace('-', '_')))
+            WriteXMLType(f, fieldSpec, lineNo)
+            f.write('</ChoiceChild>\n')
+        f.write('</ChoiceType>')
+    f.write('</Type>')
+
+
+def WriteXMLAST(f: IO[Any], shape: Shape, asnFilename: str, lines: List[int]) -> None:  # pylint: disable=invalid-sequence-index
+    '''Writes the ASN1SCC XML AST of the grammar (whose type assignments
+    start at the given lines of asnFilename, as returned by WriteASN1).'''
+    f.write('<?xml version="1.0" encoding="utf-8"?>\n<ASN1AST>\n')
+    f.write('<Asn1File FileName="%s">\n' % asnFilename)
+    f.write('<Asn1Module ID="%s"><ExportedTypes/><ExportedVariables/><ImportedModules/>\n' % g_moduleName)
+    f.write('<TypeAssignments>\n')
+    for (typename, spec), lineNo in zip(Assignments(shape), lines):
+        f.write('<TypeAssignment Name="%s" Line="%d" AddedType="False">\n' % (typename, lineNo))
+        WriteXMLType(f, spec, lineNo)
+        f.write('</TypeAssignment>\n')
+    f.write('</TypeAssignments></Asn1Module></Asn1File>\n')
+    f.write('</ASN1AST>\n')
+
+
+def Generate(shape: Shape, asnFilename: str, xmlFilename: str) -> None:
+    '''Writes the grammar and its XML AST.'''
+    with open(asnFilename, 'w') as f:
+        lines = WriteASN1(f, shape)
+    with open(xmlFilename, 'w') as f:
+        WriteXMLAST(f, shape, asnFilename, lines)
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    values = g_defaultShape._asdict()
+    for option in list(values):
+        if '-' + option in args:
+            idx = args.index('-' + option)
+            values[option] = int(args[idx + 1])
+            del args[idx:idx + 2]
+    if len(args) != 2:
+        print("Usage: %s [-types N] [-depth N] [-fanout N] [-chain N] [-seqOfSize N] output.asn output.xml" % sys.argv[0])
+        sys.exit(1)
+    shape = Shape(**values)
+    Generate(shape, args[0], args[1])
+    print("%d types written in %s (and %s)" % (len(Assignments(shape)), args[0], args[1]))
+
+
+if __name__ == "__main__":
+    main()